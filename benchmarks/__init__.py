@@ -0,0 +1,6 @@
+"""
+Benchmark scripts.
+
+Run a benchmark as a module from the repository root, for example
+``python -m benchmarks.bench_cache``.
+"""
@@ -0,0 +1,72 @@
+"""
+APIClient benchmarks against a local HTTP server.
+
+Usage:
+    python -m benchmarks.bench_api_client
+"""
+
+import asyncio
+import time
+
+import requests
+
+from src.api_client import APIClient
+from src.async_api_client import AsyncAPIClient
+from tests.http_server import LocalHTTPServer
+
+
+def bench_connection_reuse(server: LocalHTTPServer, calls: int = 1000):
+    """Compare the pooled client with opening a new connection per call."""
+    client = APIClient(server.base_url)
+    client.get("warmup")
+    start = time.perf_counter()
+    for _ in range(calls):
+        client.get("users")
+    pooled = calls / (time.perf_counter() - start)
+    client.close()
+    
+    url = f"{server.base_url}/users"
+    start = time.perf_counter()
+    for _ in range(calls):
+        with requests.Session() as session:
+            session.get(url, headers={"Connection": "close"}).json()
+    fresh = calls / (time.perf_counter() - start)
+    
+    print(f"pooled keep-alive:       {pooled:8,.0f} req/s")
+    print(f"new connection per call: {fresh:8,.0f} req/s")
+    print(f"speedup:                 {pooled / fresh:8.2f}x")
+
+
+def bench_async_fan_out(server: LocalHTTPServer, calls: int = 1000, latency: float = 0.005):
+    """Compare sequential sync calls with AsyncAPIClient.gather_many."""
+    def slow(request):
+        time.sleep(latency)
+        return 200, {}, {"ok": True}
+    
+    server.route("GET", "/slow", slow)
+    with APIClient(server.base_url) as client:
+        start = time.perf_counter()
+        for _ in range(calls):
+            client.get("slow")
+        sync_rate = calls / (time.perf_counter() - start)
+    
+    async def fan_out(concurrency: int) -> float:
+        async with AsyncAPIClient(server.base_url, pool_size=concurrency) as client:
+            start = time.perf_counter()
+            await client.gather_many([("GET", "slow")] * calls, concurrency=concurrency)
+            return calls / (time.perf_counter() - start)
+    
+    print(f"\nbackend latency {latency * 1e3:.0f} ms")
+    print(f"sync APIClient, sequential: {sync_rate:8,.0f} req/s")
+    for concurrency in (1, 10, 50):
+        rate = asyncio.run(fan_out(concurrency))
+        print(f"AsyncAPIClient, concurrency {concurrency:3d}: {rate:8,.0f} req/s")
+
+
+if __name__ == "__main__":
+    local_server = LocalHTTPServer()
+    try:
+        bench_connection_reuse(local_server)
+        bench_async_fan_out(local_server)
+    finally:
+        local_server.close()
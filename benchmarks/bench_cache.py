@@ -0,0 +1,101 @@
+"""
+Cache benchmarks.
+
+Usage:
+    python -m benchmarks.bench_cache
+"""
+
+import random
+import threading
+import time
+
+from src.cache import Cache, ConcurrentCache
+
+KEYS = [f"key{i}" for i in range(10_000)]
+
+
+def _worker(cache, operations: int, seed: int):
+    """Run a 90% read / 10% write mix against a cache."""
+    rng = random.Random(seed)
+    keys = KEYS
+    for _ in range(operations):
+        key = keys[rng.randrange(len(keys))]
+        if rng.random() < 0.1:
+            cache.set(key, key)
+        else:
+            cache.get(key)
+
+
+def bench_thread_scaling(operations_per_thread: int = 50_000):
+    """Measure throughput of Cache and ConcurrentCache from 1 to 16 threads."""
+    print("threads  Cache ops/s  ConcurrentCache ops/s")
+    for threads in (1, 2, 4, 8, 16):
+        results = []
+        for cache in (Cache(), ConcurrentCache(segments=16)):
+            for key in KEYS:
+                cache.set(key, key)
+            workers = [
+                threading.Thread(target=_worker, args=(cache, operations_per_thread, seed))
+                for seed in range(threads)
+            ]
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+            results.append(threads * operations_per_thread / elapsed)
+        print(f"{threads:7d}  {results[0]:11,.0f}  {results[1]:21,.0f}")
+
+
+def _best_of(fn, repeat: int = 5) -> float:
+    """Return the fastest of several timed runs of fn."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_batch_operations(batch_size: int = 10_000):
+    """Compare get_many/set_many/delete_many with per-key loops."""
+    keys = KEYS[:batch_size]
+    items = {key: key for key in keys}
+    cache = Cache()
+
+    def loop_set():
+        for key, value in items.items():
+            cache.set(key, value)
+
+    def loop_get():
+        for key in keys:
+            cache.get(key)
+
+    def loop_delete():
+        for key in keys:
+            cache.delete(key)
+        cache.set_many(items)
+
+    def batch_delete():
+        cache.delete_many(keys)
+        cache.set_many(items)
+
+    cases = [
+        ("set", loop_set, lambda: cache.set_many(items)),
+        ("get", loop_get, lambda: cache.get_many(keys)),
+        ("delete+refill", loop_delete, batch_delete),
+    ]
+    print(f"\nbatch size {batch_size:,}")
+    print("operation       per-key ms  batched ms  speedup")
+    cache.set_many(items)
+    for name, per_key, batched in cases:
+        loop_time = _best_of(per_key)
+        batch_time = _best_of(batched)
+        print(f"{name:14s}  {loop_time * 1e3:10.2f}  {batch_time * 1e3:10.2f}"
+              f"  {loop_time / batch_time:6.2f}x")
+
+
+if __name__ == "__main__":
+    bench_thread_scaling()
+    bench_batch_operations()
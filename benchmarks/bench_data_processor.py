@@ -0,0 +1,74 @@
+"""
+DataProcessor benchmarks.
+
+Usage:
+    python -m benchmarks.bench_data_processor
+"""
+
+import gc
+import random
+import time
+import tracemalloc
+
+from src.data_processor import DataProcessor
+from src.table import Table, np
+
+CITIES = ["New York", "London", "Paris", "Tokyo", "Berlin"]
+
+
+def make_records(rows: int, seed: int = 0):
+    """Generate rows of synthetic people."""
+    rng = random.Random(seed)
+    return [
+        {"id": i, "age": rng.randrange(18, 90), "score": rng.random() * 100,
+         "city": CITIES[rng.randrange(len(CITIES))]}
+        for i in range(rows)
+    ]
+
+
+def _measure_memory(build):
+    """Return (result, bytes allocated) for a builder function."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def _time(fn) -> float:
+    """Return the wall time of one call in seconds."""
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench_table_vs_records(rows: int = 1_000_000, use_numpy: bool = False):
+    """Compare memory and operation time of List[Dict] and Table."""
+    processor = DataProcessor()
+    records, records_bytes = _measure_memory(lambda: make_records(rows))
+    start = time.perf_counter()
+    table, table_bytes = _measure_memory(lambda: Table.from_records(records, use_numpy))
+    convert = time.perf_counter() - start
+    print(f"\nrows {rows:,}, {'numpy' if use_numpy else 'array.array'} columns")
+    print(f"memory   List[Dict] {records_bytes / 2**20:8.1f} MiB"
+          f"   Table {table_bytes / 2**20:8.1f} MiB"
+          f"   ({records_bytes / table_bytes:.1f}x smaller)")
+    print(f"from_records {convert:.2f} s\n")
+    cases = [
+        ("filter_data", lambda data: processor.filter_data(data, "city", "Paris")),
+        ("sort_data", lambda data: processor.sort_data(data, "age")),
+        ("aggregate_data", lambda data: processor.aggregate_data(data, "city")),
+        ("calculate_statistics", lambda data: processor.calculate_statistics(data, "score")),
+    ]
+    print("operation             List[Dict] s  Table s  speedup")
+    for name, operation in cases:
+        dict_time = _time(lambda: operation(records))
+        table_time = _time(lambda: operation(table))
+        print(f"{name:20s}  {dict_time:12.3f}  {table_time:7.3f}  {dict_time / table_time:6.2f}x")
+
+
+if __name__ == "__main__":
+    bench_table_vs_records()
+    if np is not None:
+        bench_table_vs_records(use_numpy=True)
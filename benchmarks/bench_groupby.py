@@ -0,0 +1,67 @@
+"""
+Group-by engine benchmarks.
+
+Usage:
+    python -m benchmarks.bench_groupby
+"""
+
+import time
+
+from benchmarks.bench_data_processor import make_records
+from src.data_processor import DataProcessor
+from src.table import Table
+
+
+def _time(fn) -> float:
+    """Return the best wall time of three calls in seconds."""
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _hand_written(records):
+    """Count, sum and max score per city with a plain loop."""
+    groups = {}
+    for record in records:
+        city = record.get("city")
+        state = groups.get(city)
+        if state is None:
+            state = groups[city] = [0, 0, None]
+        state[0] += 1
+        score = record.get("score")
+        if isinstance(score, (int, float)):
+            state[1] += score
+            if state[2] is None or score > state[2]:
+                state[2] = score
+    return groups
+
+
+def bench_group_by(rows: int = 1_000_000):
+    """Compare group_data with the aggregate_data counting loop and a hand-written loop."""
+    processor = DataProcessor()
+    records = make_records(rows)
+    table = Table.from_records(records)
+    count = {"count": (None, "count")}
+    several = {"count": (None, "count"), "total": ("score", "sum"), "best": ("score", "max")}
+    cases = [
+        ("aggregate_data (count loop)", lambda: processor.aggregate_data(records, "city")),
+        ("group_data count", lambda: processor.group_data(records, "city", count)),
+        ("group_data count, Table", lambda: processor.group_data(table, "city", count)),
+        ("hand-written count/sum/max", lambda: _hand_written(records)),
+        ("group_data count/sum/max", lambda: processor.group_data(records, "city", several)),
+        ("group_data 2 keys", lambda: processor.group_data(records, ["city", "age"], several)),
+        ("group_data count_distinct", lambda: processor.group_data(
+            records, "city", {"ids": ("id", "count_distinct")})),
+        ("group_data approx_count_distinct", lambda: processor.group_data(
+            records, "city", {"ids": ("id", "approx_count_distinct")})),
+    ]
+    print(f"rows {rows:,}")
+    for name, operation in cases:
+        print(f"{name:34s} {_time(operation):7.3f} s")
+
+
+if __name__ == "__main__":
+    bench_group_by()
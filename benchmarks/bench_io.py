@@ -0,0 +1,75 @@
+"""
+File ingest/export throughput benchmarks.
+
+Usage:
+    python -m benchmarks.bench_io
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.bench_data_processor import make_records
+from src.dataio import (
+    read_columnar, read_csv, read_csv_table, read_ndjson, write_columnar, write_csv,
+    write_ndjson,
+)
+from src.table import Table
+
+
+def _time(fn) -> float:
+    """Return the best wall time of three calls in seconds."""
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _json_dump(path, records):
+    """Baseline writer: one json.dump of the whole list."""
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(records, handle)
+
+
+def _json_load(path):
+    """Baseline reader: one json.load building every record."""
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def bench_io(rows: int = 500_000):
+    """Report write and read throughput in MB/s of file size for each format."""
+    records = make_records(rows)
+    table = Table.from_records(records)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {name: os.path.join(directory, f"data.{name}")
+                 for name in ("json", "csv", "ndjson", "col")}
+        writes = [
+            ("json.dump (baseline)", "json", lambda path: _json_dump(path, records)),
+            ("write_csv", "csv", lambda path: write_csv(path, records)),
+            ("write_ndjson", "ndjson", lambda path: write_ndjson(path, records)),
+            ("write_columnar", "col", lambda path: write_columnar(path, table)),
+        ]
+        reads = [
+            ("json.load (baseline)", "json", _json_load),
+            ("read_csv records", "csv", lambda path: list(read_csv(path))),
+            ("read_csv_table", "csv", read_csv_table),
+            ("read_csv_table 1 column", "csv", lambda path: read_csv_table(path, ["score"])),
+            ("read_ndjson records", "ndjson", lambda path: list(read_ndjson(path))),
+            ("read_columnar", "col", read_columnar),
+            ("read_columnar 1 column", "col", lambda path: read_columnar(path, ["score"])),
+        ]
+        print(f"rows {rows:,}")
+        print("operation                   size MB     time s      MB/s")
+        for name, ext, operation in writes + reads:
+            path = paths[ext]
+            seconds = _time(lambda: operation(path))
+            size = os.path.getsize(path) / 1e6
+            print(f"{name:26s} {size:8.1f} {seconds:10.3f} {size / seconds:9.1f}")
+
+
+if __name__ == "__main__":
+    bench_io()
@@ -0,0 +1,51 @@
+"""
+ParallelDataProcessor core-scaling benchmark.
+
+Usage:
+    python -m benchmarks.bench_parallel
+"""
+
+import os
+import time
+
+from benchmarks.bench_data_processor import make_records
+from src.data_processor import DataProcessor
+from src.parallel import ParallelDataProcessor
+from src.table import Table
+
+
+def _time(fn) -> float:
+    """Return the best wall time of three calls in seconds."""
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_core_scaling(rows: int = 2_000_000, workers=(1, 2, 4, 8)):
+    """Time serial and parallel operations on a Table for several worker counts."""
+    table = Table.from_records(make_records(rows), use_numpy=False)
+    cases = [
+        ("stats+quantiles", lambda p: p.calculate_statistics(table, "score", True, (0.5, 0.99))),
+        ("stats", lambda p: p.calculate_statistics(table, "score", stddev=True)),
+        ("aggregate", lambda p: p.aggregate_data(table, "age")),
+        ("filter", lambda p: p.filter_data(table, "age", 42)),
+    ]
+    print(f"rows {rows:,}, {os.cpu_count()} CPUs")
+    print("operation         serial s  " + "  ".join(f"{n:>2d} workers" for n in workers))
+    serial = DataProcessor()
+    results = {name: [_time(lambda: operation(serial))] for name, operation in cases}
+    for count in workers:
+        with ParallelDataProcessor(workers=count, min_rows=0) as processor:
+            for name, operation in cases:
+                operation(processor)  # Start the workers before timing.
+                results[name].append(_time(lambda: operation(processor)))
+    for name, timings in results.items():
+        print(f"{name:16s}  {timings[0]:8.3f}  "
+              + "  ".join(f"{t:7.3f} s " for t in timings[1:]))
+
+
+if __name__ == "__main__":
+    bench_core_scaling()
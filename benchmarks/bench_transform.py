@@ -0,0 +1,61 @@
+"""
+Compiled transform benchmarks on wide records.
+
+Usage:
+    python -m benchmarks.bench_transform
+"""
+
+import time
+
+from src.transform import compile_transform
+
+
+def _time(fn) -> float:
+    """Return the best wall time of three calls in seconds."""
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _interpreted(records, mapping):
+    """The original transform_data loop: interpret the mapping on every row."""
+    result = []
+    for item in records:
+        transformed = {}
+        for old_key, new_key in mapping.items():
+            if old_key in item:
+                transformed[new_key] = item[old_key]
+        result.append(transformed)
+    return result
+
+
+def bench_wide_records(rows: int = 200_000, fields: int = 60):
+    """Compare the interpreted loop with compiled plans on wide records."""
+    records = [{f"field_{j}": i * fields + j for j in range(fields)} for i in range(rows)]
+    rename = {f"field_{j}": f"column_{j}" for j in range(fields)}
+    projection = [f"field_{j}" for j in range(0, fields, 3)]
+    casts = {f"column_{j}": float for j in range(0, fields, 5)}
+    computed = {"total": lambda r: r["field_0"] + r["field_1"]}
+    sparse = [dict(record) for record in records]
+    for record in sparse[::2]:
+        del record["field_7"]
+    cases = [
+        ("rename all, interpreted", lambda: _interpreted(records, rename)),
+        ("rename all, compiled", lambda: list(map(compile_transform(rename), records))),
+        ("project 1/3, interpreted",
+         lambda: _interpreted(records, {field: field for field in projection})),
+        ("project 1/3, compiled", lambda: list(map(compile_transform(projection), records))),
+        ("rename + casts + computed", lambda: list(map(
+            compile_transform(rename, computed, casts), records))),
+        ("rename, half missing a field", lambda: list(map(compile_transform(rename), sparse))),
+    ]
+    print(f"rows {rows:,}, {fields} fields")
+    for name, operation in cases:
+        print(f"{name:30s} {_time(operation):7.3f} s")
+
+
+if __name__ == "__main__":
+    bench_wide_records()
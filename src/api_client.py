@@ -2,22 +2,127 @@
 API client module for making HTTP requests.
 """
 
-from typing import Dict, Optional, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Any, Iterator, List, Tuple, Union
+from urllib.parse import urljoin
 import json
+import random
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .json_stream import iter_json_array, iter_ndjson
+from .resilience import CircuitBreaker, RateLimiter
+from .response_cache import ResponseCache
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+PAGINATION_STRATEGIES = ("cursor", "offset", "link")
+
+
+class APIError(Exception):
+    """Raised when an API request fails."""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None, body: Any = None):
+        """
+        Initialize API error.
+        
+        Args:
+            message: Error description
+            status_code: HTTP status code, if a response was received
+            body: Response body, if a response was received
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+
+class CircuitOpenError(APIError):
+    """Raised without sending a request while the circuit breaker is open."""
+
+
+class RateLimitError(APIError):
+    """Raised when the rate limiter cannot grant a request in time."""
 
 
 class APIClient:
-    """Client for making API requests."""
+    """
+    Client for making API requests.
     
-    def __init__(self, base_url: str):
+    Requests go through a pooled ``requests.Session`` so connections are
+    kept alive and reused. Connection failures and retryable status codes
+    are retried with exponential backoff and full jitter.
+    """
+    
+    def __init__(
+        self,
+        base_url: str,
+        timeout: Union[float, Tuple[float, float]] = (3.05, 30.0),
+        pool_size: int = 10,
+        pool_hosts: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.1,
+        backoff_max: float = 10.0,
+        retry_methods: frozenset = IDEMPOTENT_METHODS,
+        session: Optional[requests.Session] = None,
+        response_cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        rate_limit_timeout: Optional[float] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
         """
         Initialize API client.
         
         Args:
             base_url: Base URL for API requests
+            timeout: Request timeout in seconds, or a (connect, read) tuple
+            pool_size: Maximum kept-alive connections per host
+            pool_hosts: Number of per-host connection pools to keep
+            max_retries: Number of retries after the first attempt
+            backoff_factor: Base delay in seconds; the delay before retry
+                ``n`` is drawn uniformly from ``[0, backoff_factor * 2**n]``
+            backoff_max: Upper bound for a single backoff delay
+            retry_methods: HTTP methods that are safe to retry
+            session: Session to use instead of creating one
+            response_cache: Opt-in cache for GET responses
+            rate_limiter: Token-bucket limiter applied to every attempt
+            rate_limit_timeout: Maximum seconds to wait for the rate
+                limiter before raising RateLimitError (None waits)
+            circuit_breaker: Breaker that fails calls fast while the
+                backend is unhealthy; connection errors and 5xx responses
+                count as failures
         """
         self.base_url = base_url.rstrip('/')
         self.headers = {"Content-Type": "application/json"}
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.retry_methods = retry_methods
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter
+        self.rate_limit_timeout = rate_limit_timeout
+        self.circuit_breaker = circuit_breaker
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+    
+    def __enter__(self) -> "APIClient":
+        """Use the client as a context manager that closes it on exit."""
+        return self
+    
+    def __exit__(self, *exc_info):
+        """Close the client."""
+        self.close()
+    
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
     
     def set_header(self, key: str, value: str):
         """
@@ -35,13 +140,126 @@ class APIClient:
         
         Args:
             endpoint: API endpoint
-            
+        
         Returns:
             Full URL
         """
         endpoint = endpoint.lstrip('/')
         return f"{self.base_url}/{endpoint}"
     
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Get the delay before retry number ``attempt``."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * 2 ** attempt))
+    
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Send a request, retrying transient failures.
+        
+        Args:
+            method: HTTP method
+            endpoint: API endpoint or absolute URL
+            params: Query parameters
+            data: Request body data, sent as JSON
+            headers: Extra headers for this request
+            stream: Whether to defer downloading the response body
+        
+        Returns:
+            The final response
+        
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            RateLimitError: If the rate limiter wait exceeds its timeout
+            APIError: If the request could not be completed
+        """
+        method = method.upper()
+        url = endpoint if "://" in endpoint else self.build_url(endpoint)
+        merged_headers = {**self.headers, **(headers or {})}
+        body = json.dumps(data) if data is not None else None
+        
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return self._send(method, url, params, body, merged_headers, stream)
+        if not breaker.allow():
+            raise CircuitOpenError(f"{method} {url} rejected: circuit open")
+        try:
+            response = self._send(method, url, params, body, merged_headers, stream)
+        except RateLimitError:
+            breaker.release()
+            raise
+        except BaseException:
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+    
+    def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict],
+        body: Optional[str],
+        headers: Dict[str, str],
+        stream: bool,
+    ) -> requests.Response:
+        """Send a request with rate limiting and retries."""
+        retries = self.max_retries if method in self.retry_methods else 0
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None and not self.rate_limiter.acquire(
+                url, self.rate_limit_timeout
+            ):
+                raise RateLimitError(f"{method} {url} rejected: rate limit exceeded")
+            response = None
+            try:
+                response = self.session.request(
+                    method, url, params=params, data=body, headers=headers,
+                    timeout=self.timeout, stream=stream,
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if attempt >= retries:
+                    raise APIError(f"{method} {url} failed: {exc}") from exc
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    return response
+                response.close()
+            time.sleep(self._backoff(attempt, response))
+            attempt += 1
+    
+    def _decode(self, response: requests.Response) -> Dict[str, Any]:
+        """Decode a JSON response body, raising APIError on error statuses."""
+        if response.status_code >= 400:
+            raise APIError(
+                f"{response.request.method} {response.url} failed with status "
+                f"{response.status_code}",
+                status_code=response.status_code,
+                body=response.text,
+            )
+        if not response.content:
+            return {}
+        try:
+            return response.json()
+        except ValueError as exc:
+            raise APIError(
+                f"Invalid JSON in response from {response.url}",
+                status_code=response.status_code,
+                body=response.text,
+            ) from exc
+    
     def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Make GET request.
@@ -49,13 +267,37 @@ class APIClient:
         Args:
             endpoint: API endpoint
             params: Query parameters
-            
+        
         Returns:
             Response data as dictionary
         """
-        url = self.build_url(endpoint)
-        # Simulated response for demonstration
-        return {"status": "success", "url": url, "method": "GET", "params": params or {}}
+        if self.response_cache is None:
+            return self._decode(self.request("GET", endpoint, params=params))
+        return self._cached_get(endpoint, params)
+    
+    def _cached_get(self, endpoint: str, params: Optional[Dict]) -> Dict[str, Any]:
+        """GET through the response cache, revalidating stale entries."""
+        cache = self.response_cache
+        url = endpoint if "://" in endpoint else self.build_url(endpoint)
+        key = cache.key(url, params, self.headers)
+        cached = cache.lookup(key)
+        if cached is not None and cached.is_fresh():
+            cache.record_hit(cached)
+            return json.loads(cached.content) if cached.content else {}
+        
+        headers = None
+        if cached is not None and cached.etag:
+            headers = {"If-None-Match": cached.etag}
+        response = self.request("GET", url, params=params, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            cache.refresh(key, cached, response.headers)
+            return json.loads(cached.content) if cached.content else {}
+        
+        cache.misses += 1
+        result = self._decode(response)
+        if response.status_code == 200:
+            cache.store(key, response.content, response.headers)
+        return result
     
     def post(self, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
         """
@@ -64,13 +306,11 @@ class APIClient:
         Args:
             endpoint: API endpoint
             data: Request body data
-            
+        
         Returns:
             Response data as dictionary
         """
-        url = self.build_url(endpoint)
-        # Simulated response for demonstration
-        return {"status": "success", "url": url, "method": "POST", "data": data or {}}
+        return self._decode(self.request("POST", endpoint, data=data))
     
     def put(self, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
         """
@@ -79,13 +319,11 @@ class APIClient:
         Args:
             endpoint: API endpoint
             data: Request body data
-            
+        
         Returns:
             Response data as dictionary
         """
-        url = self.build_url(endpoint)
-        # Simulated response for demonstration
-        return {"status": "success", "url": url, "method": "PUT", "data": data or {}}
+        return self._decode(self.request("PUT", endpoint, data=data))
     
     def delete(self, endpoint: str) -> Dict[str, Any]:
         """
@@ -93,10 +331,199 @@ class APIClient:
         
         Args:
             endpoint: API endpoint
-            
+        
         Returns:
             Response data as dictionary
         """
-        url = self.build_url(endpoint)
-        # Simulated response for demonstration
-        return {"status": "success", "url": url, "method": "DELETE"}
+        return self._decode(self.request("DELETE", endpoint))
+    
+    def _page_items(self, page: Any, items_key: Optional[str]) -> List:
+        """Get the list of records in a decoded page."""
+        if isinstance(page, list):
+            return page
+        return page.get(items_key, []) if items_key else []
+    
+    def _next_page(
+        self,
+        strategy: str,
+        url: str,
+        params: Dict,
+        page: Any,
+        response: requests.Response,
+        options: Dict[str, Any],
+    ) -> Optional[Tuple[str, Optional[Dict]]]:
+        """Work out the (url, params) of the page after ``page``, if any."""
+        if strategy == "link":
+            link = response.links.get("next")
+            return (urljoin(url, link["url"]), None) if link else None
+        if strategy == "cursor":
+            cursor = page.get(options["next_cursor_key"]) if isinstance(page, dict) else None
+            if not cursor:
+                return None
+            return url, {**params, options["cursor_param"]: cursor}
+        items = self._page_items(page, options["items_key"])
+        if len(items) < options["page_size"]:
+            return None
+        offset = params[options["offset_param"]] + len(items)
+        return url, {**params, options["offset_param"]: offset}
+    
+    def iter_pages(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        strategy: str = "cursor",
+        items_key: Optional[str] = "items",
+        cursor_param: str = "cursor",
+        next_cursor_key: str = "next_cursor",
+        offset_param: str = "offset",
+        limit_param: str = "limit",
+        page_size: int = 100,
+        prefetch: bool = True,
+    ) -> Iterator[Any]:
+        """
+        Lazily iterate over the pages of a paginated endpoint.
+        
+        Pages are requested only as they are consumed. With ``prefetch``
+        the next page is fetched in a background thread while the caller
+        works on the current one.
+        
+        Strategies:
+            cursor: the response's ``next_cursor_key`` value is sent back as
+                ``cursor_param`` until it is empty
+            offset: ``offset_param``/``limit_param`` advance by
+                ``page_size`` until a short page is returned
+            link: the ``rel="next"`` URL of the Link header is followed
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters for the first page
+            strategy: "cursor", "offset" or "link"
+            items_key: Key of the record list in object pages (list pages
+                are used as-is); used to detect the last offset page
+            cursor_param: Query parameter that carries the cursor
+            next_cursor_key: Response key holding the next cursor
+            offset_param: Query parameter for the offset
+            limit_param: Query parameter for the page size
+            page_size: Records requested per page (offset strategy)
+            prefetch: Fetch the next page while the current one is consumed
+            
+        Returns:
+            Iterator over decoded pages
+            
+        Raises:
+            ValueError: If the strategy is unknown
+            APIError: If a page request fails
+        """
+        if strategy not in PAGINATION_STRATEGIES:
+            raise ValueError(f"Unknown pagination strategy: {strategy}")
+        options = {
+            "items_key": items_key,
+            "cursor_param": cursor_param,
+            "next_cursor_key": next_cursor_key,
+            "offset_param": offset_param,
+            "page_size": page_size,
+        }
+        params = dict(params or {})
+        if strategy == "offset":
+            params.setdefault(offset_param, 0)
+            params[limit_param] = page_size
+        return self._iter_pages(self.build_url(endpoint), params, strategy, options, prefetch)
+    
+    def _iter_pages(
+        self,
+        url: str,
+        params: Dict,
+        strategy: str,
+        options: Dict[str, Any],
+        prefetch: bool,
+    ) -> Iterator[Any]:
+        """Generator behind iter_pages."""
+        def fetch(page_url: str, page_params: Optional[Dict]):
+            response = self.request("GET", page_url, params=page_params)
+            return response, self._decode(response)
+        
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            current: Optional[Tuple[str, Optional[Dict]]] = (url, params)
+            pending: Optional[Future] = None
+            while current is not None:
+                page_url, page_params = current
+                if pending is not None:
+                    response, page = pending.result()
+                else:
+                    response, page = fetch(page_url, page_params)
+                current = self._next_page(
+                    strategy, page_url, page_params or {}, page, response, options
+                )
+                pending = None
+                if current is not None and executor is not None:
+                    pending = executor.submit(fetch, *current)
+                yield page
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+    
+    def stream_json(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        format: str = "auto",
+        chunk_size: int = 65536,
+    ) -> Iterator[Any]:
+        """
+        Decode a large JSON array or NDJSON response one item at a time.
+        
+        The body is downloaded in ``chunk_size`` pieces and decoded
+        incrementally, so memory stays bounded by the largest item rather
+        than the whole response.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            format: "array", "ndjson", or "auto" to detect from the body
+            chunk_size: Bytes read from the socket at a time
+            
+        Returns:
+            Iterator over decoded items
+            
+        Raises:
+            ValueError: If the format is unknown
+            APIError: If the request fails or the body is malformed
+        """
+        if format not in ("auto", "array", "ndjson"):
+            raise ValueError(f"Unknown stream format: {format}")
+        return self._stream_json(endpoint, params, format, chunk_size)
+    
+    def _stream_json(
+        self, endpoint: str, params: Optional[Dict], format: str, chunk_size: int
+    ) -> Iterator[Any]:
+        """Generator behind stream_json."""
+        response = self.request("GET", endpoint, params=params, stream=True)
+        try:
+            if response.status_code >= 400:
+                response.content  # Load the error body for APIError.
+                self._decode(response)
+            chunks = response.iter_content(chunk_size=chunk_size)
+            if format == "auto":
+                first = b""
+                for first in chunks:
+                    if first.strip():
+                        break
+                format = "array" if first.lstrip().startswith(b"[") else "ndjson"
+                chunks = _prepend(first, chunks)
+            decode = iter_json_array if format == "array" else iter_ndjson
+            try:
+                yield from decode(chunks)
+            except ValueError as exc:
+                raise APIError(
+                    f"Invalid JSON stream from {response.url}: {exc}",
+                    status_code=response.status_code,
+                ) from exc
+        finally:
+            response.close()
+
+
+def _prepend(first: bytes, rest: Iterator[bytes]) -> Iterator[bytes]:
+    """Yield ``first`` and then the remaining chunks."""
+    yield first
+    yield from rest
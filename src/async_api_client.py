@@ -0,0 +1,445 @@
+"""
+Asynchronous API client module for concurrent HTTP requests.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlencode, urlsplit
+import asyncio
+import json
+import ssl
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from .api_client import APIError
+
+
+RequestSpec = Union[Tuple[str, str], Tuple[str, str, Optional[Dict]]]
+
+
+class AsyncResponse:
+    """A fully read HTTP response."""
+    
+    def __init__(self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes):
+        """
+        Initialize response.
+        
+        Args:
+            method: Request method
+            url: Request URL
+            status: HTTP status code
+            headers: Response headers with lower-cased names
+            body: Response body
+        """
+        self.method = method
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+    
+    def json(self) -> Any:
+        """
+        Decode the body as JSON.
+        
+        Returns:
+            Decoded body, or an empty dict if the body is empty
+        """
+        return json.loads(self.body) if self.body else {}
+
+
+class _Connection:
+    """A kept-alive stream connection."""
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+    
+    def close(self):
+        self.writer.close()
+
+
+class _StreamsTransport:
+    """
+    Minimal HTTP/1.1 transport on asyncio streams.
+    
+    Keeps up to ``pool_size`` connections per host alive and reuses them.
+    """
+    
+    def __init__(self, pool_size: int):
+        self._pool_size = pool_size
+        self._idle: Dict[Tuple[str, str, int], List[_Connection]] = {}
+        self._limits: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+    
+    async def _connect(self, scheme: str, host: str, port: int) -> _Connection:
+        context = ssl.create_default_context() if scheme == "https" else None
+        reader, writer = await asyncio.open_connection(host, port, ssl=context)
+        return _Connection(reader, writer)
+    
+    async def request(
+        self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes]
+    ) -> AsyncResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        limit = self._limits.get(key)
+        if limit is None:
+            limit = self._limits[key] = asyncio.Semaphore(self._pool_size)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        lines.append(f"Content-Length: {len(body) if body else 0}")
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        
+        async with limit:
+            idle = self._idle.setdefault(key, [])
+            while True:
+                reused = bool(idle)
+                connection = idle.pop() if reused else await self._connect(*key)
+                try:
+                    connection.writer.write(head + (body or b""))
+                    await connection.writer.drain()
+                    status, response_headers, payload, keep_alive = await self._read(
+                        connection.reader, method
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    connection.close()
+                    if reused:
+                        # The server closed an idle connection; try another.
+                        continue
+                    raise
+                except BaseException:
+                    connection.close()
+                    raise
+                if keep_alive:
+                    idle.append(connection)
+                else:
+                    connection.close()
+                return AsyncResponse(method, url, status, response_headers, payload)
+    
+    async def _read(
+        self, reader: asyncio.StreamReader, method: str
+    ) -> Tuple[int, Dict[str, str], bytes, bool]:
+        status_line = await reader.readuntil(b"\r\n")
+        version, status, _ = (status_line.decode("latin-1").rstrip("\r\n") + " ").split(" ", 2)
+        status = int(status)
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size_line = await reader.readuntil(b"\r\n")
+                size = int(size_line.split(b";", 1)[0], 16)
+                if size == 0:
+                    # Skip trailers up to the terminating blank line.
+                    while await reader.readuntil(b"\r\n") != b"\r\n":
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return status, headers, body, keep_alive
+    
+    async def close(self):
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle.clear()
+
+
+class _AiohttpTransport:
+    """Transport backed by an aiohttp ClientSession."""
+    
+    def __init__(self, pool_size: int):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for the 'aiohttp' backend")
+        self._pool_size = pool_size
+        self._session = None
+    
+    async def request(
+        self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes]
+    ) -> AsyncResponse:  # pragma: no cover - requires aiohttp
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit_per_host=self._pool_size)
+            self._session = aiohttp.ClientSession(connector=connector)
+        async with self._session.request(method, url, headers=headers, data=body) as response:
+            payload = await response.read()
+            response_headers = {name.lower(): value for name, value in response.headers.items()}
+            return AsyncResponse(method, url, response.status, response_headers, payload)
+    
+    async def close(self):  # pragma: no cover - requires aiohttp
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class AsyncAPIClient:
+    """
+    Asynchronous client for making API requests.
+    
+    Mirrors APIClient but runs on asyncio, so many calls can be in flight
+    at once. The default backend speaks HTTP/1.1 over asyncio streams with
+    per-host keep-alive pools; ``backend="aiohttp"`` uses aiohttp instead
+    when it is installed.
+    """
+    
+    BACKENDS = ("streams", "aiohttp")
+    
+    def __init__(
+        self,
+        base_url: str,
+        timeout: Optional[float] = 30.0,
+        pool_size: int = 10,
+        backend: str = "streams",
+    ):
+        """
+        Initialize async API client.
+        
+        Args:
+            base_url: Base URL for API requests
+            timeout: Default per-request timeout in seconds (None for no limit)
+            pool_size: Maximum concurrent connections per host
+            backend: Transport backend, "streams" or "aiohttp"
+        
+        Raises:
+            ValueError: If the backend is unknown
+            ImportError: If the aiohttp backend is chosen but not installed
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        self.base_url = base_url.rstrip('/')
+        self.headers = {"Content-Type": "application/json"}
+        self.timeout = timeout
+        if backend == "aiohttp":
+            self._transport = _AiohttpTransport(pool_size)
+        else:
+            self._transport = _StreamsTransport(pool_size)
+    
+    async def __aenter__(self) -> "AsyncAPIClient":
+        """Use the client as an async context manager that closes it on exit."""
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        """Close the client."""
+        await self.close()
+    
+    async def close(self):
+        """Close pooled connections."""
+        await self._transport.close()
+    
+    def set_header(self, key: str, value: str):
+        """
+        Set a custom header.
+        
+        Args:
+            key: Header key
+            value: Header value
+        """
+        self.headers[key] = value
+    
+    def build_url(self, endpoint: str) -> str:
+        """
+        Build full URL from endpoint.
+        
+        Args:
+            endpoint: API endpoint
+        
+        Returns:
+            Full URL
+        """
+        endpoint = endpoint.lstrip('/')
+        return f"{self.base_url}/{endpoint}"
+    
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncResponse:
+        """
+        Send a request.
+        
+        Args:
+            method: HTTP method
+            endpoint: API endpoint or absolute URL
+            params: Query parameters
+            data: Request body data, sent as JSON
+            headers: Extra headers for this request
+            timeout: Timeout in seconds (uses the client default if None)
+        
+        Returns:
+            The response
+        
+        Raises:
+            APIError: If the request fails or times out
+        """
+        method = method.upper()
+        url = endpoint if "://" in endpoint else self.build_url(endpoint)
+        if params:
+            url += ("&" if "?" in url else "?") + urlencode(params, doseq=True)
+        body = json.dumps(data).encode() if data is not None else None
+        merged_headers = {**self.headers, **(headers or {})}
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(
+                self._transport.request(method, url, merged_headers, body), timeout
+            )
+        except asyncio.TimeoutError as exc:
+            raise APIError(f"{method} {url} timed out after {timeout}s") from exc
+        except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+            raise APIError(f"{method} {url} failed: {exc}") from exc
+    
+    def _decode(self, response: AsyncResponse) -> Dict[str, Any]:
+        """Decode a JSON response body, raising APIError on error statuses."""
+        if response.status >= 400:
+            raise APIError(
+                f"{response.method} {response.url} failed with status {response.status}",
+                status_code=response.status,
+                body=response.body.decode("utf-8", "replace"),
+            )
+        try:
+            return response.json()
+        except ValueError as exc:
+            raise APIError(
+                f"Invalid JSON in response from {response.url}",
+                status_code=response.status,
+                body=response.body.decode("utf-8", "replace"),
+            ) from exc
+    
+    async def get(
+        self, endpoint: str, params: Optional[Dict] = None, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Make GET request.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            timeout: Timeout in seconds (uses the client default if None)
+        
+        Returns:
+            Response data as dictionary
+        """
+        return self._decode(await self.request("GET", endpoint, params=params, timeout=timeout))
+    
+    async def post(
+        self, endpoint: str, data: Optional[Dict] = None, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Make POST request.
+        
+        Args:
+            endpoint: API endpoint
+            data: Request body data
+            timeout: Timeout in seconds (uses the client default if None)
+        
+        Returns:
+            Response data as dictionary
+        """
+        return self._decode(await self.request("POST", endpoint, data=data, timeout=timeout))
+    
+    async def put(
+        self, endpoint: str, data: Optional[Dict] = None, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Make PUT request.
+        
+        Args:
+            endpoint: API endpoint
+            data: Request body data
+            timeout: Timeout in seconds (uses the client default if None)
+        
+        Returns:
+            Response data as dictionary
+        """
+        return self._decode(await self.request("PUT", endpoint, data=data, timeout=timeout))
+    
+    async def delete(self, endpoint: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Make DELETE request.
+        
+        Args:
+            endpoint: API endpoint
+            timeout: Timeout in seconds (uses the client default if None)
+        
+        Returns:
+            Response data as dictionary
+        """
+        return self._decode(await self.request("DELETE", endpoint, timeout=timeout))
+    
+    async def _call(self, spec: RequestSpec, timeout: Optional[float]) -> Dict[str, Any]:
+        """Run one gather_many request spec."""
+        method, endpoint = spec[0].upper(), spec[1]
+        payload = spec[2] if len(spec) > 2 else None
+        if method in ("POST", "PUT", "PATCH"):
+            response = await self.request(method, endpoint, data=payload, timeout=timeout)
+        else:
+            response = await self.request(method, endpoint, params=payload, timeout=timeout)
+        return self._decode(response)
+    
+    async def gather_many(
+        self,
+        requests: Iterable[RequestSpec],
+        concurrency: int = 10,
+        timeout: Optional[float] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Run many requests with at most ``concurrency`` in flight.
+        
+        Each request is a ``(method, endpoint)`` or ``(method, endpoint,
+        payload)`` tuple; the payload is sent as query parameters for GET
+        and DELETE and as the JSON body otherwise. Cancelling the call
+        cancels every outstanding request.
+        
+        Args:
+            requests: Request tuples
+            concurrency: Maximum number of requests in flight
+            timeout: Per-request timeout in seconds (uses the client
+                default if None)
+            return_exceptions: Return errors in place of results instead
+                of raising the first one
+        
+        Returns:
+            Decoded responses in the same order as ``requests``
+        
+        Raises:
+            ValueError: If concurrency is not positive
+            APIError: If a request fails and return_exceptions is False
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def bounded(spec: RequestSpec) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._call(spec, timeout)
+        
+        tasks = [asyncio.ensure_future(bounded(spec)) for spec in requests]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        finally:
+            for task in tasks:
+                task.cancel()
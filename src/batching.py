@@ -0,0 +1,287 @@
+"""
+Request coalescing for APIClient.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+import threading
+
+from .api_client import APIClient, APIError
+
+
+class BatchEndpoint:
+    """
+    Adapter describing a backend's bulk lookup endpoint.
+    
+    The default implementation sends ``GET endpoint?ids=1,2,3`` (or a POST
+    with ``{"ids": [...]}``) and matches the returned items back to keys by
+    their ``id_key`` field. Subclass and override ``fetch`` and ``split``
+    for other shapes.
+    """
+    
+    def __init__(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        param: str = "ids",
+        separator: str = ",",
+        items_key: Optional[str] = "items",
+        id_key: str = "id",
+    ):
+        """
+        Initialize batch endpoint.
+        
+        Args:
+            endpoint: Bulk lookup endpoint
+            method: "GET" (keys in the query string) or "POST" (keys in
+                the JSON body)
+            param: Query parameter or body field holding the keys
+            separator: Separator joining keys in the query string
+            items_key: Key of the item list in the response (None if the
+                response is the list itself)
+            id_key: Item field identifying which key it answers
+        
+        Raises:
+            ValueError: If the method is not GET or POST
+        """
+        method = method.upper()
+        if method not in ("GET", "POST"):
+            raise ValueError(f"Unsupported batch method: {method}")
+        self.endpoint = endpoint
+        self.method = method
+        self.param = param
+        self.separator = separator
+        self.items_key = items_key
+        self.id_key = id_key
+    
+    def fetch(self, client: APIClient, keys: List[Hashable]) -> Any:
+        """
+        Send one bulk request for several keys.
+        
+        Args:
+            client: Client to send the request with
+            keys: Distinct keys to look up
+        
+        Returns:
+            Decoded response
+        """
+        if self.method == "POST":
+            return client.post(self.endpoint, {self.param: keys})
+        return client.get(self.endpoint, {self.param: self.separator.join(map(str, keys))})
+    
+    def split(self, keys: List[Hashable], response: Any) -> Dict[Hashable, Any]:
+        """
+        Split a bulk response into one result per key.
+        
+        Args:
+            keys: Keys that were requested
+            response: Decoded bulk response
+        
+        Returns:
+            Dictionary of key to result; keys without a result are omitted
+        """
+        items = response if self.items_key is None else response.get(self.items_key) or []
+        by_id = {str(item.get(self.id_key)): item for item in items}
+        return {key: by_id[str(key)] for key in keys if str(key) in by_id}
+
+
+class RequestCoalescer:
+    """
+    Coalesce individual lookups into bulk requests.
+    
+    Keys passed to ``load`` are collected for up to ``window`` seconds, or
+    until ``max_batch`` are pending, and then sent as one request through
+    the ``BatchEndpoint`` adapter. Each caller gets a future for its own
+    key. A key that is already pending or in flight shares the existing
+    future instead of being requested again; ``get`` does the same for
+    identical plain GET requests.
+    """
+    
+    def __init__(
+        self,
+        client: APIClient,
+        adapter: BatchEndpoint,
+        window: float = 0.005,
+        max_batch: int = 100,
+        max_workers: int = 4,
+    ):
+        """
+        Initialize request coalescer.
+        
+        Args:
+            client: Client used to send requests
+            adapter: Bulk endpoint adapter
+            window: Seconds to wait for more keys before sending a batch
+            max_batch: Maximum keys per bulk request
+            max_workers: Maximum bulk requests in flight at once
+        
+        Raises:
+            ValueError: If window is negative or max_batch is below 1
+        """
+        if window < 0:
+            raise ValueError("window must not be negative")
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.client = client
+        self.adapter = adapter
+        self.window = window
+        self.max_batch = max_batch
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="coalescer")
+        self._lock = threading.Lock()
+        self._futures: Dict[Hashable, Future] = {}
+        self._pending: List[Hashable] = []
+        self._timer: Optional[threading.Timer] = None
+        self._shared: Dict[Tuple, Future] = {}
+        self._closed = False
+        self.calls = 0
+        self.deduplicated = 0
+        self.batches = 0
+    
+    def __enter__(self) -> "RequestCoalescer":
+        """Enter context manager."""
+        return self
+    
+    def __exit__(self, *exc_info):
+        """Exit context manager, sending pending keys first."""
+        self.close()
+    
+    def load(self, key: Hashable) -> Future:
+        """
+        Request the result for a key.
+        
+        Args:
+            key: Key to look up
+        
+        Returns:
+            Future resolving to the key's result; it raises APIError if
+            the bulk response has no result for the key
+        
+        Raises:
+            RuntimeError: If the coalescer has been closed
+        """
+        batch = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot load keys after the coalescer is closed")
+            self.calls += 1
+            future = self._futures.get(key)
+            if future is not None:
+                self.deduplicated += 1
+                return future
+            future = self._futures[key] = Future()
+            self._pending.append(key)
+            if len(self._pending) >= self.max_batch:
+                batch = self._take_pending()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch:
+            self._executor.submit(self._send, batch)
+        return future
+    
+    def load_many(self, keys: Iterable[Hashable],
+                  timeout: Optional[float] = None) -> Dict[Hashable, Any]:
+        """
+        Look up several keys and wait for their results.
+        
+        Args:
+            keys: Keys to look up
+            timeout: Maximum seconds to wait for each result
+        
+        Returns:
+            Dictionary of key to result
+        """
+        futures = {key: self.load(key) for key in keys}
+        return {key: future.result(timeout) for key, future in futures.items()}
+    
+    def flush(self):
+        """Send pending keys now instead of waiting for the window."""
+        with self._lock:
+            batch = self._take_pending()
+        if batch:
+            self._executor.submit(self._send, batch)
+    
+    def _take_pending(self) -> List[Hashable]:
+        """Detach pending keys and cancel the window timer; call with the lock held."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        return batch
+    
+    def _send(self, keys: List[Hashable]):
+        """Send one bulk request and resolve the futures of its keys."""
+        try:
+            results = self.adapter.split(keys, self.adapter.fetch(self.client, keys))
+        except Exception as exc:
+            results, error = {}, exc
+        else:
+            error = None
+        with self._lock:
+            self.batches += 1
+            futures = [(key, self._futures.pop(key)) for key in keys]
+        for key, future in futures:
+            if error is not None:
+                future.set_exception(error)
+            elif key in results:
+                future.set_result(results[key])
+            else:
+                future.set_exception(APIError(f"No result for {key!r} in batch response", 404))
+    
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Make a GET request, sharing the response of an identical one in flight.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+        
+        Returns:
+            Response data as dictionary
+        """
+        key = (endpoint, tuple(sorted((str(name), str(value))
+                                      for name, value in (params or {}).items())))
+        with self._lock:
+            self.calls += 1
+            future = self._shared.get(key)
+            owner = future is None
+            if owner:
+                future = self._shared[key] = Future()
+            else:
+                self.deduplicated += 1
+        if not owner:
+            return future.result()
+        try:
+            result = self.client.get(endpoint, params)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._shared[key]
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing counters.
+        
+        Returns:
+            Dictionary with calls, deduplicated and batches
+        """
+        return {"calls": self.calls, "deduplicated": self.deduplicated, "batches": self.batches}
+    
+    def close(self):
+        """
+        Send pending keys and wait for in-flight batches to finish.
+        
+        Further calls to ``load`` raise RuntimeError.
+        """
+        with self._lock:
+            self._closed = True
+            batch = self._take_pending()
+        if batch:
+            self._executor.submit(self._send, batch)
+        self._executor.shutdown(wait=True)
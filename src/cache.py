@@ -2,22 +2,727 @@
 Caching module with TTL support.
 """
 
-from typing import Any, Optional, Dict
-from datetime import datetime, timedelta
+import asyncio
+import heapq
+import itertools
+import math
+import pickle
+import random
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any, Awaitable, Callable, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Tuple,
+    Union,
+)
+
+
+EVICTION_POLICIES = ("lru", "lfu", "tinylfu")
+
+# SQLite's default limit on host parameters in one statement is 999.
+_SQL_BATCH = 500
+
+
+def _chunks(items: List, size: int = _SQL_BATCH) -> Iterator[List]:
+    """Split a list into consecutive slices of at most ``size`` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class _Entry:
+    """
+    A cached value together with its bookkeeping data.
+    
+    ``fresh_until`` is when the value stops being returned by ``get``;
+    ``expires_at`` is when it is dropped. They differ only for entries
+    stored with a stale-while-revalidate window. ``delta`` is how long the
+    value took to compute, used for probabilistic early refresh.
+    """
+    
+    __slots__ = ("value", "expires_at", "size", "fresh_until", "delta")
+    
+    def __init__(
+        self,
+        value: Any,
+        expires_at: float,
+        size: int = 0,
+        fresh_until: Optional[float] = None,
+        delta: float = 0.0,
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.fresh_until = expires_at if fresh_until is None else fresh_until
+        self.delta = delta
+
+
+class _Flight:
+    """A value load in progress that other callers can wait on."""
+    
+    __slots__ = ("done", "value", "error")
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _LRUPolicy:
+    """Least-recently-used eviction order."""
+    
+    def __init__(self):
+        self._order: "OrderedDict[Hashable, None]" = OrderedDict()
+    
+    def insert(self, key: Hashable):
+        self._order[key] = None
+    
+    def access(self, key: Hashable):
+        self._order.move_to_end(key)
+    
+    def remove(self, key: Hashable):
+        self._order.pop(key, None)
+    
+    def victim(self) -> Hashable:
+        return next(iter(self._order))
+    
+    def clear(self):
+        self._order.clear()
+
+
+class _LFUPolicy:
+    """
+    Least-frequently-used eviction order.
+    
+    Keys are kept in one insertion-ordered bucket per access count, so
+    recording an access and picking a victim are both O(1); ties are
+    broken by recency.
+    """
+    
+    def __init__(self):
+        self._counts: Dict[Hashable, int] = {}
+        self._buckets: Dict[int, "OrderedDict[Hashable, None]"] = {}
+        self._min_count = 0
+    
+    def _unlink(self, key: Hashable, count: int):
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+    
+    def insert(self, key: Hashable):
+        self._counts[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_count = 1
+    
+    def access(self, key: Hashable):
+        count = self._counts[key]
+        self._unlink(key, count)
+        if self._min_count == count and count not in self._buckets:
+            self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+    
+    def remove(self, key: Hashable):
+        count = self._counts.pop(key, None)
+        if count is not None:
+            self._unlink(key, count)
+    
+    def victim(self) -> Hashable:
+        if self._min_count not in self._buckets:
+            # Only explicit deletes can leave the minimum stale.
+            self._min_count = min(self._buckets)
+        return next(iter(self._buckets[self._min_count]))
+    
+    def clear(self):
+        self._counts.clear()
+        self._buckets.clear()
+        self._min_count = 0
+
+
+class _FrequencySketch:
+    """
+    Count-min sketch of recent access frequencies.
+    
+    Counters saturate at 15 and are halved once ``10 * width`` increments
+    have been recorded, so the sketch favours recent popularity.
+    """
+    
+    _DEPTH = 4
+    _MAX_COUNT = 15
+    
+    def __init__(self, width: int = 1024):
+        size = 16
+        while size < width:
+            size <<= 1
+        self._mask = size - 1
+        self._rows = [[0] * size for _ in range(self._DEPTH)]
+        self._additions = 0
+        self._sample_size = 10 * size
+    
+    def _indexes(self, key: Hashable):
+        return [hash((seed, key)) & self._mask for seed in range(self._DEPTH)]
+    
+    def increment(self, key: Hashable):
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < self._MAX_COUNT:
+                row[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+    
+    def frequency(self, key: Hashable) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+    
+    def _age(self):
+        for row in self._rows:
+            for index, count in enumerate(row):
+                row[index] = count >> 1
+        self._additions //= 2
+    
+    def clear(self):
+        for row in self._rows:
+            row[:] = [0] * len(row)
+        self._additions = 0
+
+
+class _TinyLFUPolicy:
+    """
+    W-TinyLFU style eviction.
+    
+    New keys enter a small LRU window. When the cache is over capacity the
+    oldest window key competes with the main region's LRU victim, and only
+    the one with the higher estimated frequency is kept. This stops one-off
+    scans from flushing frequently used keys.
+    """
+    
+    WINDOW_RATIO = 0.01
+    
+    def __init__(self, sketch_width: int = 1024):
+        self._window: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._main: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._sketch = _FrequencySketch(sketch_width)
+    
+    def insert(self, key: Hashable):
+        self._sketch.increment(key)
+        self._window[key] = None
+    
+    def access(self, key: Hashable):
+        self._sketch.increment(key)
+        if key in self._window:
+            self._window.move_to_end(key)
+        else:
+            self._main.move_to_end(key)
+    
+    def remove(self, key: Hashable):
+        if key in self._window:
+            del self._window[key]
+        else:
+            self._main.pop(key, None)
+    
+    def victim(self) -> Hashable:
+        while True:
+            target = max(1, int((len(self._window) + len(self._main)) * self.WINDOW_RATIO))
+            if len(self._window) <= target:
+                return next(iter(self._main or self._window))
+            candidate = next(iter(self._window))
+            if not self._main:
+                del self._window[candidate]
+                self._main[candidate] = None
+                continue
+            main_victim = next(iter(self._main))
+            if self._sketch.frequency(candidate) > self._sketch.frequency(main_victim):
+                del self._window[candidate]
+                self._main[candidate] = None
+                return main_victim
+            return candidate
+    
+    def clear(self):
+        self._window.clear()
+        self._main.clear()
+        self._sketch.clear()
+
+
+class DiskStore:
+    """
+    Persistent SQLite-backed store used as a second cache tier.
+    
+    Values are pickled and stored with wall-clock expiry times so they
+    survive process restarts. Disk usage is bounded by ``max_entries`` and
+    ``max_bytes``; when a bound is exceeded the entries closest to expiry
+    are dropped first.
+    """
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            expires_at REAL NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Open (or create) a disk store.
+        
+        Args:
+            path: Path of the SQLite database file
+            max_entries: Maximum number of stored entries (unbounded if None)
+            max_bytes: Maximum total size of pickled values in bytes
+                (unbounded if None)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        self._count = count
+        self._bytes = total
+    
+    def set(self, key: str, value: Any, ttl: float):
+        """
+        Store a value.
+        
+        Args:
+            key: Cache key
+            value: Picklable value
+            ttl: Seconds until the value expires
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.max_bytes is not None and len(blob) > self.max_bytes:
+            self.delete(key)
+            return
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, size) VALUES (?, ?, ?, ?)",
+                (key, blob, time.time() + ttl, len(blob)),
+            )
+            if row is None:
+                self._count += 1
+                self._bytes += len(blob)
+            else:
+                self._bytes += len(blob) - row[0]
+            self._enforce_bounds()
+    
+    def _over_bounds(self) -> bool:
+        """Check whether the store exceeds its entry or byte budget."""
+        return (self.max_entries is not None and self._count > self.max_entries) or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        )
+    
+    def _enforce_bounds(self):
+        """Drop the entries closest to expiry until within bounds."""
+        while self._over_bounds():
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY expires_at LIMIT 64"
+            ).fetchall()
+            for key, size in rows:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._count -= 1
+                self._bytes -= size
+                if not self._over_bounds():
+                    break
+    
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Load a value.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Tuple of value and remaining TTL in seconds, or None if not
+            found or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        remaining = row[1] - time.time()
+        if remaining <= 0:
+            self.delete(key)
+            return None
+        return pickle.loads(row[0]), remaining
+    
+    def delete(self, key: str) -> bool:
+        """
+        Delete a stored value.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            True if key was deleted, False if not found
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return False
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._count -= 1
+            self._bytes -= row[0]
+            return True
+    
+    def _sizes(self, keys: List[str]) -> Dict[str, int]:
+        """Get the stored sizes of whichever of ``keys`` exist."""
+        sizes = {}
+        for chunk in _chunks(keys):
+            marks = ",".join("?" * len(chunk))
+            sizes.update(self._conn.execute(
+                f"SELECT key, size FROM entries WHERE key IN ({marks})", chunk
+            ).fetchall())
+        return sizes
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Any, float]]:
+        """
+        Load several values with one query per 500 keys.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Dictionary mapping each found key to (value, remaining TTL)
+        """
+        keys = list(keys)
+        now = time.time()
+        rows = []
+        with self._lock:
+            for chunk in _chunks(keys):
+                marks = ",".join("?" * len(chunk))
+                rows.extend(self._conn.execute(
+                    f"SELECT key, value, expires_at FROM entries "
+                    f"WHERE key IN ({marks}) AND expires_at > ?",
+                    chunk + [now],
+                ).fetchall())
+        return {key: (pickle.loads(blob), expires_at - now) for key, blob, expires_at in rows}
+    
+    def set_many(self, items: Mapping[str, Any], ttl: float):
+        """
+        Store several values in one transaction.
+        
+        Values larger than ``max_bytes`` are not stored, and any older value
+        of their key is deleted, as ``set`` does.
+        
+        Args:
+            items: Mapping of cache keys to picklable values
+            ttl: Seconds until the values expire
+        """
+        expires_at = time.time() + ttl
+        rows, skipped = [], []
+        for key, value in items.items():
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            if self.max_bytes is None or len(blob) <= self.max_bytes:
+                rows.append((key, blob, expires_at, len(blob)))
+            else:
+                skipped.append(key)
+        with self._lock:
+            old_sizes = self._sizes([row[0] for row in rows])
+            stale_sizes = self._sizes(skipped)
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "DELETE FROM entries WHERE key = ?", [(key,) for key in stale_sizes]
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries (key, value, expires_at, size) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._count += len(rows) - len(old_sizes) - len(stale_sizes)
+            self._bytes += (sum(row[3] for row in rows) - sum(old_sizes.values())
+                            - sum(stale_sizes.values()))
+            self._enforce_bounds()
+    
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Delete several values in one transaction.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Number of keys that were deleted
+        """
+        return len(self._delete_many(keys))
+    
+    def _delete_many(self, keys: Iterable[str]) -> List[str]:
+        """Delete several values in one transaction and return the keys that existed."""
+        keys = list(keys)
+        with self._lock:
+            sizes = self._sizes(keys)
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "DELETE FROM entries WHERE key = ?", [(key,) for key in sizes]
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._count -= len(sizes)
+            self._bytes -= sum(sizes.values())
+            return list(sizes)
+    
+    def items(self, limit: Optional[int] = None) -> Iterator[Tuple[str, Any, float]]:
+        """
+        Iterate over live entries, longest-lived first.
+        
+        Args:
+            limit: Maximum number of entries to return
+            
+        Returns:
+            Iterator of (key, value, remaining TTL in seconds) tuples
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, expires_at FROM entries WHERE expires_at > ? "
+                "ORDER BY expires_at DESC LIMIT ?",
+                (now, -1 if limit is None else limit),
+            ).fetchall()
+        for key, blob, expires_at in rows:
+            yield key, pickle.loads(blob), expires_at - now
+    
+    def purge_expired(self) -> int:
+        """
+        Remove all expired entries.
+        
+        Returns:
+            Number of entries removed
+        """
+        now = time.time()
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE expires_at <= ?",
+                (now,),
+            ).fetchone()
+            self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+            self._count -= count
+            self._bytes -= total
+            return count
+    
+    def clear(self):
+        """Remove all stored entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._count = 0
+            self._bytes = 0
+    
+    def size(self) -> int:
+        """
+        Get number of stored entries.
+        
+        Returns:
+            Number of entries on disk, including any not yet purged
+        """
+        return self._count
+    
+    def disk_bytes(self) -> int:
+        """
+        Get total size of stored values.
+        
+        Returns:
+            Sum of pickled value sizes in bytes
+        """
+        return self._bytes
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
 
 
 class Cache:
-    """Simple in-memory cache with TTL support."""
+    """
+    In-memory cache with TTL support.
+    
+    By default the cache is unbounded. Passing ``max_entries`` and/or
+    ``max_bytes`` turns on eviction using the chosen ``policy``: ``"lru"``,
+    ``"lfu"`` or ``"tinylfu"``.
     
-    def __init__(self, default_ttl: int = 3600):
+    Expiry times are read from a monotonic clock and kept in a min-heap, so
+    expired entries are purged in amortized O(log n) each instead of by
+    scanning the whole cache. All operations are guarded by a lock so an
+    optional background reaper thread can purge concurrently.
+    
+    An optional DiskStore can be attached as ``l2``. Writes go through to
+    it, L1 misses are looked up there, and ``warm_up`` bulk-loads it after
+    a restart.
+    """
+    
+    def __init__(
+        self,
+        default_ttl: int = 3600,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        policy: str = "lru",
+        sizeof: Optional[Callable[[Any], int]] = None,
+        reap_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        l2: Optional[DiskStore] = None,
+    ):
         """
         Initialize cache.
         
         Args:
             default_ttl: Default time-to-live in seconds
+            max_entries: Maximum number of entries (unbounded if None)
+            max_bytes: Maximum total size of cached values in bytes
+                (unbounded if None)
+            policy: Eviction policy, one of "lru", "lfu" or "tinylfu"
+            sizeof: Function returning the size of a value in bytes
+                (defaults to sys.getsizeof)
+            reap_interval: If set, start a background thread that purges
+                expired entries every ``reap_interval`` seconds
+            clock: Monotonic time source in seconds
+            l2: Optional persistent second tier
+        
+        Raises:
+            ValueError: If the policy or a bound is invalid
         """
-        self._cache: Dict[str, tuple] = {}
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        
+        self._cache: Dict[str, _Entry] = {}
+        self._expiry_heap: List[Tuple[float, int, str, _Entry]] = []
+        self._sequence = itertools.count()
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._l2 = l2
+        self._flights: Dict[str, _Flight] = {}
+        self._async_flights: Dict[str, "asyncio.Task"] = {}
         self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._sizeof = sizeof or sys.getsizeof
+        self._bytes = 0
+        self._policy = None
+        if max_entries is not None or max_bytes is not None:
+            if policy == "lru":
+                self._policy = _LRUPolicy()
+            elif policy == "lfu":
+                self._policy = _LFUPolicy()
+            else:
+                self._policy = _TinyLFUPolicy(max(1024, (max_entries or 0) * 4))
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        self._reaper: Optional[threading.Thread] = None
+        self._reaper_stop = threading.Event()
+        if reap_interval is not None:
+            self.start_reaper(reap_interval)
+    
+    def _remove(self, key: str) -> _Entry:
+        """Remove an entry and its eviction bookkeeping."""
+        entry = self._cache.pop(key)
+        self._bytes -= entry.size
+        if self._policy is not None:
+            self._policy.remove(key)
+        return entry
+    
+    def _evict(self, incoming_entries: int = 0, incoming_bytes: int = 0):
+        """Evict entries until the cache has room for the incoming data."""
+        while self._cache and (
+            (self.max_entries is not None
+             and len(self._cache) + incoming_entries > self.max_entries)
+            or (self.max_bytes is not None
+                and self._bytes + incoming_bytes > self.max_bytes)
+        ):
+            self._remove(self._policy.victim())
+            self.evictions += 1
+    
+    def _schedule(self, key: str, entry: _Entry):
+        """Register an entry's expiry time in the expiry heap."""
+        heap = self._expiry_heap
+        heapq.heappush(heap, (entry.expires_at, next(self._sequence), key, entry))
+        if len(heap) > 64 and len(heap) > 2 * len(self._cache):
+            # Overwrites and deletes leave stale heap items behind.
+            self._expiry_heap = [
+                (item.expires_at, next(self._sequence), name, item)
+                for name, item in self._cache.items()
+            ]
+            heapq.heapify(self._expiry_heap)
+    
+    def _purge(self, now: float) -> int:
+        """Remove every entry that expired before ``now``."""
+        heap = self._expiry_heap
+        cache = self._cache
+        removed = 0
+        while heap and heap[0][0] < now:
+            _, _, key, entry = heapq.heappop(heap)
+            if cache.get(key) is entry:
+                self._remove(key)
+                removed += 1
+        return removed
+    
+    def _store(
+        self,
+        key: str,
+        value: Any,
+        expires_at: float,
+        fresh_until: Optional[float] = None,
+        delta: float = 0.0,
+        persist: bool = True,
+    ):
+        """Insert or replace an entry, evicting if the cache is bounded."""
+        if persist and self._l2 is not None:
+            deadline = expires_at if fresh_until is None else fresh_until
+            self._l2.set(key, value, deadline - self._clock())
+        if self._policy is None:
+            entry = self._cache[key] = _Entry(value, expires_at, 0, fresh_until, delta)
+            self._schedule(key, entry)
+            return
+        
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Caching the value would flush everything else and still not fit.
+            if key in self._cache:
+                self._remove(key)
+            return
+        
+        old = self._cache.get(key)
+        entry = _Entry(value, expires_at, size, fresh_until, delta)
+        if old is None:
+            # Make room first so a new key is never its own victim.
+            self._evict(1, size)
+            self._cache[key] = entry
+            self._policy.insert(key)
+            self._bytes += size
+        else:
+            self._cache[key] = entry
+            self._bytes += size - old.size
+            self._policy.access(key)
+            self._evict()
+        self._schedule(key, entry)
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None):
         """
@@ -29,8 +734,8 @@ class Cache:
             ttl: Time-to-live in seconds (uses default if None)
         """
         ttl = ttl or self.default_ttl
-        expires_at = datetime.now() + timedelta(seconds=ttl)
-        self._cache[key] = (value, expires_at)
+        with self._lock:
+            self._store(key, value, self._clock() + ttl)
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -42,15 +747,215 @@ class Cache:
         Returns:
             Cached value or None if not found or expired
         """
-        if key not in self._cache:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                entry = self._promote(key)
+                if entry is None:
+                    self.misses += 1
+                    return None
+            
+            now = self._clock()
+            if now > entry.fresh_until:
+                if now > entry.expires_at:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            if self._policy is not None:
+                self._policy.access(key)
+            return entry.value
+    
+    def _promote(self, key: str) -> Optional[_Entry]:
+        """Copy a key from the L2 store into memory."""
+        if self._l2 is None:
             return None
-        
-        value, expires_at = self._cache[key]
-        if datetime.now() > expires_at:
-            del self._cache[key]
+        found = self._l2.get(key)
+        if found is None:
             return None
+        value, remaining = found
+        self._store(key, value, self._clock() + remaining, persist=False)
+        return self._cache.get(key)
+    
+    def _lookup(self, key: str, beta: float) -> Tuple[str, Any]:
+        """
+        Classify a key for get_or_compute.
+        
+        Returns:
+            Tuple of state and cached value, where state is "fresh",
+            "refresh" (fresh but due for early recomputation), "stale"
+            (past its TTL but inside the stale window) or "miss"
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            entry = self._promote(key)
+        now = self._clock()
+        if entry is None or now > entry.expires_at:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return "miss", None
+        
+        self.hits += 1
+        if self._policy is not None:
+            self._policy.access(key)
+        if now > entry.fresh_until:
+            return "stale", entry.value
+        # XFetch: recompute early with a probability that rises as expiry
+        # nears and scales with how long the value takes to compute.
+        if beta > 0 and entry.delta > 0:
+            gap = -entry.delta * beta * math.log(1.0 - random.random())
+            if now + gap >= entry.fresh_until:
+                return "refresh", entry.value
+        return "fresh", entry.value
+    
+    def _deadlines(self, ttl: Optional[float], stale_ttl: float) -> Tuple[float, float]:
+        """Get the (fresh_until, expires_at) pair for a value stored now."""
+        fresh_until = self._clock() + (ttl or self.default_ttl)
+        return fresh_until, fresh_until + stale_ttl
+    
+    def _load(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        ttl: Optional[float],
+        stale_ttl: float,
+        flight: _Flight,
+    ):
+        """Run a loader for a flight and publish its result."""
+        try:
+            started = self._clock()
+            value = fn()
+            delta = self._clock() - started
+            with self._lock:
+                fresh_until, expires_at = self._deadlines(ttl, stale_ttl)
+                self._store(key, value, expires_at, fresh_until, delta)
+            flight.value = value
+        except BaseException as exc:
+            flight.error = exc
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+    
+    def get_or_compute(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        ttl: Optional[int] = None,
+        beta: float = 0.0,
+        stale_ttl: float = 0.0,
+    ) -> Any:
+        """
+        Get a value, computing it on a miss with a single loader per key.
+        
+        Concurrent callers that miss on the same key wait for one call to
+        ``fn`` instead of each recomputing the value.
         
-        return value
+        Args:
+            key: Cache key
+            fn: Zero-argument function that computes the value
+            ttl: Time-to-live in seconds (uses default if None)
+            beta: XFetch early refresh factor; values above 0 refresh a
+                fresh entry in the background shortly before it expires
+                (1.0 is the usual setting, 0 disables early refresh)
+            stale_ttl: Seconds after expiry during which the old value is
+                still returned while it is refreshed in the background
+            
+        Returns:
+            Cached or freshly computed value
+            
+        Raises:
+            Exception: Whatever ``fn`` raised, for callers that waited on it
+        """
+        with self._lock:
+            state, value = self._lookup(key, beta)
+            if state == "fresh":
+                return value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        
+        if state != "miss":
+            # Serve the current value and refresh it off the request path.
+            if leader:
+                threading.Thread(
+                    target=self._load,
+                    args=(key, fn, ttl, stale_ttl, flight),
+                    name="cache-refresh",
+                    daemon=True,
+                ).start()
+            return value
+        
+        if leader:
+            self._load(key, fn, ttl, stale_ttl, flight)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+    
+    async def _aload(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        ttl: Optional[float],
+        stale_ttl: float,
+    ) -> Any:
+        """Run an async loader and store its result."""
+        try:
+            started = self._clock()
+            value = await fn()
+            delta = self._clock() - started
+            with self._lock:
+                fresh_until, expires_at = self._deadlines(ttl, stale_ttl)
+                self._store(key, value, expires_at, fresh_until, delta)
+            return value
+        finally:
+            if self._async_flights.get(key) is asyncio.current_task():
+                del self._async_flights[key]
+    
+    async def aget_or_compute(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        beta: float = 0.0,
+        stale_ttl: float = 0.0,
+    ) -> Any:
+        """
+        Async version of get_or_compute.
+        
+        Args:
+            key: Cache key
+            fn: Zero-argument coroutine function that computes the value
+            ttl: Time-to-live in seconds (uses default if None)
+            beta: XFetch early refresh factor (0 disables early refresh)
+            stale_ttl: Seconds after expiry during which the old value is
+                still returned while it is refreshed in the background
+            
+        Returns:
+            Cached or freshly computed value
+        """
+        with self._lock:
+            state, value = self._lookup(key, beta)
+        if state == "fresh":
+            return value
+        
+        loop = asyncio.get_running_loop()
+        task = self._async_flights.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._aload(key, fn, ttl, stale_ttl))
+            # Background refreshes may finish with nobody awaiting them.
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._async_flights[key] = task
+        if state != "miss":
+            return value
+        # Shield the shared load so one cancelled waiter does not cancel
+        # it for everyone else.
+        return await asyncio.shield(task)
     
     def delete(self, key: str) -> bool:
         """
@@ -62,32 +967,330 @@ class Cache:
         Returns:
             True if key was deleted, False if not found
         """
-        if key in self._cache:
-            del self._cache[key]
-            return True
-        return False
+        with self._lock:
+            deleted = self._l2 is not None and self._l2.delete(key)
+            if key in self._cache:
+                self._remove(key)
+                return True
+            return deleted
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several values in one pass.
+        
+        The lock is taken and the clock read once for the whole batch, and
+        L1 misses are fetched from the L2 store with a single bulk lookup.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Dictionary of the keys that were found and not expired
+        """
+        found = {}
+        missing = []
+        cache = self._cache
+        policy = self._policy
+        with self._lock:
+            now = self._clock()
+            for key in keys:
+                entry = cache.get(key)
+                if entry is None or now > entry.fresh_until:
+                    if entry is not None and now > entry.expires_at:
+                        self._remove(key)
+                    missing.append(key)
+                    continue
+                found[key] = entry.value
+                if policy is not None:
+                    policy.access(key)
+            
+            promoted = 0
+            if missing and self._l2 is not None:
+                for key, (value, remaining) in self._l2.get_many(missing).items():
+                    self._store(key, value, now + remaining, persist=False)
+                    found[key] = value
+                    promoted += 1
+            
+            self.hits += len(found)
+            self.misses += len(missing) - promoted
+        return found
+    
+    def set_many(
+        self,
+        items: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]],
+        ttl: Optional[int] = None,
+    ):
+        """
+        Set several values in one pass.
+        
+        Args:
+            items: Mapping or iterable of (key, value) pairs
+            ttl: Time-to-live in seconds for every value (uses default if None)
+        """
+        items = dict(items)
+        ttl = ttl or self.default_ttl
+        with self._lock:
+            expires_at = self._clock() + ttl
+            for key, value in items.items():
+                self._store(key, value, expires_at, persist=False)
+            if self._l2 is not None:
+                self._l2.set_many(items, ttl)
+    
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Delete several keys in one pass.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Number of keys that were deleted
+        """
+        keys = list(keys)
+        deleted = set()
+        with self._lock:
+            cache = self._cache
+            for key in keys:
+                if key in cache:
+                    self._remove(key)
+                    deleted.add(key)
+            if self._l2 is not None:
+                deleted.update(self._l2._delete_many(keys))
+        return len(deleted)
     
     def clear(self):
-        """Clear all cache entries."""
+        """Clear all cache entries, including the L2 store."""
+        with self._lock:
+            self._clear_memory()
+            if self._l2 is not None:
+                self._l2.clear()
+    
+    def _clear_memory(self):
+        """Clear the in-memory entries only; caller must hold the lock."""
         self._cache.clear()
+        self._expiry_heap.clear()
+        self._bytes = 0
+        if self._policy is not None:
+            self._policy.clear()
+    
+    def warm_up(self, limit: Optional[int] = None) -> int:
+        """
+        Bulk-load entries from the L2 store into memory.
+        
+        The longest-lived entries are loaded first, up to ``limit`` or the
+        cache's ``max_entries``.
+        
+        Args:
+            limit: Maximum number of entries to load
+            
+        Returns:
+            Number of entries loaded
+        """
+        if self._l2 is None:
+            return 0
+        if limit is None or (self.max_entries is not None and self.max_entries < limit):
+            limit = self.max_entries
+        loaded = 0
+        with self._lock:
+            now = self._clock()
+            for key, value, remaining in self._l2.items(limit):
+                self._store(key, value, now + remaining, persist=False)
+                loaded += 1
+        return loaded
+    
+    def purge_expired(self) -> int:
+        """
+        Remove all expired entries.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            return self._purge(self._clock())
     
     def size(self) -> int:
         """
         Get number of cache entries.
         
+        Only entries that have expired are visited, so this does not walk
+        the whole cache.
+        
         Returns:
             Number of entries in cache
         """
-        # Clean expired entries
-        now = datetime.now()
-        expired_keys = [
-            key for key, (_, expires_at) in self._cache.items()
-            if now > expires_at
+        with self._lock:
+            self._purge(self._clock())
+            return len(self._cache)
+    
+    def has(self, key: str) -> bool:
+        """
+        Check if key exists and is not expired.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            True if key exists and is valid, False otherwise
+        """
+        return self.get(key) is not None
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+        
+        Returns:
+            Dictionary with hits, misses, evictions, entries and bytes
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._cache),
+                "bytes": self._bytes,
+            }
+    
+    def start_reaper(self, interval: float = 1.0):
+        """
+        Start a background thread that purges expired entries.
+        
+        Args:
+            interval: Seconds between sweeps
+            
+        Raises:
+            ValueError: If interval is not positive
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.stop_reaper()
+        self._reaper_stop.clear()
+        self._reaper = threading.Thread(
+            target=self._reap, args=(interval,), name="cache-reaper", daemon=True
+        )
+        self._reaper.start()
+    
+    def stop_reaper(self):
+        """Stop the background reaper thread if it is running."""
+        if self._reaper is not None:
+            self._reaper_stop.set()
+            self._reaper.join()
+            self._reaper = None
+    
+    def _reap(self, interval: float):
+        """Reaper thread loop."""
+        while not self._reaper_stop.wait(interval):
+            self.purge_expired()
+
+
+class ConcurrentCache:
+    """
+    Thread-safe cache split into independently locked segments.
+    
+    Keys are hashed onto ``segments`` Cache instances, each guarded by its
+    own lock, so threads working on different segments never contend. The
+    API matches Cache; bounds are divided evenly between segments.
+    """
+    
+    def __init__(
+        self,
+        default_ttl: int = 3600,
+        segments: int = 16,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        policy: str = "lru",
+        sizeof: Optional[Callable[[Any], int]] = None,
+        reap_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        l2: Optional[DiskStore] = None,
+    ):
+        """
+        Initialize concurrent cache.
+        
+        Args:
+            default_ttl: Default time-to-live in seconds
+            segments: Number of lock-striped segments
+            max_entries: Maximum number of entries across all segments
+            max_bytes: Maximum total size of cached values in bytes
+            policy: Eviction policy, one of "lru", "lfu" or "tinylfu"
+            sizeof: Function returning the size of a value in bytes
+            reap_interval: If set, purge expired entries in the background
+                every ``reap_interval`` seconds
+            clock: Monotonic time source in seconds
+            l2: Optional persistent second tier shared by all segments
+        
+        Raises:
+            ValueError: If segments, the policy or a bound is invalid, or a
+                bound is smaller than the number of segments
+        """
+        if segments <= 0:
+            raise ValueError("segments must be positive")
+        for name, total in (("max_entries", max_entries), ("max_bytes", max_bytes)):
+            if total is not None and total < segments:
+                raise ValueError(f"{name} must be at least segments ({segments})")
+        
+        def share(total: Optional[int], index: int) -> Optional[int]:
+            # Spread the remainder so the segment bounds add up to the total.
+            if total is None:
+                return None
+            return total // segments + (index < total % segments)
+        
+        self.default_ttl = default_ttl
+        self._segments = [
+            Cache(
+                default_ttl=default_ttl,
+                max_entries=share(max_entries, index),
+                max_bytes=share(max_bytes, index),
+                policy=policy,
+                sizeof=sizeof,
+                clock=clock,
+                l2=l2,
+            )
+            for index in range(segments)
         ]
-        for key in expired_keys:
-            del self._cache[key]
+        self._l2 = l2
+        self._reaper: Optional[threading.Thread] = None
+        self._reaper_stop = threading.Event()
+        if reap_interval is not None:
+            self.start_reaper(reap_interval)
+    
+    def _segment(self, key: str) -> Cache:
+        """Get the segment responsible for a key."""
+        return self._segments[hash(key) % len(self._segments)]
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """
+        Set a value in cache.
         
-        return len(self._cache)
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time-to-live in seconds (uses default if None)
+        """
+        self._segment(key).set(key, value, ttl)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a value from cache.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached value or None if not found or expired
+        """
+        return self._segment(key).get(key)
+    
+    def delete(self, key: str) -> bool:
+        """
+        Delete a key from cache.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            True if key was deleted, False if not found
+        """
+        return self._segment(key).delete(key)
     
     def has(self, key: str) -> bool:
         """
@@ -99,4 +1302,178 @@ class Cache:
         Returns:
             True if key exists and is valid, False otherwise
         """
-        return self.get(key) is not None
+        return self._segment(key).has(key)
+    
+    def _group(self, keys: Iterable[str]) -> Dict[int, List[str]]:
+        """Group keys by the index of their segment."""
+        groups: Dict[int, List[str]] = {}
+        count = len(self._segments)
+        for key in keys:
+            groups.setdefault(hash(key) % count, []).append(key)
+        return groups
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several values, taking each segment's lock once.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Dictionary of the keys that were found and not expired
+        """
+        found: Dict[str, Any] = {}
+        for index, group in self._group(keys).items():
+            found.update(self._segments[index].get_many(group))
+        return found
+    
+    def set_many(
+        self,
+        items: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]],
+        ttl: Optional[int] = None,
+    ):
+        """
+        Set several values, taking each segment's lock once.
+        
+        Args:
+            items: Mapping or iterable of (key, value) pairs
+            ttl: Time-to-live in seconds for every value (uses default if None)
+        """
+        items = dict(items)
+        for index, group in self._group(items).items():
+            self._segments[index].set_many({key: items[key] for key in group}, ttl)
+    
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Delete several keys, taking each segment's lock once.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Number of keys that were deleted
+        """
+        return sum(
+            self._segments[index].delete_many(group)
+            for index, group in self._group(keys).items()
+        )
+    
+    def get_or_compute(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        ttl: Optional[int] = None,
+        beta: float = 0.0,
+        stale_ttl: float = 0.0,
+    ) -> Any:
+        """
+        Get a value, computing it on a miss with a single loader per key.
+        
+        See Cache.get_or_compute.
+        """
+        return self._segment(key).get_or_compute(key, fn, ttl, beta, stale_ttl)
+    
+    async def aget_or_compute(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        beta: float = 0.0,
+        stale_ttl: float = 0.0,
+    ) -> Any:
+        """
+        Async version of get_or_compute.
+        
+        See Cache.aget_or_compute.
+        """
+        return await self._segment(key).aget_or_compute(key, fn, ttl, beta, stale_ttl)
+    
+    def clear(self):
+        """Clear all cache entries, including the L2 store."""
+        for segment in self._segments:
+            with segment._lock:
+                segment._clear_memory()
+        if self._l2 is not None:
+            self._l2.clear()
+    
+    def warm_up(self, limit: Optional[int] = None) -> int:
+        """
+        Bulk-load entries from the L2 store into the segments.
+        
+        Args:
+            limit: Maximum number of entries to load
+            
+        Returns:
+            Number of entries loaded
+        """
+        if self._l2 is None:
+            return 0
+        loaded = 0
+        for key, value, remaining in self._l2.items(limit):
+            segment = self._segment(key)
+            with segment._lock:
+                segment._store(key, value, segment._clock() + remaining, persist=False)
+            loaded += 1
+        return loaded
+    
+    def size(self) -> int:
+        """
+        Get number of cache entries.
+        
+        Returns:
+            Number of entries across all segments
+        """
+        return sum(segment.size() for segment in self._segments)
+    
+    def purge_expired(self) -> int:
+        """
+        Remove all expired entries.
+        
+        Returns:
+            Number of entries removed
+        """
+        return sum(segment.purge_expired() for segment in self._segments)
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters summed over all segments.
+        
+        Returns:
+            Dictionary with hits, misses, evictions, entries and bytes
+        """
+        totals: Dict[str, int] = {}
+        for segment in self._segments:
+            for name, count in segment.stats().items():
+                totals[name] = totals.get(name, 0) + count
+        return totals
+    
+    def start_reaper(self, interval: float = 1.0):
+        """
+        Start a background thread that purges expired entries.
+        
+        Args:
+            interval: Seconds between sweeps
+            
+        Raises:
+            ValueError: If interval is not positive
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.stop_reaper()
+        self._reaper_stop.clear()
+        self._reaper = threading.Thread(
+            target=self._reap, args=(interval,), name="cache-reaper", daemon=True
+        )
+        self._reaper.start()
+    
+    def stop_reaper(self):
+        """Stop the background reaper thread if it is running."""
+        if self._reaper is not None:
+            self._reaper_stop.set()
+            self._reaper.join()
+            self._reaper = None
+    
+    def _reap(self, interval: float):
+        """Reaper thread loop."""
+        while not self._reaper_stop.wait(interval):
+            self.purge_expired()
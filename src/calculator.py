@@ -2,6 +2,29 @@
 Calculator module with basic arithmetic operations.
 """
 
+from array import array
+from itertools import repeat
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union
+import operator
+
+from .expression import compile_expression
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+
+OPERATIONS = {
+    "add": ("+", operator.add),
+    "subtract": ("-", operator.sub),
+    "multiply": ("*", operator.mul),
+    "divide": ("/", operator.truediv),
+}
+ERROR_POLICIES = ("raise", "nan", "mask")
+
+Numbers = Union[Sequence[float], array, Any]
+
 
 class Calculator:
     """A simple calculator class with basic operations."""
@@ -75,6 +98,239 @@ class Calculator:
         self.history.append(f"{a} / {b} = {result}")
         return result
     
+    def evaluate_batch(self, op: str, a: Union[Numbers, float], b: Union[Numbers, float],
+                       on_error: str = "raise") -> Union[Numbers, Tuple[Numbers, Numbers]]:
+        """
+        Apply an operation element-wise to two sequences.
+        
+        The whole batch runs in one call, with one history entry, instead
+        of one call and one history entry per pair. NumPy arrays are
+        computed with NumPy ufuncs, other sequences with ``map`` over the
+        ``operator`` functions. Either operand may be a scalar, which is
+        applied to every element of the other.
+        
+        Args:
+            op: "add", "subtract", "multiply" or "divide", or the symbol
+                "+", "-", "*" or "/"
+            a: Left operands: a list, array.array or NumPy array
+            b: Right operands, of the same length as a
+            on_error: What to do with division by zero: "raise" raises
+                after checking the whole batch, "nan" puts NaN in those
+                positions, and "mask" does the same but also returns a
+                mask of the failed positions
+            
+        Returns:
+            Results of the same kind as the input (a NumPy array if either
+            operand is one, an array.array of doubles, or of int64 when
+            both are int64 arrays and the results fit, if either is an
+            array.array, otherwise a list); with on_error="mask", a
+            (results, mask) pair where mask is True at failed positions
+            
+        Raises:
+            ValueError: If the operation or policy is unknown, the lengths
+                differ, or on_error="raise" and any divisor is zero
+        """
+        name = next((key for key, (symbol, _) in OPERATIONS.items() if op in (key, symbol)), None)
+        if name is None:
+            raise ValueError(f"Unknown operation: {op}")
+        if on_error not in ERROR_POLICIES:
+            raise ValueError(f"Unknown error policy: {on_error}")
+        symbol, function = OPERATIONS[name]
+        if np is not None and (isinstance(a, np.ndarray) or isinstance(b, np.ndarray)):
+            values, failed = self._evaluate_numpy(name, a, b)
+            errors = int(failed.sum())
+        else:
+            values, failed = self._evaluate_python(name, function, a, b)
+            errors = sum(failed)
+        count = len(values)
+        if errors and on_error == "raise":
+            first = failed.index(True) if isinstance(failed, list) else int(np.argmax(failed))
+            raise ValueError(f"Cannot divide by zero at {errors} of {count} positions "
+                             f"(first at index {first})")
+        entry = f"batch {symbol} of {count} pairs"
+        if errors:
+            entry += f" ({errors} divisions by zero)"
+        self.history.append(entry)
+        return (values, failed) if on_error == "mask" else values
+    
+    def _evaluate_numpy(self, name: str, a, b) -> Tuple[Any, Any]:
+        """Evaluate a batch with NumPy ufuncs; return (values, failed mask)."""
+        a, b = np.broadcast_arrays(np.asarray(a), np.asarray(b))
+        if a.ndim != 1:
+            raise ValueError("Operands must be one-dimensional")
+        if name != "divide":
+            return getattr(np, name)(a, b), np.zeros(len(a), dtype=bool)
+        failed = b == 0
+        values = np.full(len(a), np.nan)
+        np.divide(a, b, out=values, where=~failed)
+        return values, failed
+    
+    def _evaluate_python(self, name: str, function, a, b) -> Tuple[Numbers, List[bool]]:
+        """Evaluate a batch with ``map``; return (values, failed list)."""
+        kinds = [value for value in (a, b) if isinstance(value, array)]
+        if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+            raise ValueError("At least one operand must be a sequence")
+        if isinstance(a, (int, float)):
+            a = repeat(a, len(b))
+            count = len(b)
+        elif isinstance(b, (int, float)):
+            b = repeat(b, len(a))
+            count = len(a)
+        else:
+            count = len(a)
+            if len(b) != count:
+                raise ValueError(f"Operand lengths differ: {len(a)} and {len(b)}")
+        failed = [False] * count
+        if name == "divide":
+            b = list(b)
+            failed = [value == 0 for value in b]
+            if any(failed):
+                nan = float("nan")
+                values = [nan if bad else x / y for x, y, bad in zip(a, b, failed)]
+                return self._as_kind(values, kinds, name), failed
+        values = list(map(function, a, b))
+        return self._as_kind(values, kinds, name), failed
+    
+    def _as_kind(self, values: List[float], kinds: List[array], name: str) -> Numbers:
+        """Pack results into an array.array if an operand was one."""
+        if not kinds:
+            return values
+        if name != "divide" and all(kind.typecode == "q" for kind in kinds):
+            try:
+                return array("q", values)
+            except (OverflowError, TypeError):
+                pass
+        return array("d", values)
+    
+    def add_many(self, a: Numbers, b: Union[Numbers, float]) -> Numbers:
+        """
+        Add two sequences element-wise.
+        
+        Args:
+            a: First numbers
+            b: Second numbers (or one number added to every element)
+            
+        Returns:
+            Element-wise sums
+        """
+        return self.evaluate_batch("add", a, b)
+    
+    def subtract_many(self, a: Numbers, b: Union[Numbers, float]) -> Numbers:
+        """
+        Subtract two sequences element-wise.
+        
+        Args:
+            a: First numbers
+            b: Second numbers (or one number subtracted from every element)
+            
+        Returns:
+            Element-wise differences
+        """
+        return self.evaluate_batch("subtract", a, b)
+    
+    def multiply_many(self, a: Numbers, b: Union[Numbers, float]) -> Numbers:
+        """
+        Multiply two sequences element-wise.
+        
+        Args:
+            a: First numbers
+            b: Second numbers (or one factor for every element)
+            
+        Returns:
+            Element-wise products
+        """
+        return self.evaluate_batch("multiply", a, b)
+    
+    def divide_many(self, a: Numbers, b: Union[Numbers, float],
+                    on_error: str = "raise") -> Union[Numbers, Tuple[Numbers, Numbers]]:
+        """
+        Divide two sequences element-wise.
+        
+        Args:
+            a: Numerators
+            b: Denominators (or one denominator for every element)
+            on_error: "raise", "nan" or "mask"; see ``evaluate_batch``
+            
+        Returns:
+            Element-wise quotients, plus the failure mask with "mask"
+            
+        Raises:
+            ValueError: If on_error="raise" and any denominator is zero
+        """
+        return self.evaluate_batch("divide", a, b, on_error)
+    
+    def evaluate(self, expr: str, **variables: float) -> float:
+        """
+        Evaluate an arithmetic expression.
+        
+        The expression is compiled once (see ``src.expression``) and the
+        compiled form is cached by its text, so evaluating the same
+        formula with new values skips parsing.
+        
+        Args:
+            expr: Expression using numbers, variables, + - * / // % **,
+                parentheses and abs/min/max/round/sqrt/exp/log
+            **variables: Values of the variables in the expression
+            
+        Returns:
+            Value of the expression
+            
+        Raises:
+            ValueError: If the expression is invalid, a variable is
+                missing, or evaluation fails (e.g. division by zero)
+        """
+        result = compile_expression(expr).evaluate(variables)
+        self.history.append(f"{expr} = {result}")
+        return result
+    
+    def evaluate_many(self, expr: str, rows: Iterable[Dict[str, float]],
+                      on_error: str = "raise") -> Union[List[float], Tuple[List[float], List[bool]]]:
+        """
+        Evaluate one expression for many sets of variable values.
+        
+        The expression is compiled once for the whole batch, which gets
+        a single history entry.
+        
+        Args:
+            expr: Expression, as for ``evaluate``
+            rows: Variable bindings, one dictionary per evaluation
+            on_error: Rows that fail (e.g. division by zero): "raise"
+                raises after evaluating every row, "nan" gives NaN, and
+                "mask" gives NaN and also returns a mask of failed rows
+            
+        Returns:
+            One value per row; with on_error="mask", a (values, mask) pair
+            
+        Raises:
+            ValueError: If the expression or policy is invalid, or
+                on_error="raise" and any row fails
+        """
+        if on_error not in ERROR_POLICIES:
+            raise ValueError(f"Unknown error policy: {on_error}")
+        compiled = compile_expression(expr)
+        rows = list(rows)
+        try:
+            values = [compiled.evaluate(row) for row in rows]
+            failed = [False] * len(rows)
+        except ValueError:
+            values, failed = [], []
+            for row in rows:
+                try:
+                    values.append(compiled.evaluate(row))
+                    failed.append(False)
+                except ValueError:
+                    values.append(float("nan"))
+                    failed.append(True)
+        errors = sum(failed)
+        if errors and on_error == "raise":
+            raise ValueError(f"Cannot evaluate {expr!r} for {errors} of {len(rows)} rows "
+                             f"(first at index {failed.index(True)})")
+        entry = f"batch {expr} over {len(rows)} rows"
+        if errors:
+            entry += f" ({errors} failed)"
+        self.history.append(entry)
+        return (values, failed) if on_error == "mask" else values
+    
     def get_history(self) -> list:
         """
         Get calculation history.
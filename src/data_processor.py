@@ -2,121 +2,354 @@
 Data processing module with various data manipulation functions.
 """
 
-from typing import List, Dict, Any, Optional
-import json
+from typing import List, Dict, Any, Optional, Sequence, Union
+
+from .dataio import PathLike, iter_records, read_table, write_records
+from .groupby import AggregateSpec, GroupBy, GroupKeys
+from .index import IndexedDataset, Predicate
+from .join import DEFAULT_MAX_BUILD_ROWS, hash_join
+from .pipeline import Pipeline, Source
+from .sorting import SortKeys, external_sort, sort_records, top_k
+from .stats import RunningStats
+from .table import Table
+from .transform import Mapping, Transform, compile_transform, mapping_pairs
+from .views import CountView, StatsView
+
+
+Dataset = Union[List[Dict], Table, IndexedDataset]
 
 
 class DataProcessor:
-    """Process and manipulate data structures."""
+    """
+    Process and manipulate data structures.
+    
+    Every operation accepts either a list of dictionaries or a columnar
+    ``Table``; tables are processed column-wise and results that are
+    datasets come back as tables. An ``IndexedDataset`` is treated as a
+    list, except that filters are answered from its indexes.
+    """
     
     def __init__(self):
         """Initialize the data processor."""
         self.processed_items = []
     
-    def filter_data(self, data: List[Dict], key: str, value: Any) -> List[Dict]:
+    def stream(self, source: Source) -> Pipeline:
+        """
+        Start a lazy pipeline over records.
+        
+        Unlike the list-based methods, ``stream(source).filter(...)
+        .transform(...).collect()`` processes one record at a time.
+        
+        Args:
+            source: Iterable of dictionaries, an open NDJSON file, or a
+                path to a file in a format ``load`` reads
+        
+        Returns:
+            Pipeline over the source records
+        """
+        return Pipeline(source)
+    
+    def load(self, path: PathLike, format: Optional[str] = None,
+             columns: Optional[Sequence[str]] = None, table: bool = False) -> Dataset:
+        """
+        Read a CSV, NDJSON, JSON or binary columnar file.
+        
+        Args:
+            path: File to read
+            format: "csv", "ndjson", "json" or "columnar" (detected from the
+                extension by default)
+            columns: Columns to read (all by default); with CSV and the
+                columnar format other columns are never decoded
+            table: Return a Table built column-wise instead of records
+            
+        Returns:
+            List of dictionaries, or a Table
+        
+        Raises:
+            ValueError: If the format is unknown or a column does not exist
+        """
+        if table:
+            return read_table(path, format, columns)
+        return list(iter_records(path, format, columns))
+    
+    def save(self, data: Dataset, path: PathLike, format: Optional[str] = None) -> int:
+        """
+        Write data as CSV, NDJSON, JSON or the binary columnar format.
+        
+        Args:
+            data: List of dictionaries or Table
+            path: File to write
+            format: "csv", "ndjson", "json" or "columnar" (detected from the
+                extension by default)
+            
+        Returns:
+            Number of rows written
+        
+        Raises:
+            ValueError: If the format is unknown
+        """
+        return write_records(path, data, format)
+    
+    def filter_data(self, data: Dataset, key: str, value: Any) -> Dataset:
         """
         Filter data by key-value pair.
         
         Args:
-            data: List of dictionaries to filter
+            data: List of dictionaries, Table or IndexedDataset to filter
             key: Key to filter by
             value: Value to match
             
         Returns:
-            Filtered list of dictionaries
+            Filtered data, of the same type as the input (a list for an
+            IndexedDataset)
         """
+        if isinstance(data, Table):
+            return data.filter_eq(key, value)
+        if isinstance(data, IndexedDataset):
+            return data.filter_eq(key, value)
         return [item for item in data if item.get(key) == value]
     
-    def sort_data(self, data: List[Dict], key: str, reverse: bool = False) -> List[Dict]:
+    def query_data(self, data: Dataset, predicate: Predicate) -> Dataset:
         """
-        Sort data by a key.
+        Filter data by a compound predicate.
+        
+        An IndexedDataset plans the predicate against its indexes; other
+        inputs are scanned.
         
         Args:
-            data: List of dictionaries to sort
-            key: Key to sort by
+            data: List of dictionaries, Table or IndexedDataset to filter
+            predicate: Condition built from ``src.index`` predicates, e.g.
+                ``Eq("city", "NYC") & Range("age", 30, 40)``
+            
+        Returns:
+            Matching rows in their original order, of the same type as the
+            input (a list for an IndexedDataset)
+        """
+        if isinstance(data, IndexedDataset):
+            return data.query(predicate)
+        if isinstance(data, Table):
+            records = data.to_records()
+            return data.take([row for row, record in enumerate(records)
+                              if predicate.matches(record)])
+        return [item for item in data if predicate.matches(item)]
+    
+    def sort_data(self, data: Dataset, key: SortKeys, reverse: bool = False,
+                  missing: str = "last", max_memory_rows: Optional[int] = None,
+                  spill_dir: Optional[str] = None) -> Dataset:
+        """
+        Sort data by one or more keys.
+        
+        The sort is stable. Missing keys, None and NaN are placed according
+        to ``missing`` rather than compared, and values of mixed types are
+        ordered numbers, then strings, then other types.
+        
+        Args:
+            data: List of dictionaries or Table to sort
+            key: Key to sort by, or a sequence of keys and (key, "asc"/"desc")
+                pairs
             reverse: Whether to sort in reverse order
+            missing: Where missing values go: "first", "last" or "error"
+            max_memory_rows: If set, sort lists with an external merge sort
+                that holds at most this many rows in memory per run
+            spill_dir: Directory for external sort runs
             
         Returns:
-            Sorted list of dictionaries
+            Sorted data, of the same type as the input
         """
-        return sorted(data, key=lambda x: x.get(key, 0), reverse=reverse)
+        if isinstance(data, Table):
+            return data.sort(key, reverse, missing)
+        if max_memory_rows is not None:
+            return list(external_sort(data, key, reverse, missing, max_memory_rows, spill_dir))
+        return sort_records(data, key, reverse, missing)
     
-    def aggregate_data(self, data: List[Dict], key: str) -> Dict[Any, int]:
+    def top_k(self, data: Dataset, key: SortKeys, k: int, reverse: bool = False,
+              missing: str = "last") -> Dataset:
+        """
+        Get the first k rows of ``sort_data``'s order in O(n log k).
+        
+        Args:
+            data: List of dictionaries or Table
+            key: Key to rank by, or a sort specification as for sort_data;
+                use ``(key, "desc")`` or ``reverse=True`` for the largest values
+            k: Number of rows to return
+            reverse: Flip every direction, as for sort_data
+            missing: Where missing values rank: "first", "last" or "error"
+            
+        Returns:
+            Up to k rows in ranked order, of the same type as the input
+        """
+        if isinstance(data, Table):
+            return data.top_k(key, k, reverse, missing)
+        return top_k(data, key, k, reverse, missing)
+    
+    def aggregate_data(self, data: Dataset, key: str) -> Dict[Any, int]:
         """
         Aggregate data by counting occurrences of a key.
         
         Args:
-            data: List of dictionaries
+            data: List of dictionaries or Table
             key: Key to aggregate by
             
         Returns:
             Dictionary with counts
         """
+        if isinstance(data, Table):
+            return data.value_counts(key)
         result = {}
         for item in data:
             value = item.get(key)
             result[value] = result.get(value, 0) + 1
         return result
     
-    def transform_data(self, data: List[Dict], mapping: Dict[str, str]) -> List[Dict]:
+    def group_data(self, data: Dataset, keys: GroupKeys,
+                   aggregates: AggregateSpec) -> Dataset:
+        """
+        Group data by one or more keys and aggregate each group in one pass.
+        
+        ``aggregate_data(data, key)`` corresponds to
+        ``group_data(data, key, {"count": (None, "count")})``.
+        
+        Args:
+            data: List of dictionaries or Table
+            keys: Key or keys to group by
+            aggregates: Output names mapped to (field, function) pairs;
+                functions are count, sum, mean, min, max, first, last,
+                count_distinct and approx_count_distinct (HyperLogLog)
+            
+        Returns:
+            One row per group, in order of first occurrence, of the same
+            type as the input
+        
+        Raises:
+            ValueError: If no keys are given or a function is unknown
+        """
+        group_by = GroupBy(keys, aggregates)
+        if isinstance(data, Table):
+            fields = set(group_by.keys) | {field for field, _ in aggregates.values()}
+            columns = {field: data.column(field) for field in fields if field is not None}
+            return Table.from_records(group_by.update_columns(columns, len(data)).result())
+        return group_by.update(data).result()
+    
+    def aggregate_view(self, data: Dataset, key: str) -> CountView:
+        """
+        Materialize ``aggregate_data`` so it can be maintained incrementally.
+        
+        Push later changes with ``view.insert(records)`` and
+        ``view.delete(records)``; ``view.result`` then always equals
+        ``aggregate_data`` over the current data.
+        
+        Args:
+            data: List of dictionaries or Table the view starts from
+            key: Key to aggregate by
+            
+        Returns:
+            Count view
+        """
+        records = data.to_records() if isinstance(data, Table) else data
+        return CountView(key, records)
+    
+    def transform_data(self, data: Dataset, mapping: Union[Mapping, Transform],
+                       computed: Optional[Dict[str, Transform]] = None,
+                       casts: Optional[Dict[str, Any]] = None) -> Dataset:
         """
         Transform data by renaming keys.
         
+        The mapping is compiled once with ``compile_transform`` and the
+        resulting function is applied to every record; a plan compiled
+        ahead of time can be passed instead to reuse it across calls.
+        
         Args:
-            data: List of dictionaries
-            mapping: Dictionary mapping old keys to new keys
+            data: List of dictionaries or Table
+            mapping: Dictionary mapping old keys to new keys, a sequence of
+                keys to keep, or a function from ``compile_transform``
+            computed: New keys mapped to functions of the source record
+            casts: Output keys mapped to a type or function for their value
             
         Returns:
-            Transformed list of dictionaries
+            Transformed data, of the same type as the input
         """
-        result = []
-        for item in data:
-            transformed = {}
-            for old_key, new_key in mapping.items():
-                if old_key in item:
-                    transformed[new_key] = item[old_key]
-            result.append(transformed)
-        return result
+        if callable(mapping):
+            transform = mapping
+        elif isinstance(data, Table) and not computed and not casts:
+            return data.rename(dict(mapping_pairs(mapping)))
+        else:
+            transform = compile_transform(mapping, computed, casts)
+        if isinstance(data, Table):
+            return Table.from_records(map(transform, data.to_records()))
+        return list(map(transform, data))
     
-    def merge_data(self, data1: List[Dict], data2: List[Dict], key: str) -> List[Dict]:
+    def merge_data(self, data1: Dataset, data2: Dataset, key: str, how: str = "inner",
+                   max_build_rows: int = DEFAULT_MAX_BUILD_ROWS,
+                   spill_dir: Optional[str] = None) -> Dataset:
         """
         Merge two datasets on a common key.
         
+        Uses ``src.join.hash_join``: every pair of rows with equal keys is
+        merged (fields of ``data2`` win), rows missing the key never match,
+        and joins whose build side exceeds ``max_build_rows`` spill to
+        temporary files. Rows come in the order of ``data1``, followed by
+        unmatched rows of ``data2`` for right and outer joins.
+        
         Args:
-            data1: First list of dictionaries
-            data2: Second list of dictionaries
+            data1: First list of dictionaries or Table
+            data2: Second list of dictionaries or Table
             key: Key to merge on
+            how: "inner", "left", "right" or "outer"
+            max_build_rows: Rows to hold in memory before spilling to disk
+            spill_dir: Directory for spill files (defaults to the system
+                temporary directory)
             
         Returns:
-            Merged list of dictionaries
-        """
-        lookup = {item[key]: item for item in data2}
-        result = []
-        for item in data1:
-            if item.get(key) in lookup:
-                merged = {**item, **lookup[item[key]]}
-                result.append(merged)
-        return result
+            Merged data (a Table if either input is one)
+        
+        Raises:
+            ValueError: If the join type is unknown
+        """
+        if isinstance(data1, Table) or isinstance(data2, Table):
+            left = data1 if isinstance(data1, Table) else Table.from_records(data1)
+            right = data2 if isinstance(data2, Table) else Table.from_records(data2)
+            if how == "inner":
+                return left.merge(right, key)
+            rows = hash_join(left.to_records(), right.to_records(), key, how, max_build_rows,
+                             spill_dir)
+            return Table.from_records(rows)
+        return list(hash_join(data1, data2, key, how, max_build_rows, spill_dir))
+    
+    def statistics_view(self, data: Dataset, key: str, stddev: bool = False) -> StatsView:
+        """
+        Materialize ``calculate_statistics`` so it can be maintained incrementally.
+        
+        Args:
+            data: List of dictionaries or Table the view starts from
+            key: Numeric key to calculate statistics for
+            stddev: Also include population "variance" and "stddev"
+            
+        Returns:
+            Statistics view
+        """
+        records = data.to_records() if isinstance(data, Table) else data
+        return StatsView(key, records, stddev)
     
-    def calculate_statistics(self, data: List[Dict], key: str) -> Dict[str, float]:
+    def calculate_statistics(self, data: Dataset, key: str, stddev: bool = False,
+                             quantiles: Sequence[float] = ()) -> Dict[str, float]:
         """
         Calculate statistics for a numeric key.
         
         Args:
-            data: List of dictionaries
+            data: List of dictionaries or Table
             key: Numeric key to calculate statistics for
+            stddev: Also include population "variance" and "stddev"
+            quantiles: Approximate quantiles to include, e.g. (0.5, 0.99)
+                gives "p50" and "p99"
             
         Returns:
             Dictionary with statistics
         """
-        values = [item.get(key, 0) for item in data if isinstance(item.get(key), (int, float))]
-        if not values:
-            return {"count": 0, "sum": 0, "avg": 0, "min": 0, "max": 0}
-        
-        return {
-            "count": len(values),
-            "sum": sum(values),
-            "avg": sum(values) / len(values),
-            "min": min(values),
-            "max": max(values)
-        }
+        if isinstance(data, Table):
+            if not stddev and not quantiles:
+                return data.statistics(key)
+            values = (value for value in data.column(key) if isinstance(value, (int, float)))
+        else:
+            values = (value for item in data if isinstance(value := item.get(key), (int, float)))
+        stats = RunningStats(quantiles=bool(quantiles), track_variance=stddev).update(values)
+        return stats.as_dict(stddev, quantiles)
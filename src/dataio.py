@@ -0,0 +1,588 @@
+"""
+Chunked readers and writers for CSV, NDJSON and a binary columnar format.
+"""
+
+from array import array
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import csv
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+
+from .table import MISSING, Table, np
+from .transform import compile_transform
+
+
+PathLike = Union[str, os.PathLike]
+
+DEFAULT_CHUNK_SIZE = 65_536
+COLUMNAR_MAGIC = b"DPCOL01\n"
+_ALIGNMENT = 8
+
+# Stricter than int()/float(), which also accept "1_000", " 7", "nan" and "inf".
+_INT_TEXT = re.compile(r"[+-]?[0-9]+")
+_FLOAT_TEXT = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?")
+_scan_json = json.JSONDecoder().scan_once
+
+
+def _parse_column(values: Sequence[str]) -> List[Any]:
+    """
+    Infer the type of a chunk of CSV values and convert them.
+    
+    Columns parse as int, then float, then stay as strings; empty cells
+    become None. Only plain decimal literals count as numbers.
+    """
+    if "" in values:
+        parsed = iter(_parse_column([value for value in values if value != ""]))
+        return [None if value == "" else next(parsed) for value in values]
+    for pattern, parse in ((_INT_TEXT, int), (_FLOAT_TEXT, float)):
+        if all(map(pattern.fullmatch, values)):
+            try:
+                return list(map(parse, values))
+            except ValueError:
+                pass
+    return list(values)
+
+
+def _cast_column(values: Sequence[str], cast: Callable[[str], Any]) -> List[Any]:
+    """Convert a chunk of CSV values with an explicit type; empty cells become None."""
+    return [None if value == "" else cast(value) for value in values]
+
+
+def _csv_chunks(path: PathLike, columns: Optional[Sequence[str]],
+                types: Optional[Dict[str, Callable[[str], Any]]], chunk_size: int,
+                delimiter: str) -> Iterator[Tuple[List[str], List[List[Any]]]]:
+    """Yield (names, typed column values) for each chunk of a CSV file."""
+    types = types or {}
+    with open(path, newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        names = list(header) if columns is None else list(columns)
+        unknown = [name for name in names if name not in header]
+        if unknown:
+            raise ValueError(f"Unknown columns: {unknown}")
+        positions = [header.index(name) for name in names]
+        width = len(header)
+        pick = itemgetter(*positions) if len(positions) > 1 else None
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                return
+            if min(map(len, rows)) < width:
+                # Blank lines read as empty rows; skip them as DictReader does.
+                rows = [row + [""] * (width - len(row)) for row in rows if row]
+                if not rows:
+                    continue
+            if names == header:
+                fields = list(zip(*rows))
+            elif pick is None:
+                fields = [[row[position] for row in rows] for position in positions]
+            else:
+                fields = list(zip(*map(pick, rows)))
+            yield names, [
+                _cast_column(values, types[name]) if name in types else _parse_column(values)
+                for name, values in zip(names, fields)
+            ]
+
+
+def read_csv(path: PathLike, columns: Optional[Sequence[str]] = None,
+             types: Optional[Dict[str, Callable[[str], Any]]] = None,
+             chunk_size: int = DEFAULT_CHUNK_SIZE, delimiter: str = ",") -> Iterator[Dict]:
+    """
+    Stream the rows of a CSV file with a header row as records.
+    
+    The file is parsed ``chunk_size`` rows at a time and each column of a
+    chunk is converted at once: to int, else float, else kept as text.
+    Empty cells become None. Inference is per chunk, so pass ``types`` for
+    columns such as zip codes that look numeric but are not.
+    
+    Args:
+        path: CSV file
+        columns: Columns to read (all by default); others are skipped
+            before any conversion
+        types: Column name to a function converting its text
+        chunk_size: Rows parsed at a time
+        delimiter: Field delimiter
+    
+    Returns:
+        Iterator over records
+    
+    Raises:
+        ValueError: If a requested column is not in the header
+    """
+    for names, values in _csv_chunks(path, columns, types, chunk_size, delimiter):
+        for row in zip(*values):
+            yield dict(zip(names, row))
+
+
+def read_csv_table(path: PathLike, columns: Optional[Sequence[str]] = None,
+                   types: Optional[Dict[str, Callable[[str], Any]]] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE, delimiter: str = ",",
+                   use_numpy: Optional[bool] = None) -> Table:
+    """
+    Read a CSV file straight into a Table, without building records.
+    
+    Args:
+        path: CSV file
+        columns: Columns to read (all by default)
+        types: Column name to a function converting its text
+        chunk_size: Rows parsed at a time
+        delimiter: Field delimiter
+        use_numpy: Store numeric columns as NumPy arrays
+    
+    Returns:
+        New table
+    
+    Raises:
+        ValueError: If a requested column is not in the header
+    """
+    gathered: Dict[str, List[Any]] = {}
+    for names, values in _csv_chunks(path, columns, types, chunk_size, delimiter):
+        for name, column in zip(names, values):
+            gathered.setdefault(name, []).extend(column)
+    return Table.from_columns(gathered, use_numpy)
+
+
+def write_csv(path: PathLike, data: Union[Iterable[Dict], Table],
+              columns: Optional[Sequence[str]] = None, delimiter: str = ",") -> int:
+    """
+    Write records or a Table as CSV with a header row.
+    
+    Args:
+        path: File to write
+        data: Records or Table
+        columns: Columns to write; defaults to the table's columns, every
+            key of a list of records, or the keys of the first record of
+            any other iterable
+        delimiter: Field delimiter
+    
+    Returns:
+        Number of rows written
+    """
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle, delimiter=delimiter)
+        if isinstance(data, Table):
+            names = list(data.columns) if columns is None else list(columns)
+            writer.writerow(names)
+            writer.writerows(zip(*[data.column(name) for name in names]))
+            return len(data)
+        records = iter(data)
+        if columns is None:
+            if isinstance(data, list):
+                columns = list(dict.fromkeys(name for record in data for name in record))
+            else:
+                first = next(records, None)
+                if first is None:
+                    return 0
+                columns = list(first)
+                records = _prepend(first, records)
+        writer.writerow(columns)
+        count = 0
+        while True:
+            chunk = list(islice(records, DEFAULT_CHUNK_SIZE))
+            if not chunk:
+                return count
+            # csv writes None as an empty cell.
+            writer.writerows([[record.get(name) for name in columns] for record in chunk])
+            count += len(chunk)
+
+
+def _prepend(first: Dict, rest: Iterator[Dict]) -> Iterator[Dict]:
+    """Put back a record taken from the front of an iterator."""
+    yield first
+    yield from rest
+
+
+def _decode_lines(lines: List[str]) -> List[Any]:
+    """
+    Decode a chunk of NDJSON lines, one value per line.
+    
+    Lines go straight to the decoder's scanner, skipping ``json.loads``'
+    per-call setup. Anything the scanner does not consume exactly (leading
+    whitespace, trailing data, errors) is redone with ``json.loads``, which
+    decodes it or raises with the usual message.
+    """
+    values = []
+    append = values.append
+    for line in lines:
+        try:
+            value, end = _scan_json(line, 0)
+        except (StopIteration, ValueError):
+            end = 0
+        if not end or (end != len(line) and not line[end:].isspace()):
+            value = json.loads(line)
+        append(value)
+    return values
+
+
+def read_ndjson(path: PathLike, columns: Optional[Sequence[str]] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    Stream the records of an NDJSON file.
+    
+    The file is read ``chunk_size`` lines at a time and each line must
+    hold one JSON value. Blank lines are skipped.
+    
+    Args:
+        path: NDJSON file
+        columns: Keys to keep (all by default); records missing a key
+            simply lack it
+        chunk_size: Lines decoded at a time
+    
+    Returns:
+        Iterator over records
+    
+    Raises:
+        ValueError: If a line is not valid JSON
+    """
+    project = None if columns is None else compile_transform(list(columns))
+    with open(path, encoding="utf-8") as handle:
+        while True:
+            lines = list(islice(handle, chunk_size))
+            if not lines:
+                return
+            lines = [line for line in lines if line.strip()]
+            records = _decode_lines(lines) if lines else []
+            yield from records if project is None else map(project, records)
+
+
+def read_ndjson_table(path: PathLike, columns: Optional[Sequence[str]] = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      use_numpy: Optional[bool] = None) -> Table:
+    """
+    Read an NDJSON file into a Table.
+    
+    Args:
+        path: NDJSON file
+        columns: Keys to keep (all by default)
+        chunk_size: Lines decoded at a time
+        use_numpy: Store numeric columns as NumPy arrays
+    
+    Returns:
+        New table
+    """
+    return Table.from_records(read_ndjson(path, columns, chunk_size), use_numpy)
+
+
+def write_ndjson(path: PathLike, data: Union[Iterable[Dict], Table]) -> int:
+    """
+    Write records or a Table as NDJSON.
+    
+    Args:
+        path: File to write
+        data: Records or Table
+    
+    Returns:
+        Number of records written
+    """
+    records = iter(data.to_records() if isinstance(data, Table) else data)
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    count = 0
+    with open(path, "w", encoding="utf-8") as handle:
+        while True:
+            chunk = list(islice(records, DEFAULT_CHUNK_SIZE))
+            if not chunk:
+                return count
+            handle.write("\n".join(map(encode, chunk)))
+            handle.write("\n")
+            count += len(chunk)
+
+
+def _little_endian(column: array) -> bytes:
+    """Serialize a typed array as little-endian bytes."""
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _encode_column(table: Table, name: str) -> Tuple[Dict[str, Any], List[bytes]]:
+    """Encode one table column as (header entry, data blocks)."""
+    column = table.columns[name]
+    if np is not None and isinstance(column, np.ndarray) and column.dtype.kind in "if":
+        kind = "int64" if column.dtype.kind == "i" else "float64"
+        return {"kind": kind}, [column.astype("<i8" if kind == "int64" else "<f8").tobytes()]
+    if isinstance(column, array):
+        return {"kind": "int64" if column.typecode == "q" else "float64"}, [_little_endian(column)]
+    values = column.tolist() if np is not None and isinstance(column, np.ndarray) else column
+    missing = bytes(value is MISSING for value in values)
+    entry: Dict[str, Any] = {"missing": any(missing)}
+    blocks = [missing] if entry["missing"] else []
+    present = [value for value in values if value is not MISSING]
+    if all(type(value) is str for value in present):
+        texts = ["" if value is MISSING else value for value in values]
+        offsets = array("q", [0])
+        total = 0
+        for text in texts:
+            total += len(text)
+            offsets.append(total)
+        entry["kind"] = "str"
+        blocks += [_little_endian(offsets), "".join(texts).encode("utf-8")]
+    else:
+        entry["kind"] = "json"
+        plain = [None if value is MISSING else value for value in values]
+        blocks.append(json.dumps(plain, ensure_ascii=False).encode("utf-8"))
+    return entry, blocks
+
+
+def write_columnar(path: PathLike, data: Union[Iterable[Dict], Table],
+                   columns: Optional[Sequence[str]] = None) -> int:
+    """
+    Write records or a Table in the binary columnar format.
+    
+    The file holds an 8-byte magic, a length-prefixed JSON header and one
+    8-byte-aligned block per column buffer: raw little-endian int64 or
+    float64 values for numeric columns, character offsets plus UTF-8 text
+    for string columns, and a JSON array for anything else. Rows that lack
+    a field are recorded in a one-byte-per-row mask.
+    
+    Args:
+        path: File to write
+        data: Records or Table; other column values must be JSON
+            serializable
+        columns: Columns to write (all by default)
+    
+    Returns:
+        Number of rows written
+    """
+    table = data if isinstance(data, Table) else Table.from_records(data, use_numpy=False)
+    names = list(table.columns) if columns is None else list(columns)
+    entries, payload = [], []
+    for name in names:
+        entry, blocks = _encode_column(table, name)
+        entry["name"] = name
+        entry["blocks"] = [len(block) for block in blocks]
+        entries.append(entry)
+        payload.extend(blocks)
+    header = json.dumps({"rows": len(table), "columns": entries}).encode("utf-8")
+    with open(path, "wb") as handle:
+        handle.write(COLUMNAR_MAGIC)
+        handle.write(struct.pack("<Q", len(header)))
+        handle.write(header)
+        handle.write(b"\0" * (-handle.tell() % _ALIGNMENT))
+        for block in payload:
+            handle.write(block)
+            handle.write(b"\0" * (-len(block) % _ALIGNMENT))
+    return len(table)
+
+
+def _read_header(view: mmap.mmap) -> Tuple[Dict[str, Any], int]:
+    """Parse the header of a columnar file; return it with the first block's offset."""
+    if view[:len(COLUMNAR_MAGIC)] != COLUMNAR_MAGIC:
+        raise ValueError("Not a columnar data file")
+    start = len(COLUMNAR_MAGIC) + 8
+    (size,) = struct.unpack_from("<Q", view, len(COLUMNAR_MAGIC))
+    header = json.loads(view[start:start + size])
+    offset = start + size
+    return header, offset + (-offset % _ALIGNMENT)
+
+
+def _typed_block(view: mmap.mmap, offset: int, rows: int, kind: str, use_numpy: bool):
+    """Load a numeric block, zero-copy with NumPy."""
+    if use_numpy:
+        return np.frombuffer(view, "<i8" if kind == "int64" else "<f8", rows, offset)
+    column = array("q" if kind == "int64" else "d")
+    column.frombytes(view[offset:offset + rows * 8])
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def read_columnar(path: PathLike, columns: Optional[Sequence[str]] = None,
+                  use_numpy: Optional[bool] = None) -> Table:
+    """
+    Read a binary columnar file into a Table.
+    
+    The file is memory-mapped and only the blocks of the requested
+    columns are touched. With NumPy, numeric columns are read-only views
+    of the mapping and are never copied.
+    
+    Args:
+        path: File written by ``write_columnar``
+        columns: Columns to read (all by default)
+        use_numpy: Store numeric columns as NumPy arrays (defaults to True
+            when NumPy is installed)
+    
+    Returns:
+        New table
+    
+    Raises:
+        ValueError: If the file is not in the columnar format or a
+            requested column is not in it
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    with open(path, "rb") as handle:
+        view = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    header, offset = _read_header(view)
+    rows = header["rows"]
+    located = {}
+    for entry in header["columns"]:
+        blocks = []
+        for size in entry["blocks"]:
+            blocks.append((offset, size))
+            offset += size + (-size % _ALIGNMENT)
+        located[entry["name"]] = (entry, blocks)
+    names = list(located) if columns is None else list(columns)
+    unknown = [name for name in names if name not in located]
+    if unknown:
+        raise ValueError(f"Unknown columns: {unknown}")
+    result: Dict[str, Any] = {}
+    for name in names:
+        entry, blocks = located[name]
+        kind = entry["kind"]
+        if kind in ("int64", "float64"):
+            result[name] = _typed_block(view, blocks[0][0], rows, kind, use_numpy)
+            continue
+        if entry["missing"]:
+            (start, size), *blocks = blocks
+            missing = view[start:start + size]
+        if kind == "str":
+            (start, size), (text_start, text_size) = blocks
+            offsets = _typed_block(view, start, rows + 1, "int64", False)
+            text = view[text_start:text_start + text_size].decode("utf-8")
+            values = [text[begin:end] for begin, end in zip(offsets, offsets[1:])]
+        else:
+            ((start, size),) = blocks
+            values = json.loads(view[start:start + size])
+        if entry["missing"]:
+            values = [MISSING if flag else value for value, flag in zip(values, missing)]
+        result[name] = values
+    if not use_numpy:
+        view.close()
+    objects = {name: column for name, column in result.items() if isinstance(column, list)}
+    result.update(Table.from_columns(objects, use_numpy).columns)
+    return Table(result, rows)
+
+
+FORMATS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".json": "json",
+    ".col": "columnar",
+}
+
+
+def detect_format(path: PathLike, default: Optional[str] = None) -> str:
+    """
+    Work out a file's format from its extension.
+    
+    Args:
+        path: File path
+        default: Format to assume for unknown extensions
+    
+    Returns:
+        "csv", "ndjson", "json" or "columnar"
+    
+    Raises:
+        ValueError: If the extension is unknown and there is no default
+    """
+    found = FORMATS.get(os.path.splitext(os.fspath(path))[1].lower(), default)
+    if found is None:
+        raise ValueError(f"Cannot tell the format of {os.fspath(path)!r}; pass format=")
+    return found
+
+
+def _check_format(format: str):
+    """Raise ValueError for an unknown format name."""
+    if format not in FORMATS.values():
+        raise ValueError(f"Unknown format: {format}")
+
+
+def iter_records(path: PathLike, format: Optional[str] = None,
+                 columns: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+    """
+    Stream the records of a file in any supported format.
+    
+    Args:
+        path: File to read
+        format: "csv", "ndjson", "json" or "columnar" (detected from the
+            extension by default)
+        columns: Columns to read (all by default)
+    
+    Returns:
+        Iterator over records
+    
+    Raises:
+        ValueError: If the format is unknown
+    """
+    format = format or detect_format(path)
+    _check_format(format)
+    if format == "csv":
+        return read_csv(path, columns)
+    if format == "ndjson":
+        return read_ndjson(path, columns)
+    return iter(read_table(path, format, columns).to_records())
+
+
+def read_table(path: PathLike, format: Optional[str] = None,
+               columns: Optional[Sequence[str]] = None,
+               use_numpy: Optional[bool] = None) -> Table:
+    """
+    Read a file in any supported format into a Table.
+    
+    Args:
+        path: File to read
+        format: "csv", "ndjson", "json" or "columnar" (detected from the
+            extension by default)
+        columns: Columns to read (all by default)
+        use_numpy: Store numeric columns as NumPy arrays
+    
+    Returns:
+        New table
+    
+    Raises:
+        ValueError: If the format is unknown
+    """
+    format = format or detect_format(path)
+    _check_format(format)
+    if format == "csv":
+        return read_csv_table(path, columns, use_numpy=use_numpy)
+    if format == "ndjson":
+        return read_ndjson_table(path, columns, use_numpy=use_numpy)
+    if format == "columnar":
+        return read_columnar(path, columns, use_numpy)
+    with open(path, encoding="utf-8") as handle:
+        records = json.load(handle)
+    if columns is not None:
+        records = map(compile_transform(list(columns)), records)
+    return Table.from_records(records, use_numpy)
+
+
+def write_records(path: PathLike, data: Union[Iterable[Dict], Table],
+                  format: Optional[str] = None) -> int:
+    """
+    Write records or a Table in any supported format.
+    
+    Args:
+        path: File to write
+        data: Records or Table
+        format: "csv", "ndjson", "json" or "columnar" (detected from the
+            extension by default)
+    
+    Returns:
+        Number of rows written
+    
+    Raises:
+        ValueError: If the format is unknown
+    """
+    format = format or detect_format(path)
+    _check_format(format)
+    if format == "csv":
+        return write_csv(path, data)
+    if format == "ndjson":
+        return write_ndjson(path, data)
+    if format == "columnar":
+        return write_columnar(path, data)
+    records = data.to_records() if isinstance(data, Table) else list(data)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(records, handle, ensure_ascii=False)
+    return len(records)
@@ -0,0 +1,227 @@
+"""
+Safe arithmetic expression compiler.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+import ast
+import math
+import operator
+
+
+EXPRESSION_CACHE_SIZE = 256
+# Roughly the 4300 digits Python converts to text by default.
+MAX_POWER_BITS = 14_000
+
+Env = Dict[str, Any]
+Evaluator = Callable[[Env], Any]
+
+
+def _divide(a: float, b: float) -> float:
+    """Divide, reporting division by zero as Calculator.divide does."""
+    if b == 0:
+        raise ValueError("Cannot divide by zero")
+    return a / b
+
+
+def _floor_divide(a: float, b: float) -> float:
+    """Floor-divide, reporting division by zero."""
+    if b == 0:
+        raise ValueError("Cannot divide by zero")
+    return a // b
+
+
+def _modulo(a: float, b: float) -> float:
+    """Take a remainder, reporting division by zero."""
+    if b == 0:
+        raise ValueError("Cannot divide by zero")
+    return a % b
+
+
+def _power(a: float, b: float) -> float:
+    """
+    Raise to a power, refusing results too large to compute quickly.
+    
+    Integer powers grow without bound, so the size of the result
+    (``a.bit_length() * b`` bits) is checked before computing it; float
+    powers overflow with an error instead. Complex results, e.g. of a
+    negative number to a fractional power, are rejected.
+    """
+    if isinstance(a, int) and isinstance(b, int) and b > 0 and a not in (0, 1, -1):
+        if a.bit_length() * b > MAX_POWER_BITS:
+            raise ValueError(f"Result of {a.bit_length()}-bit number ** {b} is too large")
+    result = a ** b
+    if isinstance(result, complex):
+        raise ValueError(f"Result of {a} ** {b} is not a real number")
+    return result
+
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: _divide,
+    ast.FloorDiv: _floor_divide,
+    ast.Mod: _modulo,
+    ast.Pow: _power,
+}
+UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+FUNCTIONS = {
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "round": round,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "log": math.log,
+}
+CONSTANTS = {
+    "pi": math.pi,
+    "e": math.e,
+}
+
+
+class Expression:
+    """
+    Compiled arithmetic expression.
+    
+    The expression is parsed with ``ast`` (never ``eval``), checked
+    against a whitelist of number literals, variables, arithmetic
+    operators and a few math functions, and turned into a tree of
+    closures. Subexpressions without variables are folded into constants
+    at compile time, so ``x * (60 * 60)`` multiplies by 3600 directly.
+    """
+    
+    def __init__(self, text: str):
+        """
+        Compile an expression.
+        
+        Args:
+            text: Arithmetic expression, e.g. "price * (1 + rate) - 2"
+        
+        Raises:
+            ValueError: If the text is not a valid, allowed expression or a
+                constant part of it cannot be evaluated
+        """
+        try:
+            tree = ast.parse(text.strip(), mode="eval")
+        except SyntaxError as error:
+            raise ValueError(f"Invalid expression {text!r}: {error.msg}") from None
+        self.text = text
+        self.variables: FrozenSet[str] = frozenset()
+        try:
+            self._constant, self._evaluate = self._compile(tree.body)
+        except ArithmeticError as error:
+            raise ValueError(f"Cannot evaluate {text!r}: {error}") from None
+    
+    def __repr__(self) -> str:
+        return f"Expression({self.text!r})"
+    
+    @property
+    def is_constant(self) -> bool:
+        """Whether the expression folded to a single value."""
+        return self._evaluate is None
+    
+    def _compile(self, node: ast.AST) -> Tuple[Any, Optional[Evaluator]]:
+        """
+        Compile a node into (constant, None) or (None, evaluator).
+        
+        Evaluators take the variable bindings and return the node's value.
+        """
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise ValueError(f"Unsupported literal: {node.value!r}")
+            return node.value, None
+        if isinstance(node, ast.Name):
+            if node.id in CONSTANTS:
+                return CONSTANTS[node.id], None
+            name = node.id
+            self.variables |= {name}
+            
+            def variable(env: Env) -> Any:
+                try:
+                    return env[name]
+                except KeyError:
+                    raise ValueError(f"Missing value for variable {name!r}") from None
+            
+            return None, variable
+        if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+            function = BINARY_OPERATORS[type(node.op)]
+            left_value, left = self._compile(node.left)
+            right_value, right = self._compile(node.right)
+            if left is None and right is None:
+                return function(left_value, right_value), None
+            if left is None:
+                return None, lambda env: function(left_value, right(env))
+            if right is None:
+                return None, lambda env: function(left(env), right_value)
+            return None, lambda env: function(left(env), right(env))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+            function = UNARY_OPERATORS[type(node.op)]
+            value, operand = self._compile(node.operand)
+            if operand is None:
+                return function(value), None
+            return None, lambda env: function(operand(env))
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in FUNCTIONS and not node.keywords):
+            function = FUNCTIONS[node.func.id]
+            compiled = [self._compile(argument) for argument in node.args]
+            if all(evaluate is None for _, evaluate in compiled):
+                return self._call(function, [value for value, _ in compiled]), None
+            parts = [(lambda env, value=value: value) if evaluate is None else evaluate
+                     for value, evaluate in compiled]
+            return None, lambda env: self._call(function, [part(env) for part in parts])
+        raise ValueError(f"Unsupported syntax in expression: {type(node).__name__}")
+    
+    @staticmethod
+    def _call(function: Callable, arguments: list) -> Any:
+        """Call a whitelisted function, reporting bad arguments as ValueError."""
+        try:
+            return function(*arguments)
+        except TypeError as error:
+            raise ValueError(str(error)) from None
+    
+    def evaluate(self, env: Optional[Env] = None) -> Any:
+        """
+        Evaluate the expression.
+        
+        Args:
+            env: Values of the variables
+        
+        Returns:
+            The expression's value
+        
+        Raises:
+            ValueError: If a variable is missing or the evaluation fails,
+                e.g. on division by zero or a non-numeric operand
+        """
+        if self._evaluate is None:
+            return self._constant
+        try:
+            return self._evaluate(env or {})
+        except (ArithmeticError, TypeError) as error:
+            raise ValueError(f"Cannot evaluate {self.text!r}: {error}") from None
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(text: str) -> Expression:
+    """
+    Compile an expression, reusing earlier compilations of the same text.
+    
+    Compiled expressions are immutable, so the cache (an LRU of
+    ``EXPRESSION_CACHE_SIZE`` entries keyed by the text; see
+    ``compile_expression.cache_info()``) is shared by every caller.
+    
+    Args:
+        text: Arithmetic expression
+    
+    Returns:
+        Compiled expression
+    
+    Raises:
+        ValueError: If the expression is invalid
+    """
+    return Expression(text)
@@ -0,0 +1,430 @@
+"""
+Record collections with secondary indexes and indexed predicate queries.
+"""
+
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+import math
+
+
+INDEX_KINDS = ("hash", "sorted")
+
+
+def _is_missing(value: Any) -> bool:
+    """Treat None and NaN as missing."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class _SortedIndex:
+    """
+    Row positions ordered by a key's value, for range lookups.
+    
+    Appended rows are buffered and folded in on the next lookup, so a run
+    of appends costs one sort of the buffer and a linear merge rather than
+    one insertion each. Missing values are not indexed.
+    """
+    
+    def __init__(self):
+        self.keys: List[Any] = []
+        self.rows: List[int] = []
+        self._pending: List[Tuple[Any, int]] = []
+    
+    def add(self, value: Any, row: int):
+        """Index a row's value."""
+        if not _is_missing(value):
+            self._pending.append((value, row))
+    
+    def _settle(self):
+        """Merge buffered rows into the sorted lists."""
+        if not self._pending:
+            return
+        pending = sorted(self._pending, key=itemgetter(0))
+        self._pending = []
+        if self.keys:
+            # Timsort merges the two sorted runs in linear time; existing
+            # rows precede appended ones, so equal values stay in row order.
+            pending = sorted(list(zip(self.keys, self.rows)) + pending, key=itemgetter(0))
+        self.keys = [value for value, _ in pending]
+        self.rows = [row for _, row in pending]
+    
+    def _bounds(self, low: Any, high: Any, include_low: bool,
+                include_high: bool) -> Tuple[int, int]:
+        """
+        Slice of the sorted lists holding the values within the bounds.
+        
+        Bounds that cannot be compared with the indexed values match
+        nothing, as ``Range.matches`` and ``==`` do on a scan.
+        """
+        self._settle()
+        keys = self.keys
+        try:
+            if low is None:
+                start = 0
+            else:
+                start = bisect_left(keys, low) if include_low else bisect_right(keys, low)
+            if high is None:
+                end = len(keys)
+            else:
+                end = bisect_right(keys, high) if include_high else bisect_left(keys, high)
+        except TypeError:
+            return 0, 0
+        return start, max(start, end)
+    
+    def count(self, low: Any, high: Any, include_low: bool = True,
+              include_high: bool = True) -> int:
+        """Number of rows with values within the bounds."""
+        start, end = self._bounds(low, high, include_low, include_high)
+        return end - start
+    
+    def range(self, low: Any, high: Any, include_low: bool = True,
+              include_high: bool = True) -> List[int]:
+        """Rows with values within the bounds, in value order."""
+        start, end = self._bounds(low, high, include_low, include_high)
+        return self.rows[start:end]
+
+
+class Predicate:
+    """
+    Condition on records that an ``IndexedDataset`` can plan against its
+    indexes.
+    
+    Predicates combine with ``&`` and ``|``. Every predicate can also be
+    evaluated against a single record with ``matches``, which is how
+    unindexed conditions are checked.
+    """
+    
+    def matches(self, record: Dict) -> bool:
+        """Check whether a record satisfies the predicate."""
+        raise NotImplementedError
+    
+    def estimate(self, dataset: "IndexedDataset") -> Optional[int]:
+        """Number of rows the indexes would return, or None if unindexed."""
+        return None
+    
+    def lookup(self, dataset: "IndexedDataset") -> Optional[Iterable[int]]:
+        """Matching row positions from the indexes, or None if unindexed."""
+        return None
+    
+    def __and__(self, other: "Predicate") -> "And":
+        """Combine with another predicate; both must hold."""
+        return And(self, other)
+    
+    def __or__(self, other: "Predicate") -> "Or":
+        """Combine with another predicate; either may hold."""
+        return Or(self, other)
+
+
+class Eq(Predicate):
+    """``record.get(key) == value``, as ``DataProcessor.filter_data`` compares."""
+    
+    def __init__(self, key: str, value: Any):
+        self.key = key
+        self.value = value
+    
+    def __repr__(self) -> str:
+        return f"Eq({self.key!r}, {self.value!r})"
+    
+    def matches(self, record: Dict) -> bool:
+        return record.get(self.key) == self.value
+    
+    def estimate(self, dataset: "IndexedDataset") -> Optional[int]:
+        hashed = dataset._hash.get(self.key)
+        if hashed is not None:
+            return len(hashed.get(self.value, ()))
+        ordered = dataset._sorted.get(self.key)
+        if ordered is not None and not _is_missing(self.value):
+            return ordered.count(self.value, self.value)
+        return None
+    
+    def lookup(self, dataset: "IndexedDataset") -> Optional[Iterable[int]]:
+        hashed = dataset._hash.get(self.key)
+        if hashed is not None:
+            return hashed.get(self.value, ())
+        ordered = dataset._sorted.get(self.key)
+        if ordered is not None and not _is_missing(self.value):
+            return ordered.range(self.value, self.value)
+        return None
+
+
+class In(Predicate):
+    """``record.get(key)`` equals one of several values."""
+    
+    def __init__(self, key: str, values: Iterable[Any]):
+        self.key = key
+        self.values = list(values)
+    
+    def __repr__(self) -> str:
+        return f"In({self.key!r}, {self.values!r})"
+    
+    def _terms(self) -> List[Eq]:
+        return [Eq(self.key, value) for value in self.values]
+    
+    def matches(self, record: Dict) -> bool:
+        return record.get(self.key) in self.values
+    
+    def estimate(self, dataset: "IndexedDataset") -> Optional[int]:
+        counts = [term.estimate(dataset) for term in self._terms()]
+        return None if None in counts else sum(counts)
+    
+    def lookup(self, dataset: "IndexedDataset") -> Optional[Iterable[int]]:
+        rows: Set[int] = set()
+        for term in self._terms():
+            found = term.lookup(dataset)
+            if found is None:
+                return None
+            rows.update(found)
+        return rows
+
+
+class Range(Predicate):
+    """
+    ``record.get(key)`` lies between two bounds.
+    
+    Either bound may be None for an open range. Missing values, NaN and
+    values that cannot be compared with the bounds never match.
+    """
+    
+    def __init__(self, key: str, low: Any = None, high: Any = None,
+                 include_low: bool = True, include_high: bool = True):
+        self.key = key
+        self.low = low
+        self.high = high
+        self.include_low = include_low
+        self.include_high = include_high
+    
+    def __repr__(self) -> str:
+        return f"Range({self.key!r}, {self.low!r}, {self.high!r})"
+    
+    def matches(self, record: Dict) -> bool:
+        value = record.get(self.key)
+        if _is_missing(value):
+            return False
+        try:
+            if self.low is not None:
+                if value < self.low or (value == self.low and not self.include_low):
+                    return False
+            if self.high is not None:
+                if value > self.high or (value == self.high and not self.include_high):
+                    return False
+        except TypeError:
+            return False
+        return True
+    
+    def _bounds(self) -> Tuple[Any, Any, bool, bool]:
+        return self.low, self.high, self.include_low, self.include_high
+    
+    def estimate(self, dataset: "IndexedDataset") -> Optional[int]:
+        ordered = dataset._sorted.get(self.key)
+        return None if ordered is None else ordered.count(*self._bounds())
+    
+    def lookup(self, dataset: "IndexedDataset") -> Optional[Iterable[int]]:
+        ordered = dataset._sorted.get(self.key)
+        return None if ordered is None else ordered.range(*self._bounds())
+
+
+class And(Predicate):
+    """
+    All of several predicates hold.
+    
+    Planned by looking up the most selective indexed term and checking
+    the remaining terms on its rows only.
+    """
+    
+    def __init__(self, *terms: Predicate):
+        if not terms:
+            raise ValueError("And needs at least one predicate")
+        self.terms = terms
+    
+    def __repr__(self) -> str:
+        return f"And{self.terms!r}"
+    
+    def matches(self, record: Dict) -> bool:
+        return all(term.matches(record) for term in self.terms)
+    
+    def _driver(self, dataset: "IndexedDataset") -> Optional[Tuple[int, Predicate]]:
+        """The indexed term with the fewest rows, with its estimate."""
+        best = None
+        for term in self.terms:
+            count = term.estimate(dataset)
+            if count is not None and (best is None or count < best[0]):
+                best = (count, term)
+        return best
+    
+    def estimate(self, dataset: "IndexedDataset") -> Optional[int]:
+        driver = self._driver(dataset)
+        return None if driver is None else driver[0]
+    
+    def lookup(self, dataset: "IndexedDataset") -> Optional[Iterable[int]]:
+        driver = self._driver(dataset)
+        if driver is None:
+            return None
+        driving = driver[1]
+        rest = [term for term in self.terms if term is not driving]
+        records = dataset.records
+        return [row for row in driving.lookup(dataset)
+                if all(term.matches(records[row]) for term in rest)]
+
+
+class Or(Predicate):
+    """
+    Any of several predicates holds.
+    
+    Indexed only when every term is; the row sets are unioned.
+    """
+    
+    def __init__(self, *terms: Predicate):
+        if not terms:
+            raise ValueError("Or needs at least one predicate")
+        self.terms = terms
+    
+    def __repr__(self) -> str:
+        return f"Or{self.terms!r}"
+    
+    def matches(self, record: Dict) -> bool:
+        return any(term.matches(record) for term in self.terms)
+    
+    def estimate(self, dataset: "IndexedDataset") -> Optional[int]:
+        counts = [term.estimate(dataset) for term in self.terms]
+        return None if None in counts else sum(counts)
+    
+    def lookup(self, dataset: "IndexedDataset") -> Optional[Iterable[int]]:
+        rows: Set[int] = set()
+        for term in self.terms:
+            found = term.lookup(dataset)
+            if found is None:
+                return None
+            rows.update(found)
+        return rows
+
+
+class IndexedDataset:
+    """
+    List of records with secondary indexes for repeated queries.
+    
+    Hash indexes map a key's values to the rows holding them, so equality
+    and membership lookups cost O(matches) instead of a full scan. Sorted
+    indexes keep rows ordered by a key's value for range lookups (their
+    values must be mutually comparable). Both are maintained as records
+    are appended. Records must not be modified in place once added.
+    
+    The dataset iterates, indexes and measures like a list, so it can be
+    passed to any ``DataProcessor`` method.
+    """
+    
+    def __init__(self, records: Iterable[Dict] = (), hash_keys: Sequence[str] = (),
+                 sorted_keys: Sequence[str] = ()):
+        """
+        Initialize indexed dataset.
+        
+        Args:
+            records: Initial records
+            hash_keys: Keys to build hash indexes on
+            sorted_keys: Keys to build sorted (range) indexes on
+        """
+        self.records: List[Dict] = []
+        self._hash: Dict[str, Dict[Any, List[int]]] = {key: {} for key in hash_keys}
+        self._sorted: Dict[str, _SortedIndex] = {key: _SortedIndex() for key in sorted_keys}
+        self.extend(records)
+    
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return len(self.records)
+    
+    def __iter__(self) -> Iterator[Dict]:
+        """Iterate over the records in insertion order."""
+        return iter(self.records)
+    
+    def __getitem__(self, index):
+        """Get a record, or a list of records for a slice."""
+        return self.records[index]
+    
+    @property
+    def indexes(self) -> Dict[str, str]:
+        """Indexed keys mapped to their index kind."""
+        kinds = {key: "hash" for key in self._hash}
+        kinds.update((key, "sorted") for key in self._sorted if key not in kinds)
+        return kinds
+    
+    def create_index(self, key: str, kind: str = "hash"):
+        """
+        Build an index on a key over the existing records.
+        
+        Args:
+            key: Key to index
+            kind: "hash" for equality lookups or "sorted" for ranges
+        
+        Raises:
+            ValueError: If the index kind is unknown
+        """
+        if kind not in INDEX_KINDS:
+            raise ValueError(f"Unknown index kind: {kind}")
+        if kind == "hash":
+            index: Dict[Any, List[int]] = {}
+            for row, record in enumerate(self.records):
+                index.setdefault(record.get(key), []).append(row)
+            self._hash[key] = index
+        else:
+            ordered = _SortedIndex()
+            for row, record in enumerate(self.records):
+                ordered.add(record.get(key), row)
+            self._sorted[key] = ordered
+    
+    def append(self, record: Dict):
+        """
+        Add a record, updating every index.
+        
+        Args:
+            record: Record to add
+        """
+        row = len(self.records)
+        self.records.append(record)
+        for key, index in self._hash.items():
+            index.setdefault(record.get(key), []).append(row)
+        for key, ordered in self._sorted.items():
+            ordered.add(record.get(key), row)
+    
+    def extend(self, records: Iterable[Dict]):
+        """
+        Add several records, updating every index.
+        
+        Args:
+            records: Records to add
+        """
+        for record in records:
+            self.append(record)
+    
+    def query(self, predicate: Predicate) -> List[Dict]:
+        """
+        Get the records matching a predicate.
+        
+        Predicates on indexed keys are answered from the indexes; anything
+        else falls back to a scan.
+        
+        Args:
+            predicate: Condition to match, e.g.
+                ``Eq("city", "NYC") & Range("age", 30, 40)``
+        
+        Returns:
+            Matching records in insertion order
+        """
+        rows = predicate.lookup(self)
+        records = self.records
+        if rows is None:
+            return [record for record in records if predicate.matches(record)]
+        if not isinstance(predicate, Eq):
+            rows = sorted(rows)
+        return [records[row] for row in rows]
+    
+    def filter_eq(self, key: str, value: Any) -> List[Dict]:
+        """
+        Get the records whose key equals a value.
+        
+        Args:
+            key: Key to compare
+            value: Value to match
+        
+        Returns:
+            Matching records in insertion order
+        """
+        return self.query(Eq(key, value))
@@ -0,0 +1,286 @@
+"""
+Hash join engine with spill-to-disk partitioning.
+"""
+
+from itertools import chain, count
+from operator import itemgetter
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set,
+                    Tuple)
+import pickle
+import tempfile
+
+
+JOIN_TYPES = ("inner", "left", "right", "outer")
+DEFAULT_MAX_BUILD_ROWS = 1_000_000
+SPILL_FANOUT = 16
+MAX_SPILL_DEPTH = 4
+
+
+class _Partitions:
+    """Temporary files holding rows partitioned by key hash."""
+    
+    def __init__(self, count: int, directory: Optional[str]):
+        self.files = [tempfile.TemporaryFile(dir=directory) for _ in range(count)]
+    
+    def __enter__(self) -> "_Partitions":
+        return self
+    
+    def __exit__(self, *exc_info):
+        for handle in self.files:
+            handle.close()
+    
+    def write(self, index: int, row: Dict):
+        """Append a row to a partition."""
+        pickle.dump(row, self.files[index], pickle.HIGHEST_PROTOCOL)
+    
+    def read(self, index: int) -> Iterator[Dict]:
+        """Read back the rows of a partition."""
+        handle = self.files[index]
+        handle.seek(0)
+        while True:
+            try:
+                yield pickle.load(handle)
+            except EOFError:
+                return
+
+
+class _Positioned(dict):
+    """Left-hand row tagged with its position in the left input."""
+    
+    __slots__ = ("position",)
+    
+    def __init__(self, row: Dict = (), position: int = 0):
+        super().__init__(row)
+        self.position = position
+
+
+class _Join:
+    """State shared by the in-memory and partitioned phases of one join."""
+    
+    def __init__(self, key: str, combine: Callable[[Dict, Dict], Any], keep_build: bool,
+                 keep_probe: bool, max_build_rows: int, spill_dir: Optional[str],
+                 left_side: str):
+        self.key = key
+        self.combine = combine
+        self.keep_build = keep_build
+        self.keep_probe = keep_probe
+        self.max_build_rows = max_build_rows
+        self.spill_dir = spill_dir
+        self.left_side = left_side  # "build" or "probe"
+    
+    def run(self, build: Iterator[Dict], probe: Iterable[Dict], depth: int = 0) -> Iterator[Any]:
+        """Build a hash table from ``build``, spilling if it grows too large, then probe it."""
+        key = self.key
+        table: Dict[Any, List[Dict]] = {}
+        unkeyed: List[Dict] = []
+        rows = 0
+        for row in build:
+            value = row.get(key)
+            if value is None:
+                if self.keep_build:
+                    unkeyed.append(row)
+                continue
+            table.setdefault(value, []).append(row)
+            rows += 1
+            if rows > self.max_build_rows and depth < MAX_SPILL_DEPTH:
+                buffered = chain.from_iterable(table.values())
+                yield from self.partitioned(chain(buffered, build), probe, depth)
+                yield from unkeyed
+                return
+        yield from self.probe(table, probe)
+        yield from unkeyed
+    
+    def run_left_build(self, left: Sequence[Dict], probe: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Join with ``left`` as the build side, emitting rows in left order.
+        
+        The hash table maps keys to left positions and probing only
+        collects references to matching right rows, so output rows are
+        built in left order at the end without sorting.
+        """
+        key = self.key
+        table: Dict[Any, List[int]] = {}
+        rows = 0
+        for position, row in enumerate(left):
+            value = row.get(key)
+            if value is None:
+                continue
+            table.setdefault(value, []).append(position)
+            rows += 1
+            if rows > self.max_build_rows:
+                yield from self.partitioned(map(_Positioned, left, count()), probe, 0)
+                return
+        matches: Dict[int, List[Dict]] = {}
+        unmatched: List[Dict] = []
+        for row in probe:
+            value = row.get(key)
+            positions = table.get(value) if value is not None else None
+            if positions:
+                for position in positions:
+                    found = matches.get(position)
+                    if found is None:
+                        matches[position] = [row]
+                    else:
+                        found.append(row)
+            elif self.keep_probe:
+                unmatched.append(row)
+        for position, row in enumerate(left):
+            found = matches.get(position)
+            if found:
+                for right_row in found:
+                    yield {**row, **right_row}
+            elif self.keep_build:
+                yield row
+        yield from unmatched
+    
+    def probe(self, table: Dict[Any, List[Dict]], probe: Iterable[Dict]) -> Iterator[Any]:
+        """Stream the probe side against an in-memory hash table."""
+        key = self.key
+        combine = self.combine
+        matched: Set[Any] = set()
+        for row in probe:
+            value = row.get(key)
+            matches = table.get(value) if value is not None else None
+            if matches:
+                if self.keep_build:
+                    matched.add(value)
+                for build_row in matches:
+                    yield combine(build_row, row)
+            elif self.keep_probe:
+                yield row
+        if self.keep_build:
+            for value, rows in table.items():
+                if value not in matched:
+                    yield from rows
+    
+    def partitioned(self, build: Iterable[Dict], probe: Iterable[Dict],
+                    depth: int) -> Iterator[Any]:
+        """Grace hash join: spill both sides by key hash, then join partition by partition."""
+        if depth > 0:
+            yield from self._partitioned(build, probe, depth)
+            return
+        # Partitions scramble the input order, so left rows are tagged with
+        # their positions (the build side arrives tagged) and sorted back.
+        if self.left_side == "probe":
+            probe = map(_Positioned, probe, count())
+            self.combine = _merge_positioned_probe
+        else:
+            self.combine = _merge_positioned
+        yield from _in_left_order(self._partitioned(build, probe, depth))
+    
+    def _partitioned(self, build: Iterable[Dict], probe: Iterable[Dict],
+                     depth: int) -> Iterator[Any]:
+        """Spill both sides and join the partitions."""
+        key = self.key
+        with _Partitions(SPILL_FANOUT + 1, self.spill_dir) as build_parts, \
+                _Partitions(SPILL_FANOUT, self.spill_dir) as probe_parts:
+            for row in build:
+                value = row.get(key)
+                if value is None:
+                    if self.keep_build:
+                        build_parts.write(SPILL_FANOUT, row)
+                    continue
+                build_parts.write(hash((depth, value)) % SPILL_FANOUT, row)
+            for row in probe:
+                value = row.get(key)
+                if value is None:
+                    if self.keep_probe:
+                        yield row
+                    continue
+                probe_parts.write(hash((depth, value)) % SPILL_FANOUT, row)
+            for index in range(SPILL_FANOUT):
+                yield from self.run(build_parts.read(index), probe_parts.read(index), depth + 1)
+            yield from build_parts.read(SPILL_FANOUT)
+
+
+def _in_left_order(rows: Iterable[Any]) -> Iterator[Dict]:
+    """
+    Put spilled join output back into left order.
+    
+    Rows tagged with a left position (``_Positioned`` rows and
+    ``(position, row)`` pairs) are sorted by it, and right-only rows
+    follow them.
+    """
+    tagged: List[Tuple[int, Dict]] = []
+    right_only: List[Dict] = []
+    for row in rows:
+        if isinstance(row, tuple):
+            tagged.append(row)
+        elif isinstance(row, _Positioned):
+            tagged.append((row.position, dict(row)))
+        else:
+            right_only.append(row)
+    tagged.sort(key=itemgetter(0))
+    for _, row in tagged:
+        yield row
+    yield from right_only
+
+
+def hash_join(
+    left: Iterable[Dict],
+    right: Iterable[Dict],
+    key: str,
+    how: str = "inner",
+    max_build_rows: int = DEFAULT_MAX_BUILD_ROWS,
+    spill_dir: Optional[str] = None,
+) -> Iterator[Dict]:
+    """
+    Join two datasets on a key.
+    
+    The smaller side (by ``len``, when both sides have one; otherwise
+    ``right``) is loaded into a hash table and the other side is streamed
+    against it. Every pair of rows with equal keys is joined (many-to-many)
+    as ``{**left_row, **right_row}``. Rows whose key is missing or None
+    never match. If the build side grows beyond ``max_build_rows``, both
+    sides are partitioned by key hash into temporary files and joined one
+    partition at a time (a Grace hash join), repartitioning oversized
+    partitions a few levels deep.
+    
+    Rows containing a left-hand row come in the order of ``left``, and
+    the matches of one left row in the order of ``right``. Right rows
+    without a match (right and outer joins) come after them. Output is
+    streamed when ``right`` is the build side and fits in memory;
+    otherwise it is produced once the inputs have been read.
+    
+    Args:
+        left: Left-hand rows
+        right: Right-hand rows
+        key: Key to join on
+        how: "inner", "left", "right" or "outer"; unmatched rows of the
+            preserved side(s) are emitted unchanged
+        max_build_rows: Rows of the build side to hold in memory before
+            spilling to disk
+        spill_dir: Directory for spill files (defaults to the system
+            temporary directory)
+    
+    Returns:
+        Iterator over joined rows
+    
+    Raises:
+        ValueError: If the join type is unknown
+    """
+    if how not in JOIN_TYPES:
+        raise ValueError(f"Unknown join type: {how}")
+    keep_left, keep_right = how in ("left", "outer"), how in ("right", "outer")
+    if hasattr(left, "__len__") and hasattr(right, "__len__") and len(left) < len(right):
+        join = _Join(key, _merge_positioned, keep_left, keep_right, max_build_rows, spill_dir,
+                     left_side="build")
+        return join.run_left_build(left, right)
+    join = _Join(key, _merge_rows_swapped, keep_right, keep_left, max_build_rows, spill_dir,
+                 left_side="probe")
+    return join.run(iter(right), left)
+
+
+def _merge_positioned(left_row: _Positioned, right_row: Dict) -> Tuple[int, Dict]:
+    """Combine a left row (build side) with a right row, keeping its position."""
+    return left_row.position, {**left_row, **right_row}
+
+
+def _merge_rows_swapped(right_row: Dict, left_row: Dict) -> Dict:
+    """Combine a right row (build side) with a left row."""
+    return {**left_row, **right_row}
+
+
+def _merge_positioned_probe(right_row: Dict, left_row: _Positioned) -> Tuple[int, Dict]:
+    """Combine a right row (build side) with a left row, keeping its position."""
+    return left_row.position, {**left_row, **right_row}
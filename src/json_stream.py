@@ -0,0 +1,147 @@
+"""
+Incremental JSON decoding for large array and NDJSON payloads.
+"""
+
+from typing import Any, Iterable, Iterator, Union
+import codecs
+import json
+
+
+Chunk = Union[bytes, str]
+
+_WHITESPACE = " \t\r\n"
+_NUMBER_CHARS = "0123456789+-.eE"
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+
+# What iter_json_array accepts next inside the array.
+_FIRST, _VALUE, _SEPARATOR = "first", "value", "separator"
+
+
+def _text(chunks: Iterable[Chunk]) -> Iterator[str]:
+    """Decode a stream of byte or text chunks to text."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _incomplete(buffer: str, error: json.JSONDecodeError) -> bool:
+    """
+    Check whether a buffer that failed to decode may become valid with more data.
+    
+    That is the case when decoding ran off the end of the buffer inside a
+    string, an escape, a literal or a number; anything else is malformed.
+    """
+    if error.pos >= len(buffer) or error.msg.startswith("Unterminated string"):
+        return True
+    if error.msg.startswith("Invalid \\") and len(buffer) - error.pos <= 6:
+        return True
+    rest = buffer[error.pos:]
+    if not rest.strip(_NUMBER_CHARS):
+        return True
+    return any(literal.startswith(rest) for literal in _LITERALS)
+
+
+def iter_json_array(chunks: Iterable[Chunk]) -> Iterator[Any]:
+    """
+    Decode the items of a top-level JSON array one at a time.
+    
+    Only the item currently being decoded is held in memory, so arrays far
+    larger than RAM can be consumed as long as each item fits. Malformed
+    input is reported as soon as it is seen rather than at the end of the
+    stream.
+    
+    Args:
+        chunks: Byte or text chunks of the JSON document
+    
+    Returns:
+        Iterator over the decoded array items
+    
+    Raises:
+        ValueError: If the document is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    started = False
+    finished = False
+    expect = _FIRST
+    offset = 0  # Stream position of buffer[0], for error messages.
+    for text in _text(chunks):
+        if finished:
+            if text.strip(_WHITESPACE):
+                raise ValueError("Unexpected data after JSON array")
+            continue
+        offset += pos
+        buffer = buffer[pos:] + text
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                if expect == _VALUE:
+                    raise ValueError(f"Trailing comma in JSON array at offset {offset + pos}")
+                finished = True
+                if buffer[pos + 1:].strip(_WHITESPACE):
+                    raise ValueError("Unexpected data after JSON array")
+                buffer, pos = "", 0
+                break
+            if buffer[pos] == ",":
+                if expect != _SEPARATOR:
+                    raise ValueError(f"Unexpected ',' in JSON array at offset {offset + pos}")
+                expect = _VALUE
+                pos += 1
+                continue
+            if expect == _SEPARATOR:
+                raise ValueError(f"Expected ',' or ']' in JSON array at offset {offset + pos}")
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as error:
+                if not _incomplete(buffer, error):
+                    raise ValueError(
+                        f"Invalid JSON array item at offset {offset + error.pos}: {error.msg}"
+                    ) from None
+                break  # Item is incomplete; wait for more data.
+            if not buffer[end:].strip(_NUMBER_CHARS) and isinstance(item, (int, float)):
+                break  # A number may continue in the next chunk.
+            yield item
+            expect = _SEPARATOR
+            pos = end
+    if not finished:
+        raise ValueError("Truncated JSON array")
+
+
+def iter_ndjson(chunks: Iterable[Chunk]) -> Iterator[Any]:
+    """
+    Decode newline-delimited JSON one record at a time.
+    
+    Args:
+        chunks: Byte or text chunks of the NDJSON document
+    
+    Returns:
+        Iterator over the decoded records
+    
+    Raises:
+        ValueError: If a line is not valid JSON
+    """
+    pending = ""
+    for text in _text(chunks):
+        lines = (pending + text).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if pending.strip():
+        yield json.loads(pending)
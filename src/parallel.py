@@ -0,0 +1,220 @@
+"""
+Multi-process execution backend for DataProcessor.
+"""
+
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import os
+
+from .data_processor import DataProcessor, Dataset
+from .stats import RunningStats
+from .table import INT64_MAX, INT64_MIN, Table, np
+
+
+def _read(name: str, typecode: str, start: int, end: int) -> List:
+    """Copy one partition of a shared column into a list."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        with shm.buf.cast(typecode) as view, view[start:end] as part:
+            return part.tolist()
+    finally:
+        shm.close()
+
+
+def _partial_stats(name: str, typecode: str, start: int, end: int, stddev: bool,
+                   quantiles: bool) -> RunningStats:
+    """Summarize one partition of a shared numeric column."""
+    stats = RunningStats(quantiles=quantiles, track_variance=stddev)
+    return stats.update(_read(name, typecode, start, end))
+
+
+def _partial_counts(name: str, typecode: str, start: int, end: int) -> Counter:
+    """Count the values in one partition of a shared column."""
+    return Counter(_read(name, typecode, start, end))
+
+
+def _partial_matches(name: str, typecode: str, start: int, end: int, target: Any) -> array:
+    """Find the rows of one partition of a shared column equal to a value."""
+    values = _read(name, typecode, start, end)
+    return array("q", [index for index, value in enumerate(values, start) if value == target])
+
+
+def _typed(values: List[Any]) -> Optional[array]:
+    """Pack numbers into an int64 or float64 array, or None if they do not fit."""
+    if all(type(value) is int for value in values):
+        if values and not INT64_MIN <= min(values) <= max(values) <= INT64_MAX:
+            return None
+        return array("q", values)
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+        return array("d", values)
+    return None
+
+
+class ParallelDataProcessor(DataProcessor):
+    """
+    DataProcessor that spreads large operations over worker processes.
+    
+    The column an operation needs is packed into a typed buffer in
+    ``multiprocessing.shared_memory`` and each worker reads only its own
+    slice of it, so no record dictionaries are pickled. Workers return
+    small partial results (``RunningStats``, counters, row indices) that
+    are merged in the parent. Inputs shorter than ``min_rows`` use the
+    single-process implementation.
+    
+    Extracting a field from a list of dictionaries is itself a
+    single-threaded pass, so the largest speedups come from ``Table``
+    inputs, whose numeric columns are copied to shared memory directly.
+    """
+    
+    def __init__(self, workers: Optional[int] = None, min_rows: int = 100_000):
+        """
+        Initialize parallel data processor.
+        
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
+            min_rows: Smallest input processed in parallel
+        """
+        super().__init__()
+        self.workers = workers or os.cpu_count() or 1
+        self.min_rows = min_rows
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    def __enter__(self) -> "ParallelDataProcessor":
+        """Enter context manager."""
+        return self
+    
+    def __exit__(self, *exc_info):
+        """Exit context manager, stopping the worker processes."""
+        self.close()
+    
+    def close(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def _partitions(self, length: int) -> List[Tuple[int, int]]:
+        """Split row positions into one contiguous range per worker."""
+        count = max(1, min(self.workers, length))
+        bounds = [length * i // count for i in range(count + 1)]
+        return list(zip(bounds, bounds[1:]))
+    
+    def _map(self, fn: Callable, column: array, *args) -> List:
+        """Share a column and run fn on each partition of it in the workers."""
+        if not column:
+            return []
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers)
+        data = memoryview(column).cast("B")
+        shm = shared_memory.SharedMemory(create=True, size=len(data))
+        try:
+            shm.buf[:len(data)] = data
+            futures = [
+                self._executor.submit(fn, shm.name, column.typecode, start, end, *args)
+                for start, end in self._partitions(len(column))
+            ]
+            return [future.result() for future in futures]
+        finally:
+            data.release()
+            shm.close()
+            shm.unlink()
+    
+    def _typed_column(self, data: Table, key: str) -> Optional[array]:
+        """Get a table column as an int64/float64 array, if it is one."""
+        column = data.columns.get(key)
+        if isinstance(column, array):
+            return column
+        if np is not None and isinstance(column, np.ndarray) and column.dtype.kind in "if":
+            typed = array("q" if column.dtype.kind == "i" else "d")
+            typed.frombytes(column.astype("<i8" if column.dtype.kind == "i" else "<f8").tobytes())
+            return typed
+        return None
+    
+    def _values(self, data: Dataset, key: str) -> List[Any]:
+        """Get a field's values, with None where it is missing."""
+        if isinstance(data, Table):
+            return data.column(key)
+        return [item.get(key) for item in data]
+    
+    def calculate_statistics(self, data: Dataset, key: str, stddev: bool = False,
+                             quantiles: Sequence[float] = ()) -> Dict[str, float]:
+        """
+        Calculate statistics for a numeric key across worker processes.
+        
+        Args:
+            data: List of dictionaries or Table
+            key: Numeric key to calculate statistics for
+            stddev: Also include population "variance" and "stddev"
+            quantiles: Approximate quantiles to include
+        
+        Returns:
+            Dictionary with statistics, as ``DataProcessor`` returns them
+        """
+        column = None
+        if len(data) >= self.min_rows:
+            if isinstance(data, Table):
+                column = self._typed_column(data, key)
+            if column is None:
+                numbers = [value for value in self._values(data, key)
+                           if isinstance(value, (int, float))]
+                column = _typed(numbers)
+        if column is None:
+            return super().calculate_statistics(data, key, stddev, quantiles)
+        stats = RunningStats(quantiles=bool(quantiles), track_variance=stddev)
+        for part in self._map(_partial_stats, column, stddev, bool(quantiles)):
+            stats.merge(part)
+        return stats.as_dict(stddev, quantiles)
+    
+    def aggregate_data(self, data: Dataset, key: str) -> Dict[Any, int]:
+        """
+        Count occurrences of a key's values across worker processes.
+        
+        Only int64 ``Table`` columns are counted in parallel. Any other
+        column would need every value hashed in the parent just to encode
+        it for the workers, which costs as much as counting it there, so
+        those inputs use the single-process implementation.
+        
+        Args:
+            data: List of dictionaries or Table
+            key: Key to aggregate by
+        
+        Returns:
+            Dictionary with counts, in order of first occurrence
+        """
+        column = None
+        if isinstance(data, Table) and len(data) >= self.min_rows:
+            column = self._typed_column(data, key)
+        if column is None or column.typecode != "q":
+            return super().aggregate_data(data, key)
+        totals = Counter()
+        for part in self._map(_partial_counts, column):
+            totals.update(part)
+        return dict(totals)
+    
+    def filter_data(self, data: Dataset, key: str, value: Any) -> Dataset:
+        """
+        Filter data by key-value pair across worker processes.
+        
+        Only numeric ``Table`` columns are scanned in parallel; other
+        inputs use the single-process implementation.
+        
+        Args:
+            data: List of dictionaries or Table to filter
+            key: Key to filter by
+            value: Value to match
+        
+        Returns:
+            Filtered data, of the same type as the input
+        """
+        column = None
+        if isinstance(data, Table) and len(data) >= self.min_rows:
+            column = self._typed_column(data, key)
+        if column is None or not isinstance(value, (int, float)):
+            return super().filter_data(data, key, value)
+        indices = array("q")
+        for part in self._map(_partial_matches, column, value):
+            indices.extend(part)
+        return data.take(indices)
@@ -0,0 +1,205 @@
+"""
+Lazy, one-record-at-a-time processing pipelines.
+"""
+
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+import os
+
+from .dataio import detect_format, iter_records
+from .groupby import DEFAULT_CHUNK_SIZE, AggregateSpec, GroupBy, GroupKeys
+from .join import DEFAULT_MAX_BUILD_ROWS, hash_join
+from .json_stream import iter_ndjson
+from .sorting import DEFAULT_RUN_SIZE, SortKeys, external_sort
+from .stats import RunningStats
+from .transform import compile_transform
+
+
+Source = Union[Iterable[Dict], str, os.PathLike]
+
+
+class Pipeline:
+    """
+    Lazy chain of record operations.
+    
+    Steps such as ``filter`` and ``transform`` wrap the source in
+    generators, so records flow through the whole chain one at a time and
+    memory stays flat regardless of input size. Nothing is read until a
+    terminal operation (``collect``, ``aggregate``, ``group_by``,
+    ``stats``) or iteration consumes the pipeline; a pipeline can be
+    consumed only once.
+    """
+    
+    def __init__(self, source: Source):
+        """
+        Initialize pipeline.
+        
+        Args:
+            source: Iterable of dictionaries, an open text file of NDJSON,
+                or a path to a CSV, NDJSON, JSON or columnar file (files
+                with other extensions are read as NDJSON)
+        """
+        if isinstance(source, (str, os.PathLike)):
+            records = iter_records(source, detect_format(source, default="ndjson"))
+        elif hasattr(source, "read"):
+            records = iter_ndjson(source)
+        else:
+            records = iter(source)
+        self._records: Iterator[Dict] = records
+    
+    def __iter__(self) -> Iterator[Dict]:
+        """Iterate over the resulting records."""
+        return self._records
+    
+    def _then(self, records: Iterator[Dict]) -> "Pipeline":
+        """Return a pipeline over the given records."""
+        return Pipeline(records)
+    
+    def filter(self, key: Union[str, Callable[[Dict], bool]], value: Any = None) -> "Pipeline":
+        """
+        Keep records matching a key-value pair or a predicate.
+        
+        Args:
+            key: Key to compare, or a predicate taking the record
+            value: Value to match when key is a string
+        
+        Returns:
+            New pipeline
+        """
+        if callable(key):
+            return self._then(record for record in self._records if key(record))
+        return self._then(record for record in self._records if record.get(key) == value)
+    
+    def transform(self, mapping: Union[Dict[str, str], Sequence[str],
+                                       Callable[[Dict], Dict]]) -> "Pipeline":
+        """
+        Rename keys, or apply a function to each record.
+        
+        Args:
+            mapping: Dictionary mapping old keys to new keys or a sequence
+                of keys to keep (other keys are dropped, as in
+                ``DataProcessor.transform_data``), or a function returning
+                the new record
+        
+        Returns:
+            New pipeline
+        """
+        if not callable(mapping):
+            mapping = compile_transform(mapping)
+        return self._then(map(mapping, self._records))
+    
+    def merge(self, other: Iterable[Dict], key: str,
+              max_build_rows: int = DEFAULT_MAX_BUILD_ROWS,
+              spill_dir: Optional[str] = None) -> "Pipeline":
+        """
+        Inner join the stream with another dataset on a key.
+        
+        Uses ``src.join.hash_join`` with ``other`` as the build side, so the
+        result matches ``DataProcessor.merge_data``: every pair of rows with
+        equal keys is joined and rows missing the key never match. The
+        stream itself is not buffered, and ``other`` spills to disk if it
+        exceeds ``max_build_rows``.
+        
+        Args:
+            other: Records to join with
+            key: Key to merge on
+            max_build_rows: Rows of ``other`` to hold in memory before
+                spilling to disk
+            spill_dir: Directory for spill files
+        
+        Returns:
+            New pipeline
+        """
+        records = self._records
+        
+        def merged() -> Iterator[Dict]:
+            yield from hash_join(records, other, key, "inner", max_build_rows, spill_dir)
+        
+        return self._then(merged())
+    
+    def sort(self, keys: SortKeys, reverse: bool = False, missing: str = "last",
+             run_size: int = DEFAULT_RUN_SIZE, spill_dir: Optional[str] = None) -> "Pipeline":
+        """
+        Sort the stream with an external merge sort.
+        
+        At most ``run_size`` records are held in memory; longer inputs are
+        spilled to disk in sorted runs and merged when the result is read.
+        
+        Args:
+            keys: Key or sequence of keys and (key, "asc"/"desc") pairs
+            reverse: Flip every direction
+            missing: Where missing values go: "first", "last" or "error"
+            run_size: Records held in memory at once
+            spill_dir: Directory for run files
+        
+        Returns:
+            New pipeline
+        """
+        records = self._records
+        
+        def ordered() -> Iterator[Dict]:
+            yield from external_sort(records, keys, reverse, missing, run_size, spill_dir)
+        
+        return self._then(ordered())
+    
+    def collect(self) -> List[Dict]:
+        """
+        Run the pipeline and gather the results.
+        
+        Returns:
+            List of resulting records
+        """
+        return list(self._records)
+    
+    def aggregate(self, key: str) -> Dict[Any, int]:
+        """
+        Run the pipeline, counting occurrences of a key's values.
+        
+        Args:
+            key: Key to aggregate by
+        
+        Returns:
+            Dictionary with counts
+        """
+        return dict(Counter(record.get(key) for record in self._records))
+    
+    def group_by(self, keys: GroupKeys, aggregates: AggregateSpec,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Dict]:
+        """
+        Run the pipeline, aggregating groups of records.
+        
+        Records are folded in chunks of ``chunk_size``, so memory is
+        bounded by the chunk and the number of groups.
+        
+        Args:
+            keys: Key or keys to group by
+            aggregates: Output names mapped to (field, function) pairs, as
+                for ``DataProcessor.group_data``
+            chunk_size: Records per chunk
+        
+        Returns:
+            One row per group, in order of first occurrence
+        """
+        return GroupBy(keys, aggregates).consume(self._records, chunk_size).result()
+    
+    def stats(self, key: str, stddev: bool = False,
+              quantiles: Sequence[float] = ()) -> Dict[str, float]:
+        """
+        Run the pipeline, summarizing a numeric key in one pass.
+        
+        Values are streamed into a ``RunningStats``, which folds them in
+        fixed-size chunks, so memory stays bounded.
+        
+        Args:
+            key: Numeric key to calculate statistics for
+            stddev: Also include "variance" and "stddev"
+            quantiles: Approximate quantiles to include
+        
+        Returns:
+            Dictionary with count, sum, avg, min and max plus the
+            requested extras
+        """
+        values = (value for record in self._records
+                  if isinstance(value := record.get(key), (int, float)))
+        stats = RunningStats(quantiles=bool(quantiles), track_variance=stddev).update(values)
+        return stats.as_dict(stddev, quantiles)
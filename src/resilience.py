@@ -0,0 +1,321 @@
+"""
+Client-side rate limiting and circuit breaking.
+"""
+
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket."""
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize token bucket.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to one second of tokens,
+                at least 1)
+            clock: Monotonic time source in seconds
+        
+        Raises:
+            ValueError: If rate is not positive or capacity is below 1
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        capacity = max(1.0, rate) if capacity is None else capacity
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+    
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens now, or return how long to wait until they are available."""
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot take {tokens} tokens from a bucket of {self.capacity}")
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+    
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """
+        Take tokens without waiting.
+        
+        Args:
+            tokens: Number of tokens to take
+        
+        Returns:
+            True if the tokens were taken
+        
+        Raises:
+            ValueError: If more tokens are requested than the capacity
+        """
+        return self._reserve(tokens) == 0.0
+    
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens, waiting for them if necessary.
+        
+        Args:
+            tokens: Number of tokens to take
+            timeout: Maximum seconds to wait (None waits as long as needed)
+        
+        Returns:
+            True if the tokens were taken, False if the wait would exceed
+            the timeout
+        
+        Raises:
+            ValueError: If more tokens are requested than the capacity
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            wait = self._reserve(tokens)
+            if wait == 0.0:
+                return True
+            if deadline is not None and self._clock() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter keyed by host or by endpoint.
+    
+    Each distinct host (``scope="host"``) or host plus path
+    (``scope="endpoint"``) gets its own bucket.
+    """
+    
+    SCOPES = ("host", "endpoint")
+    
+    def __init__(self, rate: float, burst: Optional[float] = None, scope: str = "host",
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            rate: Requests per second allowed for each key
+            burst: Maximum burst size per key (at least 1)
+            scope: "host" or "endpoint"
+            clock: Monotonic time source in seconds
+        
+        Raises:
+            ValueError: If the scope is unknown or rate/burst is invalid
+        """
+        if scope not in self.SCOPES:
+            raise ValueError(f"Unknown rate limit scope: {scope}")
+        TokenBucket(rate, burst)  # Validate arguments up front.
+        self.rate = rate
+        self.burst = burst
+        self.scope = scope
+        self._clock = clock
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+    
+    def key(self, url: str) -> str:
+        """
+        Get the bucket key for a URL.
+        
+        Args:
+            url: Request URL
+        
+        Returns:
+            Host, or host and path, depending on the scope
+        """
+        parts = urlsplit(url)
+        if self.scope == "host":
+            return parts.netloc
+        return parts.netloc + parts.path
+    
+    def bucket(self, url: str) -> TokenBucket:
+        """
+        Get the bucket that limits a URL.
+        
+        Args:
+            url: Request URL
+        
+        Returns:
+            Token bucket for the URL's key
+        """
+        key = self.key(url)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(
+                    key, TokenBucket(self.rate, self.burst, self._clock)
+                )
+        return bucket
+    
+    def acquire(self, url: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for permission to send a request.
+        
+        Args:
+            url: Request URL
+            timeout: Maximum seconds to wait (None waits as long as needed)
+        
+        Returns:
+            True if the request may be sent, False if the wait would exceed
+            the timeout
+        """
+        return self.bucket(url).acquire(1, timeout)
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker with a rolling error-rate window.
+    
+    While closed, calls pass and their outcomes are recorded. When at least
+    ``min_calls`` calls in the last ``window`` seconds have an error rate
+    of ``error_threshold`` or more, the circuit opens and calls are
+    rejected immediately. After ``reset_timeout`` seconds it goes half-open
+    and lets ``half_open_calls`` trial calls through: a success closes the
+    circuit, a failure opens it again.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(
+        self,
+        error_threshold: float = 0.5,
+        min_calls: int = 10,
+        window: float = 10.0,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize circuit breaker.
+        
+        Args:
+            error_threshold: Error rate (0-1) that opens the circuit
+            min_calls: Minimum calls in the window before it can open
+            window: Length of the rolling window in seconds
+            reset_timeout: Seconds to stay open before trying again
+            half_open_calls: Trial calls allowed while half-open
+            clock: Monotonic time source in seconds
+        
+        Raises:
+            ValueError: If error_threshold is not in (0, 1]
+        """
+        if not 0 < error_threshold <= 1:
+            raise ValueError("error_threshold must be in (0, 1]")
+        self.error_threshold = error_threshold
+        self.min_calls = min_calls
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._calls: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+    
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            self._update_state(self._clock())
+            return self._state
+    
+    def _update_state(self, now: float):
+        """Move from open to half-open once the reset timeout has passed."""
+        if self._state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trials = 0
+    
+    def _trim(self, now: float):
+        """Drop outcomes that have left the rolling window."""
+        calls = self._calls
+        cutoff = now - self.window
+        while calls and calls[0][0] < cutoff:
+            if calls.popleft()[1]:
+                self._failures -= 1
+    
+    def _open(self, now: float):
+        """Open the circuit and start the reset timeout."""
+        self._state = self.OPEN
+        self._opened_at = now
+        self._calls.clear()
+        self._failures = 0
+    
+    def allow(self) -> bool:
+        """
+        Check whether a call may proceed.
+        
+        Returns:
+            False if the circuit is open (or half-open with its trial calls
+            used up)
+        """
+        with self._lock:
+            self._update_state(self._clock())
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._trials < self.half_open_calls:
+                self._trials += 1
+                return True
+            return False
+    
+    def release(self):
+        """
+        Return a trial slot taken by ``allow`` for a call that was never sent.
+        
+        Use this when something other than the protected service, such as a
+        rate limiter, stops the call; otherwise a half-open circuit would
+        run out of trials without ever recording an outcome.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+    
+    def record_success(self):
+        """Record a successful call."""
+        with self._lock:
+            now = self._clock()
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._calls.clear()
+                self._failures = 0
+                return
+            self._trim(now)
+            self._calls.append((now, False))
+    
+    def record_failure(self):
+        """Record a failed call."""
+        with self._lock:
+            now = self._clock()
+            if self._state == self.HALF_OPEN:
+                self._open(now)
+                return
+            if self._state == self.OPEN:
+                return
+            self._trim(now)
+            self._calls.append((now, True))
+            self._failures += 1
+            total = len(self._calls)
+            if total >= self.min_calls and self._failures / total >= self.error_threshold:
+                self._open(now)
+    
+    def reset(self):
+        """Close the circuit and forget recorded calls."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._calls.clear()
+            self._failures = 0
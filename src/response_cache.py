@@ -0,0 +1,203 @@
+"""
+HTTP response caching for APIClient.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import time
+
+from .cache import Cache
+
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Parse a Cache-Control header.
+    
+    Args:
+        value: Header value, e.g. "public, max-age=60"
+    
+    Returns:
+        Dictionary of lower-cased directives to their values (None for
+        directives without a value)
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+class CachedResponse:
+    """A stored response body with its validator and freshness deadline."""
+    
+    __slots__ = ("content", "etag", "fresh_until")
+    
+    def __init__(self, content: bytes, etag: Optional[str], fresh_until: float):
+        """
+        Initialize cached response.
+        
+        Args:
+            content: Raw response body
+            etag: ETag validator, if the server sent one
+            fresh_until: Monotonic time until which no revalidation is needed
+        """
+        self.content = content
+        self.etag = etag
+        self.fresh_until = fresh_until
+    
+    def is_fresh(self) -> bool:
+        """
+        Check whether the response can be used without revalidation.
+        
+        Returns:
+            True if the response is still fresh
+        """
+        return time.monotonic() < self.fresh_until
+
+
+class ResponseCache:
+    """
+    Cache for GET responses honouring Cache-Control and ETag.
+    
+    Responses are stored in a src.cache.Cache keyed by the normalized URL,
+    the sorted query parameters and the values of ``vary_headers``. Fresh
+    responses (per ``max-age``) are served without a request; stale ones
+    with an ETag are revalidated with ``If-None-Match`` so an unchanged
+    resource costs only a 304.
+    """
+    
+    def __init__(
+        self,
+        cache: Optional[Cache] = None,
+        vary_headers: Iterable[str] = ("Accept", "Authorization"),
+        retain: int = 3600,
+    ):
+        """
+        Initialize response cache.
+        
+        Args:
+            cache: Storage backend (defaults to an LRU Cache of 1024 entries)
+            vary_headers: Request headers whose values are part of the key
+            retain: Seconds to keep a response with an ETag after it goes
+                stale, so it can still be revalidated
+        """
+        self.cache = cache if cache is not None else Cache(max_entries=1024)
+        self.vary_headers = tuple(name.lower() for name in vary_headers)
+        self.retain = retain
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.bytes_saved = 0
+    
+    def key(self, url: str, params: Optional[Dict] = None,
+            headers: Optional[Dict[str, str]] = None) -> str:
+        """
+        Build the cache key for a GET request.
+        
+        Args:
+            url: Full request URL
+            params: Query parameters
+            headers: Request headers
+        
+        Returns:
+            Cache key
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+            host = f"{host}:{parts.port}"
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        for name, value in (params or {}).items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            query.extend((str(name), str(item)) for item in values)
+        query.sort()
+        normalized = urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+        lowered = {name.lower(): value for name, value in (headers or {}).items()}
+        vary = "|".join(f"{name}={lowered.get(name, '')}" for name in self.vary_headers)
+        return f"GET {normalized} {vary}"
+    
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        """
+        Get a stored response.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Stored response (fresh or stale) or None
+        """
+        return self.cache.get(key)
+    
+    def store(self, key: str, content: bytes, headers: Dict[str, str]) -> bool:
+        """
+        Store a 200 response if its headers allow it.
+        
+        Args:
+            key: Cache key
+            content: Raw response body
+            headers: Response headers
+        
+        Returns:
+            True if the response was stored
+        """
+        headers = {name.lower(): value for name, value in headers.items()}
+        directives = parse_cache_control(headers.get("cache-control"))
+        etag = headers.get("etag")
+        if "no-store" in directives:
+            self.cache.delete(key)
+            return False
+        max_age = 0
+        if "no-cache" not in directives:
+            try:
+                max_age = max(0, int(directives.get("max-age") or 0))
+            except ValueError:
+                max_age = 0
+        if max_age == 0 and etag is None:
+            return False
+        lifetime = max_age + (self.retain if etag else 0)
+        self.cache.set(key, CachedResponse(content, etag, time.monotonic() + max_age), ttl=lifetime)
+        return True
+    
+    def refresh(self, key: str, cached: CachedResponse, headers: Dict[str, str]):
+        """
+        Extend a stored response after a 304 Not Modified.
+        
+        Args:
+            key: Cache key
+            cached: The response that was revalidated
+            headers: Headers of the 304 response
+        """
+        self.revalidations += 1
+        self.bytes_saved += len(cached.content)
+        merged = {"etag": cached.etag}
+        merged.update((name.lower(), value) for name, value in headers.items())
+        self.store(key, cached.content, merged)
+    
+    def record_hit(self, cached: CachedResponse):
+        """
+        Count a response served from cache without a request.
+        
+        Args:
+            cached: The response that was served
+        """
+        self.hits += 1
+        self.bytes_saved += len(cached.content)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get response cache counters.
+        
+        Returns:
+            Dictionary with hits, misses, revalidations and bytes_saved
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "bytes_saved": self.bytes_saved,
+        }
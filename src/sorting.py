@@ -0,0 +1,338 @@
+"""
+Multi-key, external and top-k sorting of records.
+"""
+
+from heapq import merge, nlargest, nsmallest
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import math
+import pickle
+import tempfile
+
+
+SortKeys = Union[str, Sequence[Union[str, Tuple[str, str]]]]
+
+DIRECTIONS = ("asc", "desc")
+MISSING_POSITIONS = ("first", "last", "error")
+DEFAULT_RUN_SIZE = 100_000
+
+
+class _Descending:
+    """Wrapper that inverts the ordering of the wrapped value."""
+    
+    __slots__ = ("value",)
+    
+    def __init__(self, value: Any):
+        self.value = value
+    
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+    
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+def normalize_keys(keys: SortKeys, reverse: bool = False) -> List[Tuple[str, bool]]:
+    """
+    Normalize a sort specification.
+    
+    Args:
+        keys: A field name, a (field, "asc"/"desc") pair, or a sequence
+            of field names and such pairs (a boolean direction means
+            descending, as in the normalized form)
+        reverse: Flip every direction
+    
+    Returns:
+        List of (field, descending) pairs
+    
+    Raises:
+        ValueError: If the specification is empty or a direction is unknown
+    """
+    if isinstance(keys, str) or (
+        isinstance(keys, tuple) and len(keys) == 2 and isinstance(keys[0], str)
+        and (keys[1] in DIRECTIONS or isinstance(keys[1], bool))
+    ):
+        keys = [keys]
+    spec = []
+    for item in keys:
+        field, direction = (item, "asc") if isinstance(item, str) else item
+        if isinstance(direction, bool):
+            direction = "desc" if direction else "asc"
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown sort direction: {direction}")
+        spec.append((field, (direction == "desc") != reverse))
+    if not spec:
+        raise ValueError("At least one sort key is required")
+    return spec
+
+
+def _rank(value: Any) -> Tuple:
+    """
+    Order values of mixed types: numbers, then strings, then anything else.
+    
+    Values of other types are ordered by type name and then by their own
+    ordering where they have one.
+    """
+    if isinstance(value, (int, float)):
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value)
+    return (2, type(value).__name__, value)
+
+
+def _is_missing(value: Any) -> bool:
+    """Treat None and NaN as missing."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def value_key(descending: bool = False, missing: str = "last") -> Callable[[Any], Tuple]:
+    """
+    Build a sort key for single field values.
+    
+    Args:
+        descending: Sort in descending order
+        missing: Where None/NaN values go: "first", "last" or "error"
+    
+    Returns:
+        Function mapping a value to a comparable key
+    
+    Raises:
+        ValueError: If ``missing`` is unknown
+    """
+    if missing not in MISSING_POSITIONS:
+        raise ValueError(f"Unknown missing position: {missing}")
+    missing_flag = 0 if missing == "first" else 1
+    
+    def key(value: Any) -> Tuple:
+        if _is_missing(value):
+            if missing == "error":
+                raise ValueError("Cannot sort on a missing value")
+            return (missing_flag,)
+        ranked = _rank(value)
+        return (1 - missing_flag, _Descending(ranked) if descending else ranked)
+    
+    return key
+
+
+def single_key(descending: bool = False,
+               missing: str = "last") -> Tuple[Callable[[Any], Tuple], bool]:
+    """
+    Build a key and reverse flag for sorting on one field with ``sorted``.
+    
+    Sorting with ``reverse=True`` instead of wrapping values keeps
+    single-key sorts as fast as plain ones; ``sorted`` stays stable when
+    reversed.
+    
+    Args:
+        descending: Sort in descending order
+        missing: Where None/NaN values go: "first", "last" or "error"
+    
+    Returns:
+        (key function, reverse flag) pair
+    """
+    if descending and missing != "error":
+        missing = "first" if missing == "last" else "last"
+    return value_key(False, missing), descending
+
+
+def _fast_order(values: List[Any], descending: bool, missing: str,
+                k: Optional[int] = None) -> Optional[List[int]]:
+    """
+    Order row positions by plain comparison when the values allow it.
+    
+    Works when the present values are all numbers (without NaN) or all
+    strings; missing values are set aside and placed afterwards. Returns
+    None when the general key is needed.
+    """
+    types = set(map(type, values))
+    has_missing = type(None) in types
+    types.discard(type(None))
+    if not (types <= {int, float, bool} or types == {str}):
+        return None
+    if float in types and any(value != value for value in values):
+        return None
+    if has_missing and missing == "error":
+        raise ValueError("Cannot sort on a missing value")
+    if has_missing:
+        present = [index for index, value in enumerate(values) if value is not None]
+        absent = [index for index, value in enumerate(values) if value is None]
+    else:
+        present, absent = range(len(values)), []
+    key = values.__getitem__
+    if k is None:
+        ordered = sorted(present, key=key, reverse=descending)
+    elif descending:
+        ordered = nlargest(k, present, key=key)
+    else:
+        ordered = nsmallest(k, present, key=key)
+    result = ordered + absent if missing == "last" else absent + ordered
+    return result if k is None else result[:k]
+
+
+def sort_order(values: List[Any], descending: bool = False, missing: str = "last",
+               k: Optional[int] = None) -> List[int]:
+    """
+    Get the stable sort order of a column of values.
+    
+    Homogeneous numbers or strings are compared directly; mixed types and
+    NaN go through ``value_key``.
+    
+    Args:
+        values: Values to order (None marks a missing value)
+        descending: Sort in descending order
+        missing: Where None/NaN values go: "first", "last" or "error"
+        k: Only return the first k positions, found in O(n log k)
+    
+    Returns:
+        Row positions in sorted order
+    """
+    if missing not in MISSING_POSITIONS:
+        raise ValueError(f"Unknown missing position: {missing}")
+    order = _fast_order(values, descending, missing, k)
+    if order is not None:
+        return order
+    key, flip = single_key(descending, missing)
+    keys = list(map(key, values))
+    if k is None:
+        return sorted(range(len(values)), key=keys.__getitem__, reverse=flip)
+    if flip:
+        return nlargest(k, range(len(values)), key=keys.__getitem__)
+    return nsmallest(k, range(len(values)), key=keys.__getitem__)
+
+
+def record_key(keys: SortKeys, reverse: bool = False,
+               missing: str = "last") -> Callable[[Dict], Tuple]:
+    """
+    Build a sort key for records.
+    
+    Missing fields, None and NaN are placed according to ``missing`` in
+    both directions, and values of different types are ordered numbers,
+    then strings, then other types, instead of raising TypeError.
+    
+    Args:
+        keys: Sort specification (see ``normalize_keys``)
+        reverse: Flip every direction
+        missing: Where missing values go: "first", "last" or "error"
+    
+    Returns:
+        Function mapping a record to a comparable key
+    """
+    fields = [(field, value_key(descending, missing))
+              for field, descending in normalize_keys(keys, reverse)]
+    if len(fields) == 1:
+        field, key = fields[0]
+        return lambda record: key(record.get(field))
+    return lambda record: tuple(key(record.get(field)) for field, key in fields)
+
+
+def sort_records(data: Iterable[Dict], keys: SortKeys, reverse: bool = False,
+                 missing: str = "last") -> List[Dict]:
+    """
+    Stable in-memory sort of records.
+    
+    Args:
+        data: Records to sort
+        keys: Sort specification (see ``normalize_keys``)
+        reverse: Flip every direction
+        missing: Where missing values go: "first", "last" or "error"
+    
+    Returns:
+        Sorted list of records
+    """
+    spec = normalize_keys(keys, reverse)
+    if len(spec) == 1:
+        field, descending = spec[0]
+        data = data if isinstance(data, list) else list(data)
+        order = sort_order([record.get(field) for record in data], descending, missing)
+        return [data[index] for index in order]
+    return sorted(data, key=record_key(spec, missing=missing))
+
+
+def _write_run(rows: List[Dict], directory: Optional[str]):
+    """Spill a sorted run to a temporary file."""
+    handle = tempfile.TemporaryFile(dir=directory)
+    for row in rows:
+        pickle.dump(row, handle, pickle.HIGHEST_PROTOCOL)
+    handle.seek(0)
+    return handle
+
+
+def _read_run(handle) -> Iterator[Dict]:
+    """Stream a spilled run back, closing its file when done."""
+    try:
+        while True:
+            try:
+                yield pickle.load(handle)
+            except EOFError:
+                return
+    finally:
+        handle.close()
+
+
+def external_sort(data: Iterable[Dict], keys: SortKeys, reverse: bool = False,
+                  missing: str = "last", run_size: int = DEFAULT_RUN_SIZE,
+                  spill_dir: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Sort records that may not fit in memory.
+    
+    The input is read in runs of ``run_size`` records; each run is sorted
+    and spilled to a temporary file, and the runs are then streamed
+    through a k-way merge. Input that fits in one run is sorted in memory
+    without touching disk. The sort is stable.
+    
+    Args:
+        data: Records to sort
+        keys: Sort specification (see ``normalize_keys``)
+        reverse: Flip every direction
+        missing: Where missing values go: "first", "last" or "error"
+        run_size: Records held in memory at once
+        spill_dir: Directory for run files (defaults to the system
+            temporary directory)
+    
+    Returns:
+        Iterator over the sorted records
+    
+    Raises:
+        ValueError: If run_size is below 1
+    """
+    if run_size < 1:
+        raise ValueError("run_size must be at least 1")
+    key = record_key(keys, reverse, missing)
+    rows = iter(data)
+    first = sorted(islice(rows, run_size), key=key)
+    if len(first) < run_size:
+        return iter(first)
+    runs = [_write_run(first, spill_dir)]
+    del first
+    while True:
+        chunk = sorted(islice(rows, run_size), key=key)
+        if not chunk:
+            break
+        runs.append(_write_run(chunk, spill_dir))
+    return merge(*(_read_run(run) for run in runs), key=key)
+
+
+def top_k(data: Iterable[Dict], keys: SortKeys, k: int, reverse: bool = False,
+          missing: str = "last") -> List[Dict]:
+    """
+    Get the first k records of the sort order in O(n log k).
+    
+    Args:
+        data: Records to rank
+        keys: Sort specification (see ``normalize_keys``)
+        k: Number of records to return
+        reverse: Flip every direction
+        missing: Where missing values go: "first", "last" or "error"
+    
+    Returns:
+        Up to k records, in sorted order
+    """
+    if k <= 0:
+        return []
+    spec = normalize_keys(keys, reverse)
+    if len(spec) == 1:
+        field, descending = spec[0]
+        data = data if isinstance(data, list) else list(data)
+        order = sort_order([record.get(field) for record in data], descending, missing, k)
+        return [data[index] for index in order]
+    return nsmallest(k, data, key=record_key(spec, missing=missing))
@@ -0,0 +1,370 @@
+"""
+Mergeable one-pass statistics.
+"""
+
+from collections.abc import Sequence as SequenceABC
+from itertools import islice, repeat
+from typing import Dict, Iterable, List, Optional, Sequence
+from operator import itemgetter
+import math
+import operator
+
+
+UPDATE_CHUNK_SIZE = 4096
+
+
+class TDigest:
+    """
+    Merging t-digest for approximate quantiles.
+    
+    Values are summarized as weighted centroids that are small near the
+    tails and larger in the middle, so extreme quantiles stay accurate
+    while memory is bounded by roughly ``compression`` centroids. Digests
+    built on separate chunks can be merged.
+    """
+    
+    def __init__(self, compression: float = 100):
+        """
+        Initialize t-digest.
+        
+        Args:
+            compression: Accuracy/size trade-off; higher keeps more centroids
+        
+        Raises:
+            ValueError: If compression is not positive
+        """
+        if compression <= 0:
+            raise ValueError("compression must be positive")
+        self.compression = compression
+        self._centroids: List[List[float]] = []
+        self._buffer: List[List[float]] = []
+        self._weight = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def __len__(self) -> int:
+        """Return the number of values added."""
+        return int(self._weight)
+    
+    def add(self, value: float, weight: float = 1):
+        """
+        Add a value.
+        
+        Args:
+            value: Value to add
+            weight: Weight of the value
+        """
+        self._buffer.append([value, weight])
+        self._weight += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) > 5 * self.compression:
+            self._compress()
+    
+    def update(self, values: Iterable[float]):
+        """
+        Add several values.
+        
+        Args:
+            values: Values to add
+        """
+        values = list(values)
+        if not values:
+            return
+        self._buffer.extend([value, 1] for value in values)
+        self._weight += len(values)
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+        if len(self._buffer) > 5 * self.compression:
+            self._compress()
+    
+    def merge(self, other: "TDigest") -> "TDigest":
+        """
+        Fold another digest into this one.
+        
+        Args:
+            other: Digest to merge
+        
+        Returns:
+            This digest
+        """
+        other._compress()
+        self._buffer.extend([mean, weight] for mean, weight in other._centroids)
+        self._weight += other._weight
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+    
+    def _weight_limit(self, cumulative: float) -> float:
+        """
+        Cumulative weight a centroid starting at ``cumulative`` may reach.
+        
+        Uses the k2 scale function, k(q) = compression / Z * log(q / (1 - q))
+        with Z = 4 log(n / compression) + 24: a centroid may span at most
+        one unit of k, so centroids shrink towards single values at both
+        tails.
+        """
+        total = self._weight
+        q = cumulative / total
+        if q <= 0:
+            return 0.0
+        if q >= 1:
+            return total
+        normalizer = self.compression / (4 * math.log(max(total / self.compression, 1)) + 24)
+        return total * q / (q + (1 - q) * math.exp(-1 / normalizer))
+    
+    def _compress(self):
+        """Merge buffered values into the centroid list."""
+        if not self._buffer:
+            return
+        items = self._centroids + self._buffer
+        items.sort(key=itemgetter(0))
+        self._buffer = []
+        current = list(items[0])
+        merged = [current]
+        cumulative = 0.0
+        limit = self._weight_limit(cumulative)
+        for mean, weight in items[1:]:
+            proposed = current[1] + weight
+            if cumulative + proposed <= limit:
+                current[0] += (mean - current[0]) * weight / proposed
+                current[1] = proposed
+            else:
+                cumulative += current[1]
+                limit = self._weight_limit(cumulative)
+                current = [mean, weight]
+                merged.append(current)
+        self._centroids = merged
+    
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+        
+        Args:
+            q: Quantile in [0, 1]
+        
+        Returns:
+            Estimated value at the quantile
+        
+        Raises:
+            ValueError: If q is out of range or the digest is empty
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be in [0, 1]")
+        if not self._weight:
+            raise ValueError("Cannot take a quantile of an empty digest")
+        self._compress()
+        centroids = self._centroids
+        if len(centroids) == 1:
+            return centroids[0][0]
+        target = q * self._weight
+        first_mean, first_weight = centroids[0]
+        if target < first_weight / 2:
+            return self.min + (first_mean - self.min) * target / (first_weight / 2)
+        cumulative = 0.0
+        for (mean, weight), (next_mean, next_weight) in zip(centroids, centroids[1:]):
+            left = cumulative + weight / 2
+            right = cumulative + weight + next_weight / 2
+            if target <= right:
+                return mean + (next_mean - mean) * (target - left) / (right - left)
+            cumulative += weight
+        last_mean, last_weight = centroids[-1]
+        tail = self._weight - (cumulative + last_weight / 2)
+        if tail <= 0:
+            return last_mean
+        return last_mean + (self.max - last_mean) * (target - (self._weight - tail)) / tail
+
+
+class RunningStats:
+    """
+    One-pass count, sum, mean, variance, min and max.
+    
+    The mean and variance use Welford's update, and two accumulators
+    built on separate chunks (or in separate processes) combine exactly
+    with ``merge`` using Chan's formula, so per-shard results never need
+    the data re-read. With ``quantiles=True`` a ``TDigest`` is kept for
+    approximate quantiles as well. Callers that only need count, sum and
+    extremes can pass ``track_variance=False`` to skip the extra pass
+    ``update`` makes over each chunk.
+    """
+    
+    def __init__(self, quantiles: bool = False, compression: float = 100,
+                 track_variance: bool = True):
+        """
+        Initialize running statistics.
+        
+        Args:
+            quantiles: Also track a t-digest for quantile estimates
+            compression: t-digest compression
+            track_variance: Maintain the sum of squared deviations needed
+                for variance and stddev
+        """
+        self.track_variance = track_variance
+        self.count = 0
+        self.sum = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.digest = TDigest(compression) if quantiles else None
+    
+    def push(self, value: float):
+        """
+        Add one value.
+        
+        Args:
+            value: Value to add
+        """
+        self.count += 1
+        self.sum += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.digest is not None:
+            self.digest.add(value)
+    
+    def update(self, values: Iterable[float]) -> "RunningStats":
+        """
+        Add values.
+        
+        Values are taken ``UPDATE_CHUNK_SIZE`` at a time; each chunk is
+        summarized with built-in reductions and then merged, which is much
+        faster than pushing values one by one. Any iterable, including a
+        generator, is consumed in a single pass with memory bounded by the
+        chunk size.
+        
+        Args:
+            values: Values to add
+        
+        Returns:
+            This accumulator
+        """
+        if isinstance(values, SequenceABC):
+            chunks = (values[start:start + UPDATE_CHUNK_SIZE]
+                      for start in range(0, len(values), UPDATE_CHUNK_SIZE))
+        else:
+            iterator = iter(values)
+            chunks = iter(lambda: list(islice(iterator, UPDATE_CHUNK_SIZE)), [])
+        for chunk in chunks:
+            self._update_chunk(chunk)
+        return self
+    
+    def _update_chunk(self, values: Sequence[float]):
+        """Summarize a non-empty chunk of values and merge it in."""
+        chunk = RunningStats(track_variance=self.track_variance)
+        chunk.count = len(values)
+        chunk.sum = sum(values)
+        chunk.mean = chunk.sum / chunk.count
+        if self.track_variance:
+            deviations = list(map(operator.sub, values, repeat(chunk.mean)))
+            chunk._m2 = sum(map(operator.mul, deviations, deviations))
+        chunk.min = min(values)
+        chunk.max = max(values)
+        if self.digest is not None:
+            self.digest.update(values)
+        self._merge_moments(chunk)
+    
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """
+        Fold another accumulator into this one.
+        
+        Args:
+            other: Accumulator built on other data
+        
+        Returns:
+            This accumulator
+        """
+        if self.digest is not None and other.digest is not None:
+            self.digest.merge(other.digest)
+        return self._merge_moments(other)
+    
+    def _merge_moments(self, other: "RunningStats") -> "RunningStats":
+        """Combine count, sum, mean, M2, min and max with Chan's formula."""
+        self.track_variance = self.track_variance and other.track_variance
+        if not other.count:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.sum += other.sum
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+    
+    def _require_variance(self):
+        """Raise ValueError unless variance is being tracked."""
+        if not self.track_variance:
+            raise ValueError("Variance is not tracked; use RunningStats(track_variance=True)")
+    
+    @property
+    def variance(self) -> float:
+        """Population variance (0 when empty)."""
+        self._require_variance()
+        return self._m2 / self.count if self.count else 0.0
+    
+    @property
+    def sample_variance(self) -> float:
+        """Sample variance (0 with fewer than two values)."""
+        self._require_variance()
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    @property
+    def stddev(self) -> float:
+        """Population standard deviation."""
+        return math.sqrt(self.variance)
+    
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+        
+        Args:
+            q: Quantile in [0, 1]
+        
+        Returns:
+            Estimated value at the quantile
+        
+        Raises:
+            ValueError: If quantiles are not tracked or no values were added
+        """
+        if self.digest is None:
+            raise ValueError("Quantiles are not tracked; use RunningStats(quantiles=True)")
+        return self.digest.quantile(q)
+    
+    def as_dict(self, stddev: bool = False,
+                quantiles: Sequence[float] = ()) -> Dict[str, float]:
+        """
+        Summarize the accumulated values.
+        
+        Args:
+            stddev: Include "variance" and "stddev"
+            quantiles: Quantiles to include, keyed like "p50" or "p99.9"
+        
+        Returns:
+            Dictionary with count, sum, avg, min and max (all zero when
+            empty) plus the requested extras
+        """
+        if not self.count:
+            result = {"count": 0, "sum": 0, "avg": 0, "min": 0, "max": 0}
+        else:
+            result = {
+                "count": self.count,
+                "sum": self.sum,
+                "avg": self.sum / self.count,
+                "min": self.min,
+                "max": self.max,
+            }
+        if stddev:
+            result["variance"] = self.variance
+            result["stddev"] = self.stddev
+        for q in quantiles:
+            result[f"p{q * 100:g}"] = self.quantile(q) if self.count else 0
+        return result
@@ -0,0 +1,419 @@
+"""
+Columnar table backed by typed arrays.
+"""
+
+from array import array
+from collections import Counter
+from heapq import nsmallest
+from itertools import compress, repeat
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import math
+import operator
+
+from .sorting import SortKeys, normalize_keys, sort_order, value_key
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+class _Missing:
+    """Marker for a field that is absent from a record."""
+    
+    __slots__ = ()
+    
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+
+def _column(values: List[Any], use_numpy: bool):
+    """
+    Store a column of values compactly.
+    
+    Columns of plain ints (within int64) or plain floats become typed
+    arrays; anything else, including columns with missing fields, is kept
+    as Python objects (a list, or an object array with NumPy) so values
+    round-trip exactly.
+    """
+    types = set(map(type, values))
+    if types == {int}:
+        if INT64_MIN <= min(values) and max(values) <= INT64_MAX:
+            return np.array(values, dtype=np.int64) if use_numpy else array("q", values)
+    elif types == {float}:
+        return np.array(values, dtype=np.float64) if use_numpy else array("d", values)
+    if use_numpy:
+        return np.fromiter(values, dtype=object, count=len(values))
+    return values
+
+
+def _is_numpy(column) -> bool:
+    """Check whether a column is a NumPy array."""
+    return np is not None and isinstance(column, np.ndarray)
+
+
+def _has_nan(column) -> bool:
+    """Check whether a numeric column contains NaN."""
+    if _is_numpy(column):
+        return column.dtype.kind == "f" and bool(np.isnan(column).any())
+    return column.typecode == "d" and any(map(math.isnan, column))
+
+
+def _is_numeric(column) -> bool:
+    """Check whether a column holds only numbers with no missing fields."""
+    return isinstance(column, array) or (_is_numpy(column) and column.dtype != object)
+
+
+class Table:
+    """
+    Column-oriented dataset.
+    
+    Each field is stored as one column: an ``array.array`` for int and
+    float fields and a plain list otherwise, or NumPy arrays (numeric or
+    object dtype) when NumPy is installed and requested. Fields missing from a record are kept as
+    ``MISSING`` so ``to_records`` reproduces the input dictionaries.
+    Operations work a column at a time instead of looking fields up in
+    every record.
+    """
+    
+    def __init__(self, columns: Dict[str, Sequence], length: Optional[int] = None):
+        """
+        Initialize table.
+        
+        Args:
+            columns: Mapping of field name to column; all columns must have
+                the same length
+            length: Number of rows (required when there are no columns)
+        
+        Raises:
+            ValueError: If the columns differ in length
+        """
+        lengths = {len(column) for column in columns.values()}
+        if length is not None:
+            lengths.add(length)
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        self.columns = dict(columns)
+        self._length = lengths.pop() if lengths else 0
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], use_numpy: Optional[bool] = None) -> "Table":
+        """
+        Build a table from a list of dictionaries.
+        
+        Args:
+            records: Row dictionaries
+            use_numpy: Store numeric columns as NumPy arrays (defaults to
+                True when NumPy is installed)
+        
+        Returns:
+            New table
+        
+        Raises:
+            ImportError: If use_numpy is True but NumPy is not installed
+        """
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            raise ImportError("NumPy is required for use_numpy=True")
+        records = list(records)
+        names: Dict[str, None] = {}
+        for record in records:
+            for name in record:
+                names.setdefault(name)
+        columns = {
+            name: _column([record.get(name, MISSING) for record in records], use_numpy)
+            for name in names
+        }
+        return cls(columns, len(records))
+    
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List[Any]],
+                     use_numpy: Optional[bool] = None) -> "Table":
+        """
+        Build a table from lists of column values.
+        
+        Args:
+            columns: Field name to values, with ``MISSING`` for rows that
+                lack the field
+            use_numpy: Store numeric columns as NumPy arrays (defaults to
+                True when NumPy is installed)
+        
+        Returns:
+            New table
+        
+        Raises:
+            ImportError: If use_numpy is True but NumPy is not installed
+            ValueError: If the columns differ in length
+        """
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            raise ImportError("NumPy is required for use_numpy=True")
+        return cls({name: _column(values, use_numpy) for name, values in columns.items()})
+    
+    def to_records(self) -> List[Dict]:
+        """
+        Convert the table back to a list of dictionaries.
+        
+        Returns:
+            One dictionary per row, without fields that were missing
+        """
+        names = list(self.columns)
+        columns = [self._values(name) for name in names]
+        records = []
+        for row in zip(*columns) if columns else ((),) * self._length:
+            records.append({
+                name: value for name, value in zip(names, row) if value is not MISSING
+            })
+        return records
+    
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return self._length
+    
+    def __eq__(self, other: object) -> bool:
+        """Compare tables by their rows."""
+        if not isinstance(other, Table):
+            return NotImplemented
+        return self.to_records() == other.to_records()
+    
+    def __repr__(self) -> str:
+        return f"Table(rows={self._length}, columns={list(self.columns)})"
+    
+    def _values(self, name: str) -> Sequence:
+        """Get a column as Python values, or all MISSING if the field is unknown."""
+        column = self.columns.get(name)
+        if column is None:
+            return [MISSING] * self._length
+        return column.tolist() if _is_numpy(column) else column
+    
+    def column(self, name: str) -> List[Any]:
+        """
+        Get the values of a field.
+        
+        Args:
+            name: Field name
+        
+        Returns:
+            List of values, with None where the field is missing
+        """
+        return [None if value is MISSING else value for value in self._values(name)]
+    
+    def take(self, indices: Sequence[int]) -> "Table":
+        """
+        Select rows by position.
+        
+        Args:
+            indices: Row positions, in the order wanted
+        
+        Returns:
+            New table with the selected rows
+        """
+        columns = {}
+        for name, column in self.columns.items():
+            if _is_numpy(column):
+                columns[name] = column[np.asarray(indices, dtype=np.intp)]
+            elif isinstance(column, array):
+                columns[name] = array(column.typecode, map(column.__getitem__, indices))
+            else:
+                columns[name] = list(map(column.__getitem__, indices))
+        return Table(columns, len(indices))
+    
+    def _select(self, mask: Sequence[bool]) -> "Table":
+        """Keep the rows whose mask entry is true."""
+        columns = {}
+        for name, column in self.columns.items():
+            if _is_numpy(column):
+                columns[name] = column[np.asarray(mask, dtype=bool)]
+            elif isinstance(column, array):
+                columns[name] = array(column.typecode, compress(column, mask))
+            else:
+                columns[name] = list(compress(column, mask))
+        return Table(columns, None if columns else sum(mask))
+    
+    def filter_eq(self, key: str, value: Any) -> "Table":
+        """
+        Keep rows whose field equals a value.
+        
+        Args:
+            key: Field to compare
+            value: Value to match (None matches missing fields)
+        
+        Returns:
+            New table with the matching rows
+        """
+        column = self.columns.get(key)
+        if column is None:
+            return self.take(range(self._length) if value is None else [])
+        if _is_numeric(column) and _is_numpy(column):
+            if not isinstance(value, (int, float)):
+                return self.take([])
+            return self._select(column == value)
+        if _is_numpy(column) and isinstance(value, (str, int, float)):
+            return self._select(column == value)
+        if value is None:
+            return self._select([item is MISSING or item is None for item in column])
+        return self._select(list(map(operator.eq, column, repeat(value))))
+    
+    def _sort_keys(self, spec: List[Tuple[str, bool]], missing: str) -> List[Tuple]:
+        """Compute a comparable sort key for every row."""
+        columns = [list(map(value_key(descending, missing), self.column(field)))
+                   for field, descending in spec]
+        return columns[0] if len(columns) == 1 else list(zip(*columns))
+    
+    def sort(self, keys: SortKeys, reverse: bool = False, missing: str = "last") -> "Table":
+        """
+        Stable sort by one or more fields.
+        
+        Args:
+            keys: A field name, or a sequence of field names and
+                (field, "asc"/"desc") pairs
+            reverse: Flip every direction
+            missing: Where missing, None and NaN values go: "first",
+                "last" or "error"
+        
+        Returns:
+            New sorted table
+        """
+        spec = normalize_keys(keys, reverse)
+        n = self._length
+        if len(spec) == 1:
+            field, descending = spec[0]
+            column = self.columns.get(field)
+            if _is_numeric(column) and not _has_nan(column):
+                if _is_numpy(column):
+                    if descending:
+                        order = n - 1 - np.argsort(column[::-1], kind="stable")[::-1]
+                    else:
+                        order = np.argsort(column, kind="stable")
+                    return self.take(order)
+                values = column.tolist()
+                return self.take(sorted(range(n), key=values.__getitem__, reverse=descending))
+            return self.take(sort_order(self.column(field), descending, missing))
+        sort_keys = self._sort_keys(spec, missing)
+        return self.take(sorted(range(n), key=sort_keys.__getitem__))
+    
+    def top_k(self, keys: SortKeys, k: int, reverse: bool = False,
+              missing: str = "last") -> "Table":
+        """
+        Get the first k rows of the sort order in O(n log k).
+        
+        Args:
+            keys: Sort specification, as for ``sort``
+            k: Number of rows to return
+            reverse: Flip every direction
+            missing: Where missing, None and NaN values go
+        
+        Returns:
+            New table with up to k rows, in sorted order
+        """
+        spec = normalize_keys(keys, reverse)
+        if k <= 0:
+            return self.take([])
+        if len(spec) == 1:
+            field, descending = spec[0]
+            return self.take(sort_order(self.column(field), descending, missing, k))
+        sort_keys = self._sort_keys(spec, missing)
+        return self.take(nsmallest(k, range(self._length), key=sort_keys.__getitem__))
+    
+    def value_counts(self, key: str) -> Dict[Any, int]:
+        """
+        Count occurrences of each value of a field.
+        
+        Args:
+            key: Field to count
+        
+        Returns:
+            Dictionary of value to count (None counts missing fields)
+        """
+        counts = Counter(self._values(key))
+        if MISSING in counts:
+            missing = counts.pop(MISSING)
+            counts[None] = counts.get(None, 0) + missing
+        return dict(counts)
+    
+    def rename(self, mapping: Dict[str, str]) -> "Table":
+        """
+        Keep and rename fields; columns are shared, not copied.
+        
+        Args:
+            mapping: Old field name to new field name
+        
+        Returns:
+            New table with only the mapped fields
+        """
+        columns = {new: self.columns[old] for old, new in mapping.items() if old in self.columns}
+        return Table(columns, self._length)
+    
+    def merge(self, other: "Table", key: str) -> "Table":
+        """
+        Inner join with another table on a field.
+        
+        Each row is joined with every matching row of ``other`` and fields
+        of ``other`` take precedence.
+        
+        Args:
+            other: Right-hand table
+            key: Field to join on
+        
+        Returns:
+            New joined table
+        """
+        lookup: Dict[Any, List[int]] = {}
+        for index, value in enumerate(other._values(key)):
+            if value is not MISSING and value is not None:
+                lookup.setdefault(value, []).append(index)
+        left_rows, right_rows = [], []
+        for index, value in enumerate(self._values(key)):
+            matches = lookup.get(value) if value is not MISSING else None
+            if matches:
+                left_rows.extend([index] * len(matches))
+                right_rows.extend(matches)
+        left, right = self.take(left_rows), other.take(right_rows)
+        columns = dict(left.columns)
+        for name, column in right.columns.items():
+            if name in columns and not _is_numeric(column):
+                base = left._values(name)
+                values = [b if value is MISSING else value
+                          for b, value in zip(base, right._values(name))]
+                column = (np.fromiter(values, dtype=object, count=len(values))
+                          if _is_numpy(column) else values)
+            columns[name] = column
+        return Table(columns, len(left_rows))
+    
+    def statistics(self, key: str) -> Dict[str, float]:
+        """
+        Calculate count, sum, avg, min and max of the numeric values of a field.
+        
+        Args:
+            key: Field to summarize
+        
+        Returns:
+            Dictionary with statistics (all zero if there are no numbers)
+        """
+        column = self.columns.get(key)
+        if column is None or len(column) == 0:
+            return {"count": 0, "sum": 0, "avg": 0, "min": 0, "max": 0}
+        if _is_numeric(column) and _is_numpy(column):
+            low, high = column.min().item(), column.max().item()
+            count = len(column)
+            if column.dtype.kind == "i" and max(-low, high) * count > INT64_MAX:
+                # The int64 sum could wrap around; add exact Python ints instead.
+                total = sum(column.tolist())
+            else:
+                total = column.sum().item()
+        else:
+            if not isinstance(column, array):
+                column = [value for value in self._values(key) if isinstance(value, (int, float))]
+                if not column:
+                    return {"count": 0, "sum": 0, "avg": 0, "min": 0, "max": 0}
+            total, low, high, count = sum(column), min(column), max(column), len(column)
+        return {"count": count, "sum": total, "avg": total / count, "min": low, "max": high}
@@ -0,0 +1,83 @@
+"""
+Compiled per-record transform plans.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+
+Mapping = Union[Dict[str, str], Sequence[str]]
+Transform = Callable[[Dict], Dict]
+
+
+def mapping_pairs(mapping: Mapping) -> List[tuple]:
+    """Normalize a mapping or a list of fields to keep into (old, new) pairs."""
+    if isinstance(mapping, dict):
+        return list(mapping.items())
+    if isinstance(mapping, str):
+        return [(mapping, mapping)]
+    return [(field, field) for field in mapping]
+
+
+def compile_transform(mapping: Mapping, computed: Optional[Dict[str, Transform]] = None,
+                      casts: Optional[Dict[str, Callable[[Any], Any]]] = None) -> Transform:
+    """
+    Build a function applying a transform to one record.
+    
+    The mapping is turned into Python source once and compiled, so each
+    record costs a copy of a presized dictionary with the output keys and
+    one straight-line assignment per key, instead of a loop over the
+    mapping with membership tests. Records missing a mapped field fall
+    back to a checked path that drops it, as ``transform_data`` always
+    has.
+    
+    Args:
+        mapping: Dictionary mapping old keys to new keys, or a sequence of
+            keys to keep unchanged (a projection); unmapped keys are dropped
+        computed: New keys mapped to functions of the source record; they
+            are added after the mapped keys
+        casts: Output keys of the mapping mapped to a type or function
+            applied to their value (None values are left as they are)
+    
+    Returns:
+        Function from a source record to the transformed record
+    
+    Raises:
+        ValueError: If a cast names a key the mapping does not produce
+    """
+    pairs = mapping_pairs(mapping)
+    casts = casts or {}
+    unknown = set(casts) - {new for _, new in pairs}
+    if unknown:
+        raise ValueError(f"Casts for unmapped keys: {sorted(unknown)}")
+    namespace: Dict[str, Any] = {}
+    fast, checked = [], []
+    for old, new in pairs:
+        value = f"record[{old!r}]"
+        if new in casts:
+            name = f"_cast{len(namespace)}"
+            namespace[name] = casts[new]
+            value = f"(_value if (_value := {value}) is None else {name}(_value))"
+        fast.append(f"        result[{new!r}] = {value}")
+        checked.append(f"    if {old!r} in record:\n        result[{new!r}] = {value}")
+    namespace["_template"] = dict.fromkeys(new for _, new in pairs)
+    lines = [
+        "def _checked(record):",
+        "    result = {}",
+        *checked,
+        "    return result",
+        "def transform(record):",
+        "    result = _template.copy()",
+        "    try:",
+        *fast,
+        "        pass",
+        "    except KeyError:",
+        "        result = _checked(record)",
+    ]
+    for new, function in (computed or {}).items():
+        name = f"_computed{len(namespace)}"
+        namespace[name] = function
+        lines.append(f"    result[{new!r}] = {name}(record)")
+    lines.append("    return result")
+    exec(compile("\n".join(lines), "<transform>", "exec"), namespace)
+    return namespace["transform"]
+
@@ -0,0 +1,300 @@
+"""
+Materialized views kept up to date from inserted and deleted records.
+"""
+
+from collections import Counter
+from heapq import heapify, heappop, heappush
+from typing import Any, Dict, Iterable, List
+import math
+
+
+class MaterializedView:
+    """
+    Query result maintained incrementally.
+    
+    A view is built once from a dataset and then told about every record
+    inserted into or deleted from it; each change costs time proportional
+    to the records changed (O(delta)), never a rescan, and ``result`` is
+    read in O(1).
+    """
+    
+    def __init__(self, data: Iterable[Dict] = ()):
+        """
+        Initialize view.
+        
+        Args:
+            data: Records the view starts from
+        """
+        self.insert(data)
+    
+    def insert(self, records: Iterable[Dict]) -> "MaterializedView":
+        """
+        Apply inserted records.
+        
+        Args:
+            records: Records added to the dataset
+        
+        Returns:
+            This view
+        """
+        for record in records:
+            self._add(record)
+        return self
+    
+    def delete(self, records: Iterable[Dict]) -> "MaterializedView":
+        """
+        Apply deleted records.
+        
+        Args:
+            records: Records removed from the dataset; each must have been
+                inserted before
+        
+        Returns:
+            This view
+        
+        Raises:
+            ValueError: If a record was never inserted
+        """
+        for record in records:
+            self._remove(record)
+        return self
+    
+    def _add(self, record: Dict):
+        """Apply one inserted record."""
+        raise NotImplementedError
+    
+    def _remove(self, record: Dict):
+        """Apply one deleted record."""
+        raise NotImplementedError
+    
+    @property
+    def result(self) -> Any:
+        """Current query result."""
+        raise NotImplementedError
+
+
+class CountView(MaterializedView):
+    """Materialized ``DataProcessor.aggregate_data``: occurrences of a key's values."""
+    
+    def __init__(self, key: str, data: Iterable[Dict] = ()):
+        """
+        Initialize count view.
+        
+        Args:
+            key: Key to aggregate by
+            data: Records the view starts from
+        """
+        self.key = key
+        self._counts: Dict[Any, int] = {}
+        super().__init__(data)
+    
+    def _add(self, record: Dict):
+        value = record.get(self.key)
+        self._counts[value] = self._counts.get(value, 0) + 1
+    
+    def _remove(self, record: Dict):
+        value = record.get(self.key)
+        count = self._counts.get(value)
+        if not count:
+            raise ValueError(f"No record with {self.key}={value!r} to delete")
+        if count == 1:
+            del self._counts[value]
+        else:
+            self._counts[value] = count - 1
+    
+    @property
+    def result(self) -> Dict[Any, int]:
+        """
+        Counts by value, as ``aggregate_data`` returns them.
+        
+        This is the view's own dictionary; copy it before modifying it.
+        """
+        return self._counts
+
+
+class StatsView(MaterializedView):
+    """
+    Materialized ``DataProcessor.calculate_statistics`` for a numeric key.
+    
+    Count and mean are adjusted directly, the sum with Neumaier's
+    compensated summation so float totals do not drift over long runs of
+    inserts and deletes, and variance with Welford's update run forwards
+    for inserts and backwards for deletes. Minimum and maximum come from
+    heaps with lazy deletion over a multiset of the values, so deleting the
+    current extreme costs O(log n) amortized instead of a rescan. The heaps
+    are rebuilt from the live values once dead entries make them more than
+    twice as large. Quantiles are not supported because a t-digest cannot
+    forget values.
+    """
+    
+    def __init__(self, key: str, data: Iterable[Dict] = (), stddev: bool = False):
+        """
+        Initialize statistics view.
+        
+        Args:
+            key: Numeric key to calculate statistics for
+            data: Records the view starts from
+            stddev: Also include population "variance" and "stddev"
+        """
+        self.key = key
+        self.stddev = stddev
+        self.count = 0
+        self._sum = 0
+        self._compensation = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._values: Counter = Counter()
+        self._low: List[Any] = []
+        self._high: List[Any] = []
+        super().__init__(data)
+    
+    @property
+    def sum(self) -> Any:
+        """Sum of the values, exact for integers."""
+        return self._sum + self._compensation
+    
+    def _accumulate(self, value: Any):
+        """Add a value to the sum with Neumaier's compensation."""
+        total = self._sum + value
+        if abs(self._sum) >= abs(value):
+            self._compensation += (self._sum - total) + value
+        else:
+            self._compensation += (value - total) + self._sum
+        self._sum = total
+    
+    def _compact(self):
+        """Rebuild the heaps once dead entries dominate them."""
+        if max(len(self._low), len(self._high)) > 2 * len(self._values) + 16:
+            self._low = list(self._values)
+            heapify(self._low)
+            self._high = [-value for value in self._values]
+            heapify(self._high)
+    
+    def _number(self, record: Dict) -> Any:
+        """The record's value, or None if it is not counted."""
+        value = record.get(self.key)
+        return value if isinstance(value, (int, float)) else None
+    
+    def _add(self, record: Dict):
+        value = self._number(record)
+        if value is None:
+            return
+        self.count += 1
+        self._accumulate(value)
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+        self._values[value] += 1
+        if self._values[value] == 1:
+            heappush(self._low, value)
+            heappush(self._high, -value)
+            self._compact()
+    
+    def _remove(self, record: Dict):
+        value = self._number(record)
+        if value is None:
+            return
+        if not self._values.get(value):
+            raise ValueError(f"No record with {self.key}={value!r} to delete")
+        self._values[value] -= 1
+        if not self._values[value]:
+            del self._values[value]
+        self.count -= 1
+        if not self.count:
+            self._sum = self._compensation = 0
+            self._mean = self._m2 = 0.0
+        else:
+            self._accumulate(-value)
+            previous = self._mean
+            self._mean -= (value - previous) / self.count
+            self._m2 = max(self._m2 - (value - previous) * (value - self._mean), 0.0)
+        for heap, sign in ((self._low, 1), (self._high, -1)):
+            while heap and sign * heap[0] not in self._values:
+                heappop(heap)
+        self._compact()
+    
+    @property
+    def result(self) -> Dict[str, float]:
+        """Statistics with the keys ``calculate_statistics`` returns."""
+        if not self.count:
+            result = {"count": 0, "sum": 0, "avg": 0, "min": 0, "max": 0}
+        else:
+            result = {
+                "count": self.count,
+                "sum": self.sum,
+                "avg": self.sum / self.count,
+                "min": self._low[0],
+                "max": -self._high[0],
+            }
+        if self.stddev:
+            variance = self._m2 / self.count if self.count else 0.0
+            result["variance"] = variance
+            result["stddev"] = math.sqrt(variance)
+        return result
+
+
+class ViewRegistry:
+    """
+    Named views over one dataset, updated together.
+    
+    Register views once, then push each batch of inserted or deleted
+    records to the registry instead of to every view.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.views: Dict[str, MaterializedView] = {}
+    
+    def register(self, name: str, view: MaterializedView) -> MaterializedView:
+        """
+        Add a view, built over the dataset's current records.
+        
+        Args:
+            name: Name to read the view by
+            view: View to keep up to date
+        
+        Returns:
+            The view
+        """
+        self.views[name] = view
+        return view
+    
+    def insert(self, records: Iterable[Dict]):
+        """
+        Apply inserted records to every view.
+        
+        Args:
+            records: Records added to the dataset
+        """
+        records = list(records)
+        for view in self.views.values():
+            view.insert(records)
+    
+    def delete(self, records: Iterable[Dict]):
+        """
+        Apply deleted records to every view.
+        
+        Args:
+            records: Records removed from the dataset
+        
+        Raises:
+            ValueError: If a view was never told about a record
+        """
+        records = list(records)
+        for view in self.views.values():
+            view.delete(records)
+    
+    def result(self, name: str) -> Any:
+        """
+        Read a view's current result.
+        
+        Args:
+            name: Registered view name
+        
+        Returns:
+            The view's result
+        
+        Raises:
+            KeyError: If no view has that name
+        """
+        return self.views[name].result
@@ -0,0 +1,14 @@
+"""
+Shared test fixtures.
+"""
+
+import pytest
+from tests.http_server import LocalHTTPServer
+
+
+@pytest.fixture
+def http_server():
+    """Run a local HTTP server for the duration of a test."""
+    server = LocalHTTPServer()
+    yield server
+    server.close()
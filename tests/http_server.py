@@ -0,0 +1,137 @@
+"""
+Local stand-in HTTP server for API client tests and benchmarks.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+
+
+class Request:
+    """A request received by the local server."""
+    
+    def __init__(self, method: str, path: str, query: Dict[str, str], headers: Dict[str, str],
+                 body: bytes):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+    
+    def json(self) -> Any:
+        """Decode the request body as JSON."""
+        return json.loads(self.body) if self.body else None
+
+
+Body = Union[bytes, str, dict, list, Iterable[bytes], None]
+Handler = Callable[[Request], Tuple[int, Dict[str, str], Body]]
+
+
+def echo(request: Request) -> Tuple[int, Dict[str, str], Body]:
+    """Default handler: describe the request back as JSON."""
+    return 200, {}, {
+        "status": "success",
+        "method": request.method,
+        "path": request.path,
+        "params": request.query,
+        "data": request.json() or {},
+    }
+
+
+class LocalHTTPServer:
+    """
+    Threaded HTTP/1.1 server with keep-alive and pluggable routes.
+    
+    Routes map (method, path) to a handler returning (status, headers,
+    body). Dict and list bodies are sent as JSON; iterables of bytes are
+    sent with chunked transfer encoding.
+    """
+    
+    def __init__(self):
+        """Start the server on a free localhost port."""
+        self.routes: Dict[Tuple[str, str], Handler] = {}
+        self.requests = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        owner = self
+        
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+            
+            def setup(self):
+                super().setup()
+                with owner._lock:
+                    owner.connections += 1
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def _handle(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                request = Request(
+                    self.command,
+                    parts.path,
+                    dict(parse_qsl(parts.query)),
+                    dict(self.headers.items()),
+                    self.rfile.read(length) if length else b"",
+                )
+                with owner._lock:
+                    owner.requests.append(request)
+                handler = owner.routes.get((self.command, parts.path), echo)
+                status, headers, body = handler(request)
+                self._respond(status, headers, body)
+            
+            def _respond(self, status: int, headers: Dict[str, str], body: Body):
+                self.send_response(status)
+                headers = dict(headers)
+                if isinstance(body, (dict, list)):
+                    body = json.dumps(body).encode()
+                    headers.setdefault("Content-Type", "application/json")
+                elif isinstance(body, str):
+                    body = body.encode()
+                elif body is None:
+                    body = b""
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if isinstance(body, bytes):
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for chunk in body:
+                    if chunk:
+                        self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                        self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+            
+            do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_HEAD = _handle
+        
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.01,), daemon=True
+        )
+        self._thread.start()
+        host, port = self._server.server_address
+        self.base_url = f"http://{host}:{port}"
+    
+    def route(self, method: str, path: str, handler: Optional[Handler] = None, *,
+              status: int = 200, body: Body = None, headers: Optional[Dict[str, str]] = None):
+        """
+        Register a handler, or a fixed response, for a method and path.
+        """
+        if handler is None:
+            def handler(request, status=status, body=body, headers=headers or {}):
+                return status, headers, body
+        self.routes[(method, path)] = handler
+    
+    def close(self):
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
@@ -2,42 +2,55 @@
 Tests for the APIClient class.
 """
 
+import json
+import time
 import pytest
-from src.api_client import APIClient
+import requests
+from src.api_client import APIClient, APIError
 
 
 class TestAPIClient:
     """Test suite for APIClient class."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.client = APIClient("https://api.example.com")
+    @pytest.fixture(autouse=True)
+    def setup_server(self, http_server):
+        """Set up a client against the local test server."""
+        self.server = http_server
+        self.client = APIClient(http_server.base_url, backoff_factor=0.001)
+        yield
+        self.client.close()
     
     def test_initialization(self):
         """Test client initialization."""
-        assert self.client.base_url == "https://api.example.com"
-        assert "Content-Type" in self.client.headers
+        client = APIClient("https://api.example.com")
+        assert client.base_url == "https://api.example.com"
+        assert "Content-Type" in client.headers
     
     def test_set_header(self):
         """Test setting custom header."""
         self.client.set_header("Authorization", "Bearer token123")
         assert self.client.headers["Authorization"] == "Bearer token123"
+        self.client.get("users")
+        assert self.server.requests[-1].headers["Authorization"] == "Bearer token123"
     
     def test_build_url(self):
         """Test building full URL."""
-        url = self.client.build_url("users")
+        client = APIClient("https://api.example.com")
+        url = client.build_url("users")
         assert url == "https://api.example.com/users"
     
     def test_build_url_with_slash(self):
         """Test building URL with leading slash."""
-        url = self.client.build_url("/users")
+        client = APIClient("https://api.example.com")
+        url = client.build_url("/users")
         assert url == "https://api.example.com/users"
     
     def test_get_request(self):
         """Test GET request."""
         response = self.client.get("users", params={"page": 1})
         assert response["method"] == "GET"
-        assert response["params"] == {"page": 1}
+        assert response["path"] == "/users"
+        assert response["params"] == {"page": "1"}
     
     def test_post_request(self):
         """Test POST request."""
@@ -62,3 +75,210 @@ class TestAPIClient:
         """Test base URL with trailing slash."""
         client = APIClient("https://api.example.com/")
         assert client.base_url == "https://api.example.com"
+    
+    def test_connections_are_reused(self):
+        """Test that keep-alive reuses one connection for sequential calls."""
+        for _ in range(10):
+            self.client.get("users")
+        assert self.server.connections == 1
+    
+    def test_empty_body(self):
+        """Test that an empty response body decodes to an empty dict."""
+        self.server.route("DELETE", "/users/1", status=204)
+        assert self.client.delete("users/1") == {}
+    
+    def test_error_status_raises(self):
+        """Test that error responses raise APIError."""
+        self.server.route("GET", "/missing", status=404, body={"error": "not found"})
+        with pytest.raises(APIError) as info:
+            self.client.get("missing")
+        assert info.value.status_code == 404
+        assert "not found" in info.value.body
+    
+    def test_invalid_json_raises(self):
+        """Test that a non-JSON body raises APIError."""
+        self.server.route("GET", "/html", body="<html></html>")
+        with pytest.raises(APIError, match="Invalid JSON"):
+            self.client.get("html")
+    
+    def test_retries_transient_status(self):
+        """Test that retryable statuses are retried until success."""
+        statuses = iter([503, 502, 200])
+        self.server.route("GET", "/flaky", lambda request: (next(statuses), {}, {"ok": True}))
+        assert self.client.get("flaky") == {"ok": True}
+        assert len(self.server.requests) == 3
+    
+    def test_retries_give_up(self):
+        """Test that the last retryable response is returned as an error."""
+        self.server.route("GET", "/down", status=503)
+        client = APIClient(self.server.base_url, max_retries=2, backoff_factor=0.001)
+        with pytest.raises(APIError) as info:
+            client.get("down")
+        assert info.value.status_code == 503
+        assert len(self.server.requests) == 3
+    
+    def test_post_is_not_retried(self):
+        """Test that non-idempotent requests are not retried by default."""
+        self.server.route("POST", "/orders", status=503)
+        with pytest.raises(APIError):
+            self.client.post("orders", data={"id": 1})
+        assert len(self.server.requests) == 1
+    
+    def test_retry_after_header(self):
+        """Test that Retry-After is honoured and capped by backoff_max."""
+        self.client.backoff_max = 0.01
+        statuses = iter([429, 200])
+        self.server.route(
+            "GET", "/limited",
+            lambda request: (next(statuses), {"Retry-After": "120"}, {"ok": True}),
+        )
+        assert self.client.get("limited") == {"ok": True}
+    
+    def test_backoff_is_bounded(self):
+        """Test exponential backoff with jitter stays within its bounds."""
+        client = APIClient("http://localhost", backoff_factor=0.5, backoff_max=3.0)
+        for attempt in range(6):
+            delay = client._backoff(attempt, None)
+            assert 0 <= delay <= min(3.0, 0.5 * 2 ** attempt)
+    
+    def test_connection_error(self):
+        """Test that connection failures raise APIError after retries."""
+        client = APIClient("http://127.0.0.1:9", max_retries=1, backoff_factor=0.001,
+                           timeout=0.5)
+        with pytest.raises(APIError, match="failed"):
+            client.get("users")
+    
+    def test_context_manager_closes_session(self):
+        """Test using the client as a context manager."""
+        with APIClient(self.server.base_url) as client:
+            assert client.get("users")["method"] == "GET"
+        assert isinstance(client.session, requests.Session)
+
+
+class TestPagination:
+    """Test suite for APIClient.iter_pages."""
+    
+    @pytest.fixture(autouse=True)
+    def setup_server(self, http_server):
+        """Set up a client against the local test server."""
+        self.server = http_server
+        self.client = APIClient(http_server.base_url)
+        self.records = [{"id": i} for i in range(25)]
+        yield
+        self.client.close()
+    
+    def test_cursor_pagination(self):
+        """Test following next cursors until they run out."""
+        def handler(request):
+            start = int(request.query.get("cursor", 0))
+            end = start + 10
+            next_cursor = str(end) if end < len(self.records) else None
+            return 200, {}, {"items": self.records[start:end], "next_cursor": next_cursor}
+        
+        self.server.route("GET", "/records", handler)
+        pages = list(self.client.iter_pages("records", params={"q": "x"}))
+        assert [len(page["items"]) for page in pages] == [10, 10, 5]
+        assert all(r.query["q"] == "x" for r in self.server.requests)
+    
+    def test_offset_pagination(self):
+        """Test offset/limit paging until a short page."""
+        def handler(request):
+            offset, limit = int(request.query["offset"]), int(request.query["limit"])
+            return 200, {}, self.records[offset:offset + limit]
+        
+        self.server.route("GET", "/records", handler)
+        pages = list(self.client.iter_pages("records", strategy="offset", page_size=10))
+        assert sum(pages, []) == self.records
+        assert [r.query["offset"] for r in self.server.requests] == ["0", "10", "20"]
+    
+    def test_link_pagination(self):
+        """Test following Link rel=next headers."""
+        def handler(request):
+            page = int(request.query.get("page", 1))
+            headers = {}
+            if page < 3:
+                headers["Link"] = f'</records?page={page + 1}>; rel="next"'
+            return 200, headers, {"items": [page]}
+        
+        self.server.route("GET", "/records", handler)
+        pages = list(self.client.iter_pages("records", strategy="link", prefetch=False))
+        assert [page["items"] for page in pages] == [[1], [2], [3]]
+    
+    def test_pages_are_lazy(self):
+        """Test that unconsumed pages beyond the prefetch are not requested."""
+        self.server.route("GET", "/records", lambda request: (
+            200, {}, {"items": [1], "next_cursor": "more"}
+        ))
+        pages = self.client.iter_pages("records", prefetch=False)
+        next(pages)
+        next(pages)
+        pages.close()
+        assert len(self.server.requests) == 2
+    
+    def test_prefetch_requests_next_page_early(self):
+        """Test that the next page is fetched while the current one is used."""
+        def handler(request):
+            cursor = int(request.query.get("cursor", 0))
+            return 200, {}, {"items": [cursor], "next_cursor": str(cursor + 1) if cursor < 2 else ""}
+        
+        self.server.route("GET", "/records", handler)
+        pages = self.client.iter_pages("records")
+        next(pages)
+        deadline = time.monotonic() + 2
+        while len(self.server.requests) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(self.server.requests) == 2
+        assert [page["items"] for page in pages] == [[1], [2]]
+    
+    def test_unknown_strategy(self):
+        """Test that an unknown strategy is rejected."""
+        with pytest.raises(ValueError, match="pagination strategy"):
+            self.client.iter_pages("records", strategy="page")
+
+
+class TestStreamJson:
+    """Test suite for APIClient.stream_json."""
+    
+    @pytest.fixture(autouse=True)
+    def setup_server(self, http_server):
+        """Set up a client against the local test server."""
+        self.server = http_server
+        self.client = APIClient(http_server.base_url)
+        yield
+        self.client.close()
+    
+    def test_stream_array(self):
+        """Test streaming a chunked JSON array."""
+        records = [{"id": i} for i in range(100)]
+        text = json.dumps(records).encode()
+        self.server.route("GET", "/export", body=(text[i:i + 37] for i in range(0, len(text), 37)))
+        assert list(self.client.stream_json("export", chunk_size=16)) == records
+    
+    def test_stream_ndjson(self):
+        """Test streaming NDJSON with format detection."""
+        body = b'{"id": 1}\n{"id": 2}\n'
+        self.server.route("GET", "/export", body=iter([b"\n", body]))
+        assert list(self.client.stream_json("export")) == [{"id": 1}, {"id": 2}]
+    
+    def test_explicit_format(self):
+        """Test forcing the NDJSON decoder."""
+        self.server.route("GET", "/export", body='[1]\n[2]\n')
+        assert list(self.client.stream_json("export", format="ndjson")) == [[1], [2]]
+    
+    def test_error_status(self):
+        """Test that error statuses raise APIError."""
+        self.server.route("GET", "/export", status=404, body={"error": "missing"})
+        with pytest.raises(APIError) as info:
+            list(self.client.stream_json("export"))
+        assert info.value.status_code == 404
+    
+    def test_malformed_stream(self):
+        """Test that a malformed body raises APIError."""
+        self.server.route("GET", "/export", body="[1, 2")
+        with pytest.raises(APIError, match="Invalid JSON stream"):
+            list(self.client.stream_json("export", format="array"))
+    
+    def test_unknown_format(self):
+        """Test that an unknown format is rejected."""
+        with pytest.raises(ValueError):
+            self.client.stream_json("export", format="xml")
@@ -0,0 +1,164 @@
+"""
+Tests for the AsyncAPIClient class.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from src.api_client import APIError
+from src.async_api_client import AsyncAPIClient
+
+
+class TestAsyncAPIClient:
+    """Test suite for AsyncAPIClient class."""
+    
+    @pytest.fixture(autouse=True)
+    def setup_server(self, http_server):
+        """Set up the local test server."""
+        self.server = http_server
+    
+    def run(self, coroutine_fn, **kwargs):
+        """Run a coroutine function with a fresh client."""
+        async def main():
+            async with AsyncAPIClient(self.server.base_url, **kwargs) as client:
+                return await coroutine_fn(client)
+        return asyncio.run(main())
+    
+    def test_initialization(self):
+        """Test client initialization."""
+        client = AsyncAPIClient("https://api.example.com/")
+        assert client.base_url == "https://api.example.com"
+        assert "Content-Type" in client.headers
+        assert client.build_url("/users") == "https://api.example.com/users"
+    
+    def test_unknown_backend(self):
+        """Test that an unknown backend is rejected."""
+        with pytest.raises(ValueError, match="Unknown backend"):
+            AsyncAPIClient("http://localhost", backend="curl")
+    
+    def test_get_post_put_delete(self):
+        """Test the basic request methods."""
+        async def calls(client):
+            return (
+                await client.get("users", params={"page": 2}),
+                await client.post("users", data={"name": "John"}),
+                await client.put("users/1", data={"name": "Jane"}),
+                await client.delete("users/1"),
+            )
+        
+        get, post, put, delete = self.run(calls)
+        assert get["method"] == "GET" and get["params"] == {"page": "2"}
+        assert post["method"] == "POST" and post["data"] == {"name": "John"}
+        assert put["data"] == {"name": "Jane"}
+        assert delete["method"] == "DELETE"
+    
+    def test_set_header(self):
+        """Test that custom headers are sent."""
+        async def call(client):
+            client.set_header("Authorization", "Bearer abc")
+            return await client.get("users")
+        
+        self.run(call)
+        assert self.server.requests[-1].headers["Authorization"] == "Bearer abc"
+    
+    def test_keep_alive(self):
+        """Test that sequential requests reuse one connection."""
+        async def calls(client):
+            for _ in range(5):
+                await client.get("users")
+        
+        self.run(calls)
+        assert self.server.connections == 1
+    
+    def test_chunked_response(self):
+        """Test reading a chunked response body."""
+        self.server.route("GET", "/chunked", body=iter([b'{"items": ', b'[1, 2, 3]}']))
+        result = self.run(lambda client: client.get("chunked"))
+        assert result == {"items": [1, 2, 3]}
+    
+    def test_error_status(self):
+        """Test that error statuses raise APIError."""
+        self.server.route("GET", "/missing", status=404, body={"error": "nope"})
+        with pytest.raises(APIError) as info:
+            self.run(lambda client: client.get("missing"))
+        assert info.value.status_code == 404
+    
+    def test_empty_body(self):
+        """Test that an empty body decodes to an empty dict."""
+        self.server.route("DELETE", "/users/1", status=204)
+        assert self.run(lambda client: client.delete("users/1")) == {}
+    
+    def test_timeout(self):
+        """Test per-request timeouts."""
+        self.server.route("GET", "/slow", lambda request: (time.sleep(0.5), (200, {}, {}))[1])
+        with pytest.raises(APIError, match="timed out"):
+            self.run(lambda client: client.get("slow", timeout=0.05))
+    
+    def test_connection_refused(self):
+        """Test that connection failures raise APIError."""
+        async def call():
+            async with AsyncAPIClient("http://127.0.0.1:9", timeout=1) as client:
+                await client.get("users")
+        
+        with pytest.raises(APIError, match="failed"):
+            asyncio.run(call())
+    
+    def test_gather_many_preserves_order(self):
+        """Test fan-out results come back in request order."""
+        specs = [("GET", f"users/{i}") for i in range(20)] + [("POST", "users", {"n": 1})]
+        results = self.run(lambda client: client.gather_many(specs, concurrency=4))
+        assert [r["path"] for r in results[:20]] == [f"/users/{i}" for i in range(20)]
+        assert results[20]["data"] == {"n": 1}
+    
+    def test_gather_many_bounds_concurrency(self):
+        """Test that no more than `concurrency` requests are in flight."""
+        state = {"active": 0, "peak": 0}
+        lock = threading.Lock()
+        
+        def slow(request):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return 200, {}, {"ok": True}
+        
+        self.server.route("GET", "/slow", slow)
+        specs = [("GET", "slow")] * 12
+        results = self.run(lambda client: client.gather_many(specs, concurrency=3))
+        assert len(results) == 12
+        assert 1 < state["peak"] <= 3
+    
+    def test_gather_many_return_exceptions(self):
+        """Test collecting failures alongside results."""
+        self.server.route("GET", "/bad", status=500)
+        specs = [("GET", "users"), ("GET", "bad")]
+        results = self.run(
+            lambda client: client.gather_many(specs, return_exceptions=True)
+        )
+        assert results[0]["method"] == "GET"
+        assert isinstance(results[1], APIError)
+    
+    def test_gather_many_cancellation(self):
+        """Test that cancelling gather_many cancels outstanding requests."""
+        self.server.route("GET", "/slow", lambda request: (time.sleep(0.3), (200, {}, {}))[1])
+        
+        async def main():
+            async with AsyncAPIClient(self.server.base_url) as client:
+                task = asyncio.ensure_future(
+                    client.gather_many([("GET", "slow")] * 5, concurrency=5)
+                )
+                await asyncio.sleep(0.05)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        
+        assert asyncio.run(main()) == []
+    
+    def test_gather_many_invalid_concurrency(self):
+        """Test that a non-positive concurrency is rejected."""
+        with pytest.raises(ValueError):
+            self.run(lambda client: client.gather_many([], concurrency=0))
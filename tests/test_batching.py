@@ -0,0 +1,143 @@
+"""
+Tests for request coalescing.
+"""
+
+import threading
+import pytest
+from src.api_client import APIClient, APIError
+from src.batching import BatchEndpoint, RequestCoalescer
+
+
+class TestBatchEndpoint:
+    """Test suite for BatchEndpoint class."""
+    
+    def test_split_matches_ids(self):
+        """Test matching items to keys regardless of key type."""
+        adapter = BatchEndpoint("users")
+        response = {"items": [{"id": 2, "name": "b"}, {"id": 1, "name": "a"}]}
+        assert adapter.split([1, "2", 3], response) == {
+            1: {"id": 1, "name": "a"},
+            "2": {"id": 2, "name": "b"},
+        }
+    
+    def test_split_bare_list(self):
+        """Test splitting a response that is the item list itself."""
+        adapter = BatchEndpoint("users", items_key=None, id_key="key")
+        assert adapter.split(["a"], [{"key": "a"}]) == {"a": {"key": "a"}}
+    
+    def test_unsupported_method(self):
+        """Test that only GET and POST are accepted."""
+        with pytest.raises(ValueError):
+            BatchEndpoint("users", method="PUT")
+
+
+class TestRequestCoalescer:
+    """Test suite for RequestCoalescer class."""
+    
+    @pytest.fixture(autouse=True)
+    def setup_server(self, http_server):
+        """Set up a bulk users endpoint on the local test server."""
+        self.server = http_server
+        
+        def bulk(request):
+            ids = request.query["ids"].split(",") if request.method == "GET" else request.json()["ids"]
+            return 200, {}, {"items": [{"id": int(i), "name": f"user{i}"} for i in ids if int(i) < 100]}
+        
+        http_server.route("GET", "/users", bulk)
+        http_server.route("POST", "/users", bulk)
+        self.client = APIClient(http_server.base_url)
+        yield
+        self.client.close()
+    
+    def test_concurrent_loads_share_one_request(self):
+        """Test that loads within the window become one bulk request."""
+        with RequestCoalescer(self.client, BatchEndpoint("users"), window=0.05) as coalescer:
+            futures = [coalescer.load(i) for i in range(10)]
+            results = [future.result(timeout=5) for future in futures]
+        assert [r["name"] for r in results] == [f"user{i}" for i in range(10)]
+        assert len(self.server.requests) == 1
+        assert self.server.requests[0].query["ids"] == "0,1,2,3,4,5,6,7,8,9"
+    
+    def test_max_batch_splits_requests(self):
+        """Test that a full batch is sent without waiting for the window."""
+        with RequestCoalescer(self.client, BatchEndpoint("users"), window=10, max_batch=4) as coalescer:
+            results = coalescer.load_many(range(8), timeout=5)
+            assert len(results) == 8
+            assert coalescer.stats()["batches"] == 2
+    
+    def test_identical_keys_are_deduplicated(self):
+        """Test that a pending key is requested once."""
+        with RequestCoalescer(self.client, BatchEndpoint("users"), window=0.05) as coalescer:
+            first, second = coalescer.load(7), coalescer.load(7)
+            assert first is second
+            assert first.result(timeout=5)["id"] == 7
+        assert self.server.requests[0].query["ids"] == "7"
+        assert coalescer.stats() == {"calls": 2, "deduplicated": 1, "batches": 1}
+    
+    def test_post_adapter(self):
+        """Test sending keys in a POST body."""
+        with RequestCoalescer(self.client, BatchEndpoint("users", method="POST")) as coalescer:
+            assert coalescer.load_many([1, 2], timeout=5)[2]["name"] == "user2"
+        assert self.server.requests[0].json() == {"ids": [1, 2]}
+    
+    def test_missing_result(self):
+        """Test that a key absent from the response fails its own future only."""
+        with RequestCoalescer(self.client, BatchEndpoint("users"), window=0.05) as coalescer:
+            found, missing = coalescer.load(1), coalescer.load(500)
+            assert found.result(timeout=5)["id"] == 1
+            with pytest.raises(APIError) as info:
+                missing.result(timeout=5)
+        assert info.value.status_code == 404
+    
+    def test_batch_error_fails_all_callers(self):
+        """Test that a failed bulk request fails every future in it."""
+        self.server.route("GET", "/users", status=400, body={"error": "bad"})
+        with RequestCoalescer(self.client, BatchEndpoint("users"), window=0.05) as coalescer:
+            futures = [coalescer.load(i) for i in range(3)]
+            for future in futures:
+                with pytest.raises(APIError):
+                    future.result(timeout=5)
+    
+    def test_identical_gets_are_shared(self):
+        """Test that concurrent identical GETs send one request."""
+        release = threading.Event()
+        arrived = threading.Event()
+        
+        def slow(request):
+            arrived.set()
+            release.wait(5)
+            return 200, {}, {"value": 42}
+        
+        self.server.route("GET", "/slow", slow)
+        coalescer = RequestCoalescer(self.client, BatchEndpoint("users"))
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(coalescer.get("slow", {"a": 1})))
+                   for _ in range(4)]
+        threads[0].start()
+        assert arrived.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        while coalescer.stats()["deduplicated"] < 3:
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        coalescer.close()
+        assert results == [{"value": 42}] * 4
+        assert len(self.server.requests) == 1
+    
+    def test_load_after_close(self):
+        """Test that a closed coalescer refuses new keys instead of hanging."""
+        coalescer = RequestCoalescer(self.client, BatchEndpoint("users"), window=10)
+        pending = coalescer.load(1)
+        coalescer.close()
+        assert pending.result(timeout=5)["id"] == 1
+        with pytest.raises(RuntimeError):
+            coalescer.load(2)
+    
+    def test_invalid_arguments(self):
+        """Test that invalid window and batch sizes are rejected."""
+        with pytest.raises(ValueError):
+            RequestCoalescer(self.client, BatchEndpoint("users"), window=-1)
+        with pytest.raises(ValueError):
+            RequestCoalescer(self.client, BatchEndpoint("users"), max_batch=0)
@@ -2,9 +2,11 @@
 Tests for the Cache class.
 """
 
+import asyncio
 import pytest
+import threading
 import time
-from src.cache import Cache
+from src.cache import Cache, ConcurrentCache, DiskStore
 
 
 class TestCache:
@@ -75,3 +77,751 @@ class TestCache:
         assert self.cache.size() == 2
         time.sleep(1.1)
         assert self.cache.size() == 0
+
+
+class TestBoundedCache:
+    """Test suite for capacity-bounded Cache eviction."""
+    
+    def test_invalid_policy(self):
+        """Test that an unknown policy is rejected."""
+        with pytest.raises(ValueError, match="Unknown eviction policy"):
+            Cache(max_entries=2, policy="fifo")
+    
+    def test_invalid_bounds(self):
+        """Test that non-positive bounds are rejected."""
+        with pytest.raises(ValueError):
+            Cache(max_entries=0)
+        with pytest.raises(ValueError):
+            Cache(max_bytes=-1)
+    
+    def test_lru_evicts_least_recently_used(self):
+        """Test LRU eviction order."""
+        cache = Cache(max_entries=2, policy="lru")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+    
+    def test_lru_overwrite_does_not_evict(self):
+        """Test that updating an existing key keeps the entry count."""
+        cache = Cache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 10)
+        assert cache.get("a") == 10
+        assert cache.get("b") == 2
+        assert cache.evictions == 0
+    
+    def test_lfu_evicts_least_frequently_used(self):
+        """Test LFU eviction order."""
+        cache = Cache(max_entries=2, policy="lfu")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+    
+    def test_lfu_after_delete(self):
+        """Test LFU still finds a victim after deleting the coldest key."""
+        cache = Cache(max_entries=2, policy="lfu")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("b")
+        cache.delete("a")
+        cache.set("c", 3)
+        cache.get("c")
+        cache.get("c")
+        cache.set("d", 4)
+        assert cache.size() == 2
+        assert cache.get("c") == 3
+    
+    def test_tinylfu_resists_scans(self):
+        """Test that a hot key survives a scan of one-off keys."""
+        cache = Cache(max_entries=3, policy="tinylfu")
+        cache.set("hot", "value")
+        for _ in range(5):
+            cache.get("hot")
+        for i in range(20):
+            cache.set(f"scan{i}", i)
+        assert cache.get("hot") == "value"
+        assert cache.size() == 3
+    
+    def test_lru_loses_hot_key_on_scan(self):
+        """Test the scan pattern that TinyLFU protects against."""
+        cache = Cache(max_entries=3, policy="lru")
+        cache.set("hot", "value")
+        for _ in range(5):
+            cache.get("hot")
+        for i in range(20):
+            cache.set(f"scan{i}", i)
+        assert cache.get("hot") is None
+    
+    def test_max_bytes(self):
+        """Test eviction by byte budget."""
+        cache = Cache(max_bytes=10, sizeof=len)
+        cache.set("a", "xxxx")
+        cache.set("b", "xxxx")
+        cache.set("c", "xxxx")
+        assert cache.get("a") is None
+        assert cache.stats()["bytes"] == 8
+    
+    def test_value_larger_than_budget_is_not_cached(self):
+        """Test that an oversized value is skipped instead of flushing."""
+        cache = Cache(max_bytes=10, sizeof=len)
+        cache.set("a", "xxxx")
+        cache.set("big", "x" * 11)
+        assert cache.get("big") is None
+        assert cache.get("a") == "xxxx"
+    
+    def test_counters(self):
+        """Test hit, miss and eviction counters."""
+        cache = Cache(max_entries=1)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+        cache.set("b", 2)
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["evictions"] == 1
+        assert stats["entries"] == 1
+    
+    def test_clear_resets_tracking(self):
+        """Test clearing a bounded cache."""
+        cache = Cache(max_entries=2, max_bytes=100, sizeof=len)
+        cache.set("a", "x")
+        cache.clear()
+        assert cache.stats()["bytes"] == 0
+        cache.set("b", "y")
+        cache.set("c", "z")
+        assert cache.size() == 2
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class TestCacheExpiry:
+    """Test suite for heap-based Cache expiry."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.cache = Cache(default_ttl=10, clock=self.clock)
+    
+    def test_expires_on_monotonic_clock(self):
+        """Test that expiry follows the injected clock."""
+        self.cache.set("a", 1, ttl=5)
+        self.clock.advance(5)
+        assert self.cache.get("a") == 1
+        self.clock.advance(0.1)
+        assert self.cache.get("a") is None
+    
+    def test_size_purges_only_expired(self):
+        """Test size with a mix of live and expired entries."""
+        for i in range(10):
+            self.cache.set(f"short{i}", i, ttl=1)
+            self.cache.set(f"long{i}", i, ttl=100)
+        self.clock.advance(2)
+        assert self.cache.size() == 10
+        assert len(self.cache._expiry_heap) == 10
+    
+    def test_overwrite_extends_expiry(self):
+        """Test that re-setting a key replaces its old expiry."""
+        self.cache.set("a", 1, ttl=1)
+        self.cache.set("a", 2, ttl=5)
+        self.clock.advance(2)
+        assert self.cache.size() == 1
+        assert self.cache.get("a") == 2
+    
+    def test_overwrite_shortens_expiry(self):
+        """Test that a shorter TTL on overwrite takes effect."""
+        self.cache.set("a", 1, ttl=5)
+        self.cache.set("a", 2, ttl=1)
+        self.clock.advance(2)
+        assert self.cache.size() == 0
+    
+    def test_heap_is_compacted(self):
+        """Test that stale heap items from overwrites are dropped."""
+        for i in range(1000):
+            self.cache.set("a", i)
+        assert len(self.cache._expiry_heap) <= 64
+        assert self.cache.get("a") == 999
+    
+    def test_purge_expired(self):
+        """Test explicit purging."""
+        self.cache.set("a", 1, ttl=1)
+        self.cache.set("b", 2, ttl=3)
+        self.clock.advance(2)
+        assert self.cache.purge_expired() == 1
+        assert self.cache.purge_expired() == 0
+    
+    def test_purge_updates_bounded_bookkeeping(self):
+        """Test that purged entries free capacity in a bounded cache."""
+        cache = Cache(max_entries=2, clock=self.clock)
+        cache.set("a", 1, ttl=1)
+        cache.set("b", 2, ttl=1)
+        self.clock.advance(2)
+        cache.purge_expired()
+        cache.set("c", 3)
+        cache.set("d", 4)
+        assert cache.evictions == 0
+    
+    def test_reaper_thread(self):
+        """Test that the reaper purges in the background."""
+        cache = Cache(clock=self.clock, reap_interval=0.01)
+        try:
+            cache.set("a", 1, ttl=1)
+            self.clock.advance(2)
+            deadline = time.monotonic() + 2
+            while cache._cache and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert not cache._cache
+        finally:
+            cache.stop_reaper()
+        assert cache._reaper is None
+    
+    def test_reaper_invalid_interval(self):
+        """Test that a non-positive sweep interval is rejected."""
+        with pytest.raises(ValueError):
+            self.cache.start_reaper(0)
+
+
+class TestConcurrentCache:
+    """Test suite for ConcurrentCache class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.cache = ConcurrentCache(default_ttl=10, segments=4, clock=self.clock)
+    
+    def test_invalid_segments(self):
+        """Test that a non-positive segment count is rejected."""
+        with pytest.raises(ValueError):
+            ConcurrentCache(segments=0)
+    
+    def test_set_get_delete_has(self):
+        """Test the basic Cache API."""
+        self.cache.set("a", 1)
+        assert self.cache.get("a") == 1
+        assert self.cache.has("a") is True
+        assert self.cache.delete("a") is True
+        assert self.cache.delete("a") is False
+        assert self.cache.get("a") is None
+    
+    def test_keys_spread_across_segments(self):
+        """Test that keys are distributed over several segments."""
+        for i in range(100):
+            self.cache.set(f"key{i}", i)
+        assert self.cache.size() == 100
+        assert sum(1 for segment in self.cache._segments if segment.size()) > 1
+    
+    def test_expiry_and_clear(self):
+        """Test expiry and clearing across segments."""
+        self.cache.set("a", 1, ttl=1)
+        self.cache.set("b", 2, ttl=5)
+        self.clock.advance(2)
+        assert self.cache.size() == 1
+        self.cache.clear()
+        assert self.cache.size() == 0
+    
+    def test_bounds_are_split(self):
+        """Test that capacity is shared out between segments."""
+        cache = ConcurrentCache(segments=4, max_entries=8)
+        for i in range(100):
+            cache.set(f"key{i}", i)
+        assert cache.size() <= 8
+        assert cache.stats()["evictions"] >= 92
+    
+    def test_uneven_bounds_add_up(self):
+        """Test that bounds not divisible by the segment count are not exceeded."""
+        cache = ConcurrentCache(segments=4, max_entries=10, max_bytes=1003, sizeof=len)
+        assert sum(segment.max_entries for segment in cache._segments) == 10
+        assert sum(segment.max_bytes for segment in cache._segments) == 1003
+        for i in range(100):
+            cache.set(f"key{i}", "x")
+        assert cache.size() <= 10
+        with pytest.raises(ValueError):
+            ConcurrentCache(segments=16, max_entries=10)
+    
+    def test_stats_are_summed(self):
+        """Test aggregated counters."""
+        self.cache.set("a", 1)
+        self.cache.get("a")
+        self.cache.get("b")
+        stats = self.cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+    
+    def test_reaper(self):
+        """Test the background reaper across segments."""
+        cache = ConcurrentCache(segments=2, clock=self.clock, reap_interval=0.01)
+        try:
+            cache.set("a", 1, ttl=1)
+            self.clock.advance(2)
+            deadline = time.monotonic() + 2
+            while cache.stats()["entries"] and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert cache.stats()["entries"] == 0
+        finally:
+            cache.stop_reaper()
+    
+    def test_concurrent_access(self):
+        """Test concurrent readers, writers and expiry."""
+        cache = ConcurrentCache(default_ttl=1, segments=8, max_entries=64)
+        errors = []
+        
+        def work(offset):
+            try:
+                for i in range(2000):
+                    key = f"key{(i + offset) % 100}"
+                    cache.set(key, i, ttl=0.001 if i % 7 == 0 else None)
+                    cache.get(key)
+                    if i % 11 == 0:
+                        cache.delete(key)
+            except Exception as exc:
+                errors.append(exc)
+        
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+        assert cache.size() <= 64
+
+
+class TestGetOrCompute:
+    """Test suite for single-flight get_or_compute."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.cache = Cache(default_ttl=10, clock=self.clock)
+    
+    def _wait_for(self, condition):
+        """Wait up to two seconds for a background refresh."""
+        deadline = time.monotonic() + 2
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert condition()
+    
+    def test_computes_once_and_caches(self):
+        """Test that the loader runs on the first miss only."""
+        calls = []
+        loader = lambda: calls.append(1) or "value"
+        assert self.cache.get_or_compute("a", loader) == "value"
+        assert self.cache.get_or_compute("a", loader) == "value"
+        assert len(calls) == 1
+        assert self.cache.get("a") == "value"
+    
+    def test_recomputes_after_expiry(self):
+        """Test that an expired entry is recomputed."""
+        values = iter([1, 2])
+        assert self.cache.get_or_compute("a", lambda: next(values), ttl=1) == 1
+        self.clock.advance(2)
+        assert self.cache.get_or_compute("a", lambda: next(values), ttl=1) == 2
+    
+    def test_single_flight_across_threads(self):
+        """Test that concurrent misses share one loader call."""
+        cache = Cache()
+        calls = []
+        release = threading.Event()
+        
+        def loader():
+            calls.append(1)
+            release.wait(2)
+            return "value"
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_compute("k", loader)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        self._wait_for(lambda: len(cache._flights) == 1 and calls)
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert results == ["value"] * 8
+        assert len(calls) == 1
+        assert not cache._flights
+    
+    def test_loader_error_reaches_waiters(self):
+        """Test that a failing loader raises and leaves nothing cached."""
+        def loader():
+            raise RuntimeError("backend down")
+        
+        with pytest.raises(RuntimeError, match="backend down"):
+            self.cache.get_or_compute("a", loader)
+        assert self.cache.get("a") is None
+        assert not self.cache._flights
+    
+    def test_stale_while_revalidate(self):
+        """Test serving a stale value while refreshing in the background."""
+        values = iter(["old", "new"])
+        self.cache.get_or_compute("a", lambda: next(values), ttl=1, stale_ttl=5)
+        self.clock.advance(2)
+        assert self.cache.get("a") is None
+        assert self.cache.get_or_compute("a", lambda: next(values), ttl=1, stale_ttl=5) == "old"
+        self._wait_for(lambda: self.cache.get("a") == "new")
+    
+    def test_stale_window_ends(self):
+        """Test that values past the stale window are recomputed inline."""
+        values = iter(["old", "new"])
+        self.cache.get_or_compute("a", lambda: next(values), ttl=1, stale_ttl=1)
+        self.clock.advance(3)
+        assert self.cache.get_or_compute("a", lambda: next(values), ttl=1, stale_ttl=1) == "new"
+    
+    def test_early_refresh(self):
+        """Test XFetch refreshes a slow-to-compute value before expiry."""
+        values = iter(["old", "new"])
+        
+        def slow_loader():
+            self.clock.advance(5)
+            return next(values)
+        
+        self.cache.get_or_compute("a", slow_loader, ttl=10, beta=1.0)
+        self.clock.advance(9.99)
+        result = self.cache.get_or_compute("a", slow_loader, ttl=10, beta=1000.0)
+        assert result == "old"
+        self._wait_for(lambda: self.cache._cache["a"].value == "new")
+    
+    def test_no_early_refresh_when_disabled(self):
+        """Test that beta=0 never refreshes a fresh value."""
+        self.cache.get_or_compute("a", lambda: "old")
+        self.clock.advance(9.99)
+        assert self.cache.get_or_compute("a", lambda: "new") == "old"
+    
+    def test_async_single_flight(self):
+        """Test that concurrent async misses share one loader call."""
+        calls = []
+        
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+        
+        async def run():
+            return await asyncio.gather(
+                *(self.cache.aget_or_compute("a", loader) for _ in range(10))
+            )
+        
+        assert asyncio.run(run()) == ["value"] * 10
+        assert len(calls) == 1
+        assert self.cache.get("a") == "value"
+        assert not self.cache._async_flights
+    
+    def test_async_stale_while_revalidate(self):
+        """Test async stale serving with a background refresh."""
+        values = iter(["old", "new"])
+        
+        async def loader():
+            return next(values)
+        
+        async def run():
+            await self.cache.aget_or_compute("a", loader, ttl=1, stale_ttl=5)
+            self.clock.advance(2)
+            stale = await self.cache.aget_or_compute("a", loader, ttl=1, stale_ttl=5)
+            await asyncio.sleep(0.01)
+            return stale
+        
+        assert asyncio.run(run()) == "old"
+        assert self.cache.get("a") == "new"
+    
+    def test_concurrent_cache_delegates(self):
+        """Test get_or_compute on ConcurrentCache."""
+        cache = ConcurrentCache(segments=4)
+        assert cache.get_or_compute("a", lambda: 1) == 1
+        assert cache.get_or_compute("a", lambda: 2) == 1
+        
+        async def loader():
+            return 3
+        
+        assert asyncio.run(cache.aget_or_compute("b", loader)) == 3
+
+
+class TestDiskStore:
+    """Test suite for the persistent L2 tier."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.stores = []
+    
+    def teardown_method(self):
+        """Close any stores opened by a test."""
+        for store in self.stores:
+            store.close()
+    
+    def _open(self, tmp_path, **kwargs):
+        """Open a store in the test's temporary directory."""
+        store = DiskStore(str(tmp_path / "cache.db"), **kwargs)
+        self.stores.append(store)
+        return store
+    
+    def test_set_get_delete(self, tmp_path):
+        """Test basic store operations."""
+        store = self._open(tmp_path)
+        store.set("a", {"x": [1, 2]}, ttl=60)
+        value, remaining = store.get("a")
+        assert value == {"x": [1, 2]}
+        assert 0 < remaining <= 60
+        assert store.delete("a") is True
+        assert store.delete("a") is False
+        assert store.get("a") is None
+    
+    def test_expired_entries_are_not_returned(self, tmp_path):
+        """Test that expired entries are dropped."""
+        store = self._open(tmp_path)
+        store.set("a", 1, ttl=0.01)
+        store.set("b", 2, ttl=60)
+        time.sleep(0.02)
+        assert store.get("a") is None
+        store.set("c", 3, ttl=0.01)
+        time.sleep(0.02)
+        assert store.purge_expired() == 1
+        assert store.size() == 1
+    
+    def test_entry_bound(self, tmp_path):
+        """Test that the entries closest to expiry are dropped first."""
+        store = self._open(tmp_path, max_entries=2)
+        store.set("a", 1, ttl=10)
+        store.set("b", 2, ttl=30)
+        store.set("c", 3, ttl=20)
+        assert store.size() == 2
+        assert store.get("a") is None
+        assert store.get("b")[0] == 2
+    
+    def test_byte_bound(self, tmp_path):
+        """Test bounded disk usage by bytes."""
+        store = self._open(tmp_path, max_bytes=200)
+        for i in range(20):
+            store.set(f"key{i}", "x" * 50, ttl=60 + i)
+        assert store.disk_bytes() <= 200
+        store.set("huge", "x" * 500, ttl=60)
+        assert store.get("huge") is None
+    
+    def test_overwrite_tracks_size(self, tmp_path):
+        """Test that overwriting a key updates the byte count."""
+        store = self._open(tmp_path)
+        store.set("a", "x" * 100, ttl=60)
+        before = store.disk_bytes()
+        store.set("a", "x", ttl=60)
+        assert store.size() == 1
+        assert store.disk_bytes() < before
+    
+    def test_purge_uses_one_timestamp(self, tmp_path, monkeypatch):
+        """Test that purging keeps the counters in step with the rows."""
+        store = self._open(tmp_path)
+        ticks = iter(range(1000, 2000, 10))
+        monkeypatch.setattr("src.cache.time.time", lambda: next(ticks))
+        store.set("a", 1, ttl=25)
+        store.set("b", 2, ttl=100)
+        store.purge_expired()
+        rows = store._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        assert store.size() == rows
+    
+    def test_set_many_oversized_value_replaces_old(self, tmp_path):
+        """Test that an oversized batch value removes the key's older value."""
+        store = self._open(tmp_path, max_bytes=100)
+        store.set("k", "small", ttl=60)
+        store.set_many({"k": "x" * 500, "other": 1}, ttl=60)
+        assert store.get("k") is None
+        assert store.size() == 1
+        assert Cache(l2=store).get("k") is None
+    
+    def test_persists_across_reopen(self, tmp_path):
+        """Test that entries survive closing and reopening the file."""
+        store = self._open(tmp_path)
+        store.set("a", 1, ttl=60)
+        store.close()
+        store = self._open(tmp_path)
+        assert store.get("a")[0] == 1
+        assert store.size() == 1
+
+
+class TestTieredCache:
+    """Test suite for Cache with an L2 DiskStore."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.stores = []
+    
+    def teardown_method(self):
+        """Close any stores opened by a test."""
+        for store in self.stores:
+            store.close()
+    
+    def _open(self, tmp_path):
+        """Open a store in the test's temporary directory."""
+        store = DiskStore(str(tmp_path / "cache.db"))
+        self.stores.append(store)
+        return store
+    
+    def test_write_through_and_promote(self, tmp_path):
+        """Test that L1 misses are served from L2."""
+        store = self._open(tmp_path)
+        cache = Cache(l2=store, max_entries=1)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert store.size() == 2
+        assert cache.get("a") == 1
+        assert cache.stats()["hits"] == 1
+    
+    def test_warm_restart(self, tmp_path):
+        """Test bulk warm-up from disk after a restart."""
+        store = self._open(tmp_path)
+        Cache(l2=store).set("a", "value", ttl=60)
+        store.close()
+        
+        restarted = Cache(l2=self._open(tmp_path))
+        assert restarted.warm_up() == 1
+        assert restarted.size() == 1
+        assert restarted.get("a") == "value"
+    
+    def test_warm_up_respects_capacity(self, tmp_path):
+        """Test that warm-up does not overfill a bounded cache."""
+        store = self._open(tmp_path)
+        for i in range(10):
+            store.set(f"key{i}", i, ttl=60 + i)
+        cache = Cache(l2=store, max_entries=3)
+        assert cache.warm_up() == 3
+        assert cache.get("key9") == 9
+    
+    def test_delete_and_clear_reach_l2(self, tmp_path):
+        """Test that delete and clear remove persisted entries."""
+        store = self._open(tmp_path)
+        cache = Cache(l2=store)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.delete("a") is True
+        assert store.get("a") is None
+        cache.clear()
+        assert store.size() == 0
+    
+    def test_concurrent_clear_reaches_l2_once(self, tmp_path):
+        """Test that a segmented cache clears the shared store once."""
+        store = self._open(tmp_path)
+        cache = ConcurrentCache(l2=store)
+        cache.set("a", 1)
+        calls = []
+        clear = store.clear
+        store.clear = lambda: (calls.append(1), clear())
+        cache.clear()
+        assert calls == [1]
+        assert cache.get("a") is None
+        assert store.size() == 0
+    
+    def test_get_or_compute_uses_l2(self, tmp_path):
+        """Test that get_or_compute checks L2 before computing."""
+        store = self._open(tmp_path)
+        store.set("a", "persisted", ttl=60)
+        cache = Cache(l2=store)
+        assert cache.get_or_compute("a", lambda: "computed") == "persisted"
+    
+    def test_concurrent_cache_warm_up(self, tmp_path):
+        """Test warm-up of a segmented cache."""
+        store = self._open(tmp_path)
+        for i in range(10):
+            store.set(f"key{i}", i, ttl=60)
+        cache = ConcurrentCache(segments=4, l2=store)
+        assert cache.warm_up() == 10
+        assert cache.size() == 10
+        assert cache.get("key3") == 3
+
+
+class TestBatchOperations:
+    """Test suite for get_many / set_many / delete_many."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.cache = Cache(default_ttl=10, clock=self.clock)
+    
+    def test_set_many_and_get_many(self):
+        """Test batched set and get."""
+        self.cache.set_many({"a": 1, "b": 2})
+        self.cache.set_many([("c", 3)])
+        assert self.cache.get_many(["a", "b", "c", "missing"]) == {"a": 1, "b": 2, "c": 3}
+        assert self.cache.hits == 3
+        assert self.cache.misses == 1
+    
+    def test_get_many_skips_expired(self):
+        """Test that expired keys are left out and removed."""
+        self.cache.set_many({"a": 1}, ttl=1)
+        self.cache.set_many({"b": 2}, ttl=5)
+        self.clock.advance(2)
+        assert self.cache.get_many(["a", "b"]) == {"b": 2}
+        assert "a" not in self.cache._cache
+    
+    def test_delete_many(self):
+        """Test batched delete."""
+        self.cache.set_many({"a": 1, "b": 2, "c": 3})
+        assert self.cache.delete_many(["a", "b", "missing"]) == 2
+        assert self.cache.get_many(["a", "b", "c"]) == {"c": 3}
+    
+    def test_set_many_evicts_in_bounded_cache(self):
+        """Test that batched sets respect capacity."""
+        cache = Cache(max_entries=5)
+        cache.set_many({f"key{i}": i for i in range(20)})
+        assert cache.size() == 5
+        assert cache.evictions == 15
+        assert cache.get_many([f"key{i}" for i in range(15, 20)]) == {
+            f"key{i}": i for i in range(15, 20)
+        }
+    
+    def test_batches_with_l2(self, tmp_path):
+        """Test that batches go through to and come back from L2."""
+        store = DiskStore(str(tmp_path / "cache.db"))
+        try:
+            cache = Cache(l2=store, max_entries=2)
+            cache.set_many({f"key{i}": i for i in range(600)})
+            assert store.size() == 600
+            found = cache.get_many([f"key{i}" for i in range(600)])
+            assert len(found) == 600
+            assert cache.misses == 0
+            assert cache.delete_many([f"key{i}" for i in range(600)]) == 600
+            assert store.size() == 0
+            assert store.disk_bytes() == 0
+        finally:
+            store.close()
+    
+    def test_disk_store_set_many_overwrites(self, tmp_path):
+        """Test DiskStore byte accounting for batched overwrites."""
+        store = DiskStore(str(tmp_path / "cache.db"), max_entries=3)
+        try:
+            store.set_many({"a": "x" * 10, "b": "y"}, ttl=60)
+            store.set_many({"a": "x", "c": "z", "d": "w"}, ttl=120)
+            assert store.size() == 3
+            assert store.get_many(["a", "c", "d"])["a"][0] == "x"
+            assert store.delete_many(["a", "zz"]) == 1
+        finally:
+            store.close()
+    
+    def test_concurrent_cache_batches(self):
+        """Test batch operations on ConcurrentCache."""
+        cache = ConcurrentCache(segments=4)
+        cache.set_many({f"key{i}": i for i in range(100)})
+        assert len(cache.get_many([f"key{i}" for i in range(100)])) == 100
+        assert cache.delete_many([f"key{i}" for i in range(50)]) == 50
+        assert cache.size() == 50
@@ -2,8 +2,10 @@
 Tests for the Calculator class.
 """
 
+from array import array
+import math
 import pytest
-from src.calculator import Calculator
+from src.calculator import Calculator, np
 
 
 class TestCalculator:
@@ -90,3 +92,106 @@ class TestCalculator:
         assert self.calc.add(1.5, 2.5) == 4.0
         assert self.calc.multiply(2.5, 4.0) == 10.0
         assert self.calc.divide(7.5, 2.5) == 3.0
+
+
+class TestCalculatorBatch:
+    """Test suite for Calculator batch methods."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.calc = Calculator()
+    
+    def test_many_methods_on_lists(self):
+        """Test element-wise operations on lists, with scalar broadcasting."""
+        assert self.calc.add_many([1, 2, 3], [10, 20, 30]) == [11, 22, 33]
+        assert self.calc.subtract_many([5, 5], 2) == [3, 3]
+        assert self.calc.multiply_many([1.5, 2], [2, 4]) == [3.0, 8]
+        assert self.calc.divide_many([1, 9], [2, 3]) == [0.5, 3.0]
+        assert self.calc.evaluate_batch("+", 1, [1, 2]) == [2, 3]
+    
+    def test_one_history_entry_per_batch(self):
+        """Test a batch records one summary entry."""
+        self.calc.add_many(list(range(1000)), list(range(1000)))
+        self.calc.divide_many([1, 2], [0, 1], on_error="nan")
+        assert self.calc.get_history() == [
+            "batch + of 1000 pairs",
+            "batch / of 2 pairs (1 divisions by zero)",
+        ]
+    
+    def test_division_by_zero_policies(self):
+        """Test raise, nan and mask policies report every bad position."""
+        with pytest.raises(ValueError, match="2 of 4 positions .first at index 1"):
+            self.calc.divide_many([1, 2, 3, 4], [1, 0, 1, 0])
+        assert self.calc.get_history() == []
+        values = self.calc.divide_many([1, 2, 3], [1, 0, 2], on_error="nan")
+        assert values[0] == 1.0 and math.isnan(values[1]) and values[2] == 1.5
+        values, mask = self.calc.divide_many([1, 2], 0, on_error="mask")
+        assert mask == [True, True] and all(map(math.isnan, values))
+    
+    def test_array_inputs(self):
+        """Test array.array inputs give array.array results."""
+        ints = array("q", [1, 2, 3])
+        result = self.calc.add_many(ints, ints)
+        assert result == array("q", [2, 4, 6])
+        assert self.calc.divide_many(ints, 2) == array("d", [0.5, 1.0, 1.5])
+        assert self.calc.multiply_many(array("d", [1.5]), [2]) == array("d", [3.0])
+    
+    @pytest.mark.skipif(np is None, reason="NumPy not installed")
+    def test_numpy_inputs(self):
+        """Test NumPy inputs are computed with ufuncs."""
+        a = np.array([1.0, 2.0, 3.0])
+        assert self.calc.add_many(a, [1, 1, 1]).tolist() == [2.0, 3.0, 4.0]
+        values, mask = self.calc.divide_many(a, np.array([1, 0, 3]), on_error="mask")
+        assert mask.tolist() == [False, True, False]
+        assert values[0] == 1.0 and np.isnan(values[1]) and values[2] == 1.0
+        with pytest.raises(ValueError):
+            self.calc.divide_many(a, 0)
+    
+    def test_invalid_arguments(self):
+        """Test unknown operations, policies and mismatched lengths."""
+        with pytest.raises(ValueError):
+            self.calc.evaluate_batch("power", [1], [2])
+        with pytest.raises(ValueError):
+            self.calc.evaluate_batch("add", [1], [2], on_error="ignore")
+        with pytest.raises(ValueError):
+            self.calc.add_many([1, 2], [1])
+        with pytest.raises(ValueError):
+            self.calc.add_many(1, 2)
+
+
+class TestCalculatorExpressions:
+    """Test suite for Calculator expression evaluation."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.calc = Calculator()
+    
+    def test_evaluate(self):
+        """Test evaluating a formula with variables records history."""
+        assert self.calc.evaluate("a * b + 1", a=3, b=4) == 13
+        assert self.calc.get_history() == ["a * b + 1 = 13"]
+        with pytest.raises(ValueError):
+            self.calc.evaluate("1 / x", x=0)
+        with pytest.raises(ValueError):
+            self.calc.evaluate("x + 1", x="a")
+        assert self.calc.evaluate_many("x * 2", [{"x": 1}, {"x": "a"}], on_error="nan")[0] == 2
+    
+    def test_evaluate_many(self):
+        """Test evaluating a formula over many rows with one history entry."""
+        rows = [{"price": p, "qty": q} for p, q in ((10, 2), (3, 3), (1.5, 4))]
+        assert self.calc.evaluate_many("price * qty", rows) == [20, 9, 6.0]
+        assert self.calc.get_history() == ["batch price * qty over 3 rows"]
+    
+    def test_evaluate_many_error_policies(self):
+        """Test failing rows are reported per row."""
+        rows = [{"x": 1}, {"x": 0}, {"x": 4}, {}]
+        with pytest.raises(ValueError, match="2 of 4 rows .first at index 1"):
+            self.calc.evaluate_many("8 / x", rows)
+        values = self.calc.evaluate_many("8 / x", rows, on_error="nan")
+        assert values[0] == 8.0 and values[2] == 2.0
+        assert math.isnan(values[1]) and math.isnan(values[3])
+        values, mask = self.calc.evaluate_many("8 / x", rows, on_error="mask")
+        assert mask == [False, True, False, True]
+        assert self.calc.get_history() == ["batch 8 / x over 4 rows (2 failed)"] * 2
+        with pytest.raises(ValueError):
+            self.calc.evaluate_many("x", rows, on_error="skip")
@@ -4,6 +4,7 @@ Tests for the DataProcessor class.
 
 import pytest
 from src.data_processor import DataProcessor
+from src.table import Table
 
 
 class TestDataProcessor:
@@ -80,3 +81,39 @@ class TestDataProcessor:
         result = self.processor.calculate_statistics([], "age")
         assert result["count"] == 0
         assert result["sum"] == 0
+    
+    def test_operations_accept_tables(self):
+        """Test that every operation gives the same answer on a Table."""
+        table = Table.from_records(self.sample_data, use_numpy=False)
+        p = self.processor
+        assert p.filter_data(table, "city", "New York").to_records() == \
+            p.filter_data(self.sample_data, "city", "New York")
+        assert p.sort_data(table, "age", reverse=True).to_records() == \
+            p.sort_data(self.sample_data, "age", reverse=True)
+        assert p.aggregate_data(table, "city") == p.aggregate_data(self.sample_data, "city")
+        mapping = {"name": "full_name"}
+        assert p.transform_data(table, mapping).to_records() == \
+            p.transform_data(self.sample_data, mapping)
+        assert p.calculate_statistics(table, "age") == \
+            p.calculate_statistics(self.sample_data, "age")
+        other = [{"id": 1, "email": "alice@example.com"}]
+        assert p.merge_data(table, other, "id").to_records() == \
+            p.merge_data(self.sample_data, other, "id")
+    
+    def test_calculate_statistics_stddev_and_quantiles(self):
+        """Test the optional spread statistics."""
+        result = self.processor.calculate_statistics(
+            self.sample_data, "age", stddev=True, quantiles=(0.5,)
+        )
+        assert result["variance"] == pytest.approx(13.25)
+        assert result["stddev"] == pytest.approx(13.25 ** 0.5)
+        assert 28 <= result["p50"] <= 30
+        table = Table.from_records(self.sample_data, use_numpy=False)
+        assert self.processor.calculate_statistics(table, "age", stddev=True) == \
+            self.processor.calculate_statistics(self.sample_data, "age", stddev=True)
+    
+    def test_calculate_statistics_streamed_records(self):
+        """Test that records can be streamed from a generator."""
+        records = (record for record in self.sample_data)
+        assert self.processor.calculate_statistics(records, "age", stddev=True) == \
+            self.processor.calculate_statistics(self.sample_data, "age", stddev=True)
@@ -0,0 +1,170 @@
+"""
+Tests for file readers and writers.
+"""
+
+import json
+import pytest
+from src.data_processor import DataProcessor
+from src.dataio import (
+    detect_format, read_columnar, read_csv, read_csv_table, read_ndjson, write_columnar,
+    write_csv, write_ndjson,
+)
+from src.pipeline import Pipeline
+from src.table import Table, np
+
+
+RECORDS = [
+    {"id": 1, "name": "Alice", "score": 91.5, "tags": ["a"], "city": "NYC"},
+    {"id": 2, "name": "Bób", "score": 78.0, "city": None},
+    {"id": 3, "name": "", "score": 88.25, "tags": [], "city": "LA"},
+]
+
+
+class TestCsv:
+    """Test suite for CSV reading and writing."""
+    
+    def test_round_trip_with_inference(self, tmp_path):
+        """Test ints, floats and strings are inferred and blanks become None."""
+        path = tmp_path / "people.csv"
+        assert write_csv(path, RECORDS, columns=["id", "name", "score", "city"]) == 3
+        assert list(read_csv(path, chunk_size=2)) == [
+            {"id": 1, "name": "Alice", "score": 91.5, "city": "NYC"},
+            {"id": 2, "name": "Bób", "score": 78.0, "city": None},
+            {"id": 3, "name": None, "score": 88.25, "city": "LA"},
+        ]
+    
+    def test_projection_and_types(self, tmp_path):
+        """Test reading selected columns with explicit types."""
+        path = tmp_path / "zips.csv"
+        path.write_text("zip,n,extra\n01234,1,x\n99999,2\n", encoding="utf-8")
+        rows = list(read_csv(path, columns=["zip", "n"], types={"zip": str}))
+        assert rows == [{"zip": "01234", "n": 1}, {"zip": "99999", "n": 2}]
+        assert list(read_csv(path, columns=["extra"])) == [{"extra": "x"}, {"extra": None}]
+        with pytest.raises(ValueError):
+            list(read_csv(path, columns=["missing"]))
+    
+    def test_table(self, tmp_path):
+        """Test reading into a Table and writing a Table."""
+        path = tmp_path / "people.csv"
+        write_csv(path, Table.from_records(RECORDS, use_numpy=False))
+        table = read_csv_table(path, columns=["id", "score"], use_numpy=False)
+        assert table.columns["id"].typecode == "q"
+        assert table.to_records() == [{"id": r["id"], "score": r["score"]} for r in RECORDS]
+    
+    def test_strict_numbers_and_blank_lines(self, tmp_path):
+        """Test only plain decimal literals become numbers and blank lines are skipped."""
+        path = tmp_path / "strict.csv"
+        path.write_text("a,b,c,d\n1_000,NaN,+7,1e3\n\n\n\n0x10,inf,-3,.5\n\n", encoding="utf-8")
+        assert list(read_csv(path, chunk_size=2)) == [
+            {"a": "1_000", "b": "NaN", "c": 7, "d": 1000.0},
+            {"a": "0x10", "b": "inf", "c": -3, "d": 0.5},
+        ]
+        path.write_text("a\n 1\n2.\n", encoding="utf-8")
+        assert list(read_csv(path)) == [{"a": " 1"}, {"a": "2."}]
+        path.write_text("a\n2.\n-1.5E-2\n", encoding="utf-8")
+        assert list(read_csv(path)) == [{"a": 2.0}, {"a": -0.015}]
+    
+    def test_streams_and_empty_files(self, tmp_path):
+        """Test writing a generator and reading an empty file."""
+        path = tmp_path / "gen.csv"
+        assert write_csv(path, (record for record in RECORDS[:1])) == 1
+        assert list(read_csv(path))[0]["tags"] == "['a']"
+        empty = tmp_path / "empty.csv"
+        assert write_csv(empty, iter([])) == 0
+        assert list(read_csv(empty)) == []
+
+
+class TestNdjson:
+    """Test suite for NDJSON reading and writing."""
+    
+    def test_round_trip(self, tmp_path):
+        """Test records survive a write and chunked read."""
+        path = tmp_path / "people.ndjson"
+        assert write_ndjson(path, RECORDS) == 3
+        assert list(read_ndjson(path, chunk_size=2)) == RECORDS
+        assert list(read_ndjson(path, columns=["id", "tags"])) == [
+            {"id": 1, "tags": ["a"]}, {"id": 2}, {"id": 3, "tags": []},
+        ]
+    
+    def test_blank_and_invalid_lines(self, tmp_path):
+        """Test blank lines are skipped and bad lines raise ValueError."""
+        path = tmp_path / "mixed.ndjson"
+        path.write_text('{"a": 1}\n\n  \n{"a": 2}\n', encoding="utf-8")
+        assert list(read_ndjson(path)) == [{"a": 1}, {"a": 2}]
+        path.write_text('  {"a": 1} \n{"a": 2}', encoding="utf-8")
+        assert list(read_ndjson(path)) == [{"a": 1}, {"a": 2}]
+        for text in ('{"a": 1}\n1, 2\n', '1,2\n[3\n4]\n', '{"a": [1,\n2]}\n', '{"a": 1} {"b": 2}\n'):
+            path.write_text(text, encoding="utf-8")
+            with pytest.raises(ValueError):
+                list(read_ndjson(path))
+
+
+class TestColumnar:
+    """Test suite for the binary columnar format."""
+    
+    def test_round_trip(self, tmp_path):
+        """Test every column kind round-trips, with and without NumPy."""
+        path = tmp_path / "people.col"
+        assert write_columnar(path, RECORDS) == 3
+        modes = [False] + ([True] if np is not None else [])
+        for use_numpy in modes:
+            table = read_columnar(path, use_numpy=use_numpy)
+            assert table.to_records() == RECORDS
+            assert list(table.columns) == ["id", "name", "score", "tags", "city"]
+    
+    def test_projection(self, tmp_path):
+        """Test reading a subset of columns in the requested order."""
+        path = tmp_path / "people.col"
+        write_columnar(path, Table.from_records(RECORDS))
+        table = read_columnar(path, columns=["score", "id"], use_numpy=False)
+        assert table.to_records() == [{"score": r["score"], "id": r["id"]} for r in RECORDS]
+        with pytest.raises(ValueError):
+            read_columnar(path, columns=["nope"])
+    
+    def test_rejects_other_files(self, tmp_path):
+        """Test a file without the magic is rejected."""
+        path = tmp_path / "bogus.col"
+        path.write_bytes(b"not columnar at all")
+        with pytest.raises(ValueError):
+            read_columnar(path)
+    
+    def test_empty_table(self, tmp_path):
+        """Test zero-row files."""
+        path = tmp_path / "empty.col"
+        write_columnar(path, Table({"a": [], "b": []}, 0))
+        assert len(read_columnar(path, use_numpy=False)) == 0
+
+
+class TestLoadSave:
+    """Test suite for DataProcessor.load/save and Pipeline file sources."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.processor = DataProcessor()
+    
+    def test_formats_by_extension(self, tmp_path):
+        """Test every format round-trips through save and load."""
+        for name in ("data.ndjson", "data.json", "data.col"):
+            path = tmp_path / name
+            assert self.processor.save(RECORDS, path) == 3
+            assert self.processor.load(path) == RECORDS
+            assert self.processor.load(path, table=True).to_records() == RECORDS
+            assert self.processor.load(path, columns=["id"]) == [{"id": 1}, {"id": 2}, {"id": 3}]
+        path = tmp_path / "data.csv"
+        self.processor.save(RECORDS, path)
+        assert self.processor.load(path, columns=["score"]) == [{"score": r["score"]} for r in RECORDS]
+        assert json.loads((tmp_path / "data.json").read_text(encoding="utf-8")) == RECORDS
+    
+    def test_unknown_format(self, tmp_path):
+        """Test unknown extensions and format names raise ValueError."""
+        with pytest.raises(ValueError):
+            detect_format(tmp_path / "data.xml")
+        with pytest.raises(ValueError):
+            self.processor.save(RECORDS, tmp_path / "data.txt", format="xml")
+        assert detect_format("data.txt", default="ndjson") == "ndjson"
+    
+    def test_pipeline_reads_csv(self, tmp_path):
+        """Test a Pipeline streams a CSV path."""
+        path = tmp_path / "people.csv"
+        write_csv(path, RECORDS, columns=["id", "city"])
+        assert Pipeline(path).filter("city", "LA").collect() == [{"id": 3, "city": "LA"}]
@@ -0,0 +1,87 @@
+"""
+Tests for the expression compiler.
+"""
+
+import math
+import pytest
+from src.expression import Expression, compile_expression
+
+
+class TestExpression:
+    """Test suite for Expression class."""
+    
+    def test_arithmetic_and_precedence(self):
+        """Test operators follow Python precedence."""
+        cases = {
+            "1 + 2 * 3": 7,
+            "(1 + 2) * 3": 9,
+            "2 ** 3 ** 2": 512,
+            "-2 ** 2": -4,
+            "7 // 2 + 7 % 2": 4,
+            "10 / 4": 2.5,
+            "max(1, 5, 3) - min(4, 2) + abs(-1) + round(2.6)": 7,
+            "sqrt(16) + log(e) + exp(0)": 6.0,
+        }
+        for text, expected in cases.items():
+            assert Expression(text).evaluate() == expected, text
+    
+    def test_variables(self):
+        """Test variables are looked up in the bindings."""
+        expr = Expression("price * (1 + rate) - discount")
+        assert expr.variables == {"price", "rate", "discount"}
+        assert expr.evaluate({"price": 100, "rate": 0.2, "discount": 5}) == pytest.approx(115)
+        with pytest.raises(ValueError, match="rate"):
+            expr.evaluate({"price": 100, "discount": 5})
+    
+    def test_constant_folding(self):
+        """Test subexpressions without variables are folded at compile time."""
+        assert Expression("2 * pi * (3 + 4)").is_constant
+        expr = Expression("x * (60 * 60)")
+        assert not expr.is_constant
+        assert expr.evaluate({"x": 2}) == 7200
+        with pytest.raises(ValueError):
+            Expression("x + 1 / 0")
+    
+    def test_rejects_unsafe_syntax(self):
+        """Test anything beyond arithmetic is rejected before evaluation."""
+        for text in ("__import__('os')", "x.real", "[1, 2]", "lambda: 1", "'a' * 3",
+                     "open('f')", "x if y else z", "True + 1", "1 +", "max(x, key=abs)"):
+            with pytest.raises(ValueError):
+                Expression(text)
+    
+    def test_evaluation_errors(self):
+        """Test runtime failures surface as ValueError."""
+        with pytest.raises(ValueError, match="divide by zero"):
+            Expression("a / b").evaluate({"a": 1, "b": 0})
+        with pytest.raises(ValueError):
+            Expression("x % 0").evaluate({"x": 1})
+        with pytest.raises(ValueError):
+            Expression("x ** 100000000").evaluate({"x": 3})
+        with pytest.raises(ValueError, match="too large"):
+            Expression("(x ** 10000) ** 10000").evaluate({"x": 7})
+        with pytest.raises(ValueError, match="too large"):
+            compile_expression("(7 ** 1000) ** 10000")
+        assert Expression("x ** 4000").evaluate({"x": 7}) == 7 ** 4000
+        with pytest.raises(ValueError, match="not a real number"):
+            Expression("(-8) ** 0.5")
+        with pytest.raises(ValueError, match="not a real number"):
+            Expression("x ** 0.5").evaluate({"x": -4})
+        assert Expression("x ** 0.5").evaluate({"x": 4}) == 2.0
+        with pytest.raises(ValueError):
+            Expression("exp(x)").evaluate({"x": 10_000})
+        with pytest.raises(ValueError):
+            Expression("sqrt(x, x)").evaluate({"x": 1})
+        with pytest.raises(ValueError, match="Cannot evaluate"):
+            Expression("x + 1").evaluate({"x": "a"})
+        with pytest.raises(ValueError):
+            Expression("-x").evaluate({"x": None})
+        with pytest.raises(ValueError):
+            Expression("x ** 2").evaluate({"x": [1]})
+    
+    def test_compile_cache(self):
+        """Test compiled expressions are reused by text."""
+        compile_expression.cache_clear()
+        first = compile_expression("a + b")
+        assert compile_expression("a + b") is first
+        assert compile_expression.cache_info().hits == 1
+        assert math.isclose(first.evaluate({"a": 0.1, "b": 0.2}), 0.3)
@@ -0,0 +1,175 @@
+"""
+Tests for the group-by engine.
+"""
+
+import pickle
+import random
+import pytest
+from src.data_processor import DataProcessor
+from src.groupby import GroupBy, HyperLogLog
+from src.pipeline import Pipeline
+from src.table import Table
+
+
+class TestHyperLogLog:
+    """Test suite for HyperLogLog class."""
+    
+    def test_estimate_accuracy(self):
+        """Test estimates stay within a few percent for small and large counts."""
+        for distinct in (10, 1000, 50_000):
+            sketch = HyperLogLog()
+            sketch.update(f"user-{i}" for i in range(distinct))
+            sketch.update(f"user-{i}" for i in range(distinct))
+            assert abs(sketch.count() - distinct) <= max(1, distinct * 0.03)
+    
+    def test_merge_matches_union(self):
+        """Test merged sketches estimate the union."""
+        left, right = HyperLogLog(12), HyperLogLog(12)
+        left.update(range(0, 6000))
+        right.update(range(4000, 10_000))
+        merged = pickle.loads(pickle.dumps(left)).merge(right)
+        assert abs(merged.count() - 10_000) <= 10_000 * 0.05
+    
+    def test_equal_numbers_count_once(self):
+        """Test 1, 1.0 and True hash alike, as they do in a set."""
+        sketch = HyperLogLog()
+        sketch.update([1, 1.0, True, 0, -0.0, False, 2.5])
+        assert sketch.count() == len({1, 1.0, True, 0, -0.0, False, 2.5}) == 3
+    
+    def test_invalid_precision(self):
+        """Test precision bounds and mismatched merges."""
+        with pytest.raises(ValueError):
+            HyperLogLog(3)
+        with pytest.raises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(11))
+
+
+class TestGroupBy:
+    """Test suite for GroupBy class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.records = [
+            {"city": "NYC", "dept": "eng", "salary": 100, "name": "a"},
+            {"city": "LA", "dept": "eng", "salary": 90, "name": "b"},
+            {"city": "NYC", "dept": "ops", "salary": None, "name": "c"},
+            {"city": "NYC", "dept": "eng", "salary": 120, "name": "a"},
+            {"dept": "ops", "salary": 70, "name": "d"},
+        ]
+        self.aggregates = {
+            "rows": (None, "count"),
+            "paid": ("salary", "count"),
+            "total": ("salary", "sum"),
+            "avg": ("salary", "mean"),
+            "low": ("salary", "min"),
+            "high": ("salary", "max"),
+            "first": ("name", "first"),
+            "last": ("name", "last"),
+            "names": ("name", "count_distinct"),
+            "approx_names": ("name", "approx_count_distinct"),
+        }
+    
+    def test_single_key(self):
+        """Test every aggregate over one key, in first-occurrence order."""
+        result = GroupBy("city", self.aggregates).update(self.records).result()
+        assert [row["city"] for row in result] == ["NYC", "LA", None]
+        assert result[0] == {
+            "city": "NYC", "rows": 3, "paid": 2, "total": 220, "avg": 110.0, "low": 100,
+            "high": 120, "first": "a", "last": "a", "names": 2, "approx_names": 2,
+        }
+        assert result[2]["total"] == 70
+    
+    def test_multi_key(self):
+        """Test grouping on several keys."""
+        result = GroupBy(["city", "dept"], {"n": (None, "count")}).update(self.records).result()
+        assert result == [
+            {"city": "NYC", "dept": "eng", "n": 2},
+            {"city": "LA", "dept": "eng", "n": 1},
+            {"city": "NYC", "dept": "ops", "n": 1},
+            {"city": None, "dept": "ops", "n": 1},
+        ]
+    
+    def test_chunks_and_merge_match_single_pass(self):
+        """Test chunked, merged and pickled partials equal one pass."""
+        rng = random.Random(7)
+        records = [{"k": rng.randrange(20), "v": rng.choice([None, rng.random()]),
+                    "s": rng.randrange(50)} for _ in range(3000)]
+        aggregates = {"n": (None, "count"), "sum": ("v", "sum"), "min": ("v", "min"),
+                      "max": ("v", "max"), "first": ("s", "first"), "last": ("s", "last"),
+                      "distinct": ("s", "count_distinct")}
+        expected = GroupBy("k", aggregates).update(records).result()
+        chunked = GroupBy("k", aggregates).consume(records, chunk_size=128).result()
+        parts = [pickle.loads(pickle.dumps(GroupBy("k", aggregates).update(records[i:i + 1000])))
+                 for i in range(0, 3000, 1000)]
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        for result in (chunked, merged.result()):
+            assert len(result) == len(expected)
+            for row, want in zip(result, expected):
+                assert row == {**want, "sum": pytest.approx(want["sum"])}
+    
+    def test_merge_does_not_share_state(self):
+        """Test later updates to either side do not leak into the other."""
+        aggregates = {"distinct": ("v", "count_distinct"), "approx": ("v", "approx_count_distinct")}
+        left = GroupBy("k", aggregates).update([{"k": "a", "v": 1}])
+        right = GroupBy("k", aggregates).update([{"k": "b", "v": 1}])
+        left.merge(right)
+        left.update([{"k": "b", "v": 2}, {"k": "b", "v": 3}])
+        assert right.result() == [{"k": "b", "distinct": 1, "approx": 1}]
+        right.update([{"k": "b", "v": 4}])
+        assert left.result()[1] == {"k": "b", "distinct": 3, "approx": 3}
+    
+    def test_update_columns(self):
+        """Test column input gives the same result as records."""
+        table = Table.from_records(self.records)
+        columns = {name: table.column(name) for name in ("city", "salary", "name")}
+        result = GroupBy("city", self.aggregates).update_columns(columns, len(table)).result()
+        assert result == GroupBy("city", self.aggregates).update(self.records).result()
+    
+    def test_invalid_specs(self):
+        """Test invalid keys, functions and merges are rejected."""
+        with pytest.raises(ValueError):
+            GroupBy([], {"n": (None, "count")})
+        with pytest.raises(ValueError):
+            GroupBy("city", {"x": ("salary", "median")})
+        with pytest.raises(ValueError):
+            GroupBy("city", {"x": (None, "sum")})
+        with pytest.raises(ValueError):
+            GroupBy("city", {"n": (None, "count")}).merge(GroupBy("dept", {"n": (None, "count")}))
+
+
+class TestGroupData:
+    """Test suite for DataProcessor.group_data and Pipeline.group_by."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.processor = DataProcessor()
+        self.records = [
+            {"city": "NYC", "age": 30},
+            {"city": "LA", "age": 25},
+            {"city": "NYC", "age": 35},
+        ]
+        self.aggregates = {"count": (None, "count"), "avg_age": ("age", "mean")}
+        self.expected = [
+            {"city": "NYC", "count": 2, "avg_age": 32.5},
+            {"city": "LA", "count": 1, "avg_age": 25.0},
+        ]
+    
+    def test_group_data_records(self):
+        """Test group_data on a list matches aggregate_data counts."""
+        result = self.processor.group_data(self.records, "city", self.aggregates)
+        assert result == self.expected
+        counts = {row["city"]: row["count"] for row in result}
+        assert counts == self.processor.aggregate_data(self.records, "city")
+    
+    def test_group_data_table(self):
+        """Test group_data returns a Table for Table input."""
+        result = self.processor.group_data(Table.from_records(self.records), "city", self.aggregates)
+        assert isinstance(result, Table)
+        assert result.to_records() == self.expected
+    
+    def test_pipeline_group_by(self):
+        """Test streaming group-by over a pipeline."""
+        result = Pipeline(iter(self.records)).group_by("city", self.aggregates, chunk_size=2)
+        assert result == self.expected
@@ -0,0 +1,140 @@
+"""
+Tests for indexed datasets and predicate queries.
+"""
+
+import random
+import pytest
+from src.data_processor import DataProcessor
+from src.index import And, Eq, In, IndexedDataset, Or, Range
+from src.table import Table
+
+
+class TestIndexedDataset:
+    """Test suite for IndexedDataset class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        rng = random.Random(5)
+        self.records = [
+            {"id": i, "city": rng.choice(["NYC", "LA", "SF", None]), "age": rng.randint(18, 70)}
+            for i in range(500)
+        ]
+        for record in self.records[::50]:
+            del record["age"]
+        self.dataset = IndexedDataset(self.records, hash_keys=["city"], sorted_keys=["age"])
+    
+    def scan(self, predicate):
+        """Reference answer from a full scan."""
+        return [record for record in self.records if predicate.matches(record)]
+    
+    def test_behaves_like_list(self):
+        """Test length, iteration and item access."""
+        assert len(self.dataset) == 500
+        assert list(self.dataset) == self.records
+        assert self.dataset[3] is self.records[3]
+        assert self.dataset.indexes == {"city": "hash", "age": "sorted"}
+    
+    def test_predicates_match_scan(self):
+        """Test indexed answers equal a scan, in insertion order."""
+        predicates = [
+            Eq("city", "NYC"),
+            Eq("city", None),
+            Eq("city", "Paris"),
+            Eq("age", 30),
+            In("city", ["LA", "SF"]),
+            Range("age", 30, 40),
+            Range("age", 30, 40, include_low=False, include_high=False),
+            Range("age", high=25),
+            Range("age", low=65),
+            Eq("city", "NYC") & Range("age", 30, 40),
+            Or(Eq("city", "SF"), Range("age", 60, None)),
+            And(Eq("city", "LA"), Eq("id", 7)),
+            Eq("id", 42),
+            Eq("id", 42) | Eq("city", "LA"),
+        ]
+        for predicate in predicates:
+            assert self.dataset.query(predicate) == self.scan(predicate), predicate
+    
+    def test_and_drives_from_most_selective_index(self):
+        """Test And looks up its most selective indexed term."""
+        predicate = Eq("city", "NYC") & Range("age", 40, 40)
+        assert predicate.estimate(self.dataset) == Range("age", 40, 40).estimate(self.dataset)
+        assert (Eq("id", 1) & Eq("id", 2)).lookup(self.dataset) is None
+    
+    def test_appends_update_indexes(self):
+        """Test indexes follow appended records."""
+        self.dataset.query(Range("age", 0, 100))
+        extra = [{"id": 1000, "city": "NYC", "age": 35}, {"id": 1001, "city": "Oslo", "age": 35}]
+        self.dataset.extend(extra)
+        self.records.extend(extra)
+        assert self.dataset.filter_eq("city", "Oslo") == [extra[1]]
+        predicate = Eq("city", "NYC") & Range("age", 35, 35)
+        assert self.dataset.query(predicate) == self.scan(predicate)
+        assert self.dataset.query(predicate)[-1] is extra[0]
+    
+    def test_create_index(self):
+        """Test indexes can be added to an existing dataset."""
+        self.dataset.create_index("id")
+        self.dataset.create_index("id", "sorted")
+        assert self.dataset.filter_eq("id", 42) == [self.records[42]]
+        assert self.dataset.query(Range("id", 10, 12)) == self.records[10:13]
+        with pytest.raises(ValueError):
+            self.dataset.create_index("id", "btree")
+    
+    def test_range_ignores_incomparable_values(self):
+        """Test Range skips missing, NaN and incomparable values when scanning."""
+        records = [{"v": 1}, {"v": float("nan")}, {"v": "x"}, {}, {"v": 5}]
+        assert [r for r in records if Range("v", 0, 10).matches(r)] == [records[0], records[4]]
+        dataset = IndexedDataset(records[:2] + records[3:], sorted_keys=["v"])
+        assert dataset.query(Range("v", 0, 10)) == [records[0], records[4]]
+    
+    def test_empty_compound_predicates_rejected(self):
+        """Test And/Or need at least one term."""
+        with pytest.raises(ValueError):
+            And()
+        with pytest.raises(ValueError):
+            Or()
+
+
+class TestDataProcessorIndexes:
+    """Test suite for DataProcessor with indexed datasets."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.processor = DataProcessor()
+        self.records = [
+            {"name": "Alice", "age": 30, "city": "NYC"},
+            {"name": "Bob", "age": 25, "city": "LA"},
+            {"name": "Charlie", "age": 35, "city": "NYC"},
+        ]
+        self.dataset = IndexedDataset(self.records, hash_keys=["city"], sorted_keys=["age"])
+    
+    def test_filter_data_uses_index(self):
+        """Test filter_data on an IndexedDataset."""
+        result = self.processor.filter_data(self.dataset, "city", "NYC")
+        assert result == self.processor.filter_data(self.records, "city", "NYC")
+    
+    def test_query_data(self):
+        """Test query_data on every dataset type."""
+        predicate = Eq("city", "NYC") & Range("age", 31, None)
+        expected = [self.records[2]]
+        assert self.processor.query_data(self.dataset, predicate) == expected
+        assert self.processor.query_data(self.records, predicate) == expected
+        table = Table.from_records(self.records)
+        assert self.processor.query_data(table, predicate).to_records() == expected
+    
+    def test_other_operations_accept_indexed_dataset(self):
+        """Test list-based operations work on an IndexedDataset."""
+        assert self.processor.aggregate_data(self.dataset, "city") == {"NYC": 2, "LA": 1}
+        assert self.processor.sort_data(self.dataset, "age")[0]["name"] == "Bob"
+        assert self.processor.calculate_statistics(self.dataset, "age")["sum"] == 90
+    
+    def test_incomparable_values_match_nothing(self):
+        """Test sorted-index lookups with wrong-type values agree with a scan."""
+        for value in ("x", None, [30]):
+            assert self.processor.filter_data(self.dataset, "age", value) == \
+                self.processor.filter_data(self.records, "age", value) == []
+        for predicate in (Range("age", "a"), Range("age", None, "z"), Range("age", 20, "z"),
+                          In("age", ["x", 30]), Eq("age", "x") | Eq("age", 25)):
+            assert self.processor.query_data(self.dataset, predicate) == \
+                self.processor.query_data(self.records, predicate)
@@ -0,0 +1,148 @@
+"""
+Tests for the hash join engine.
+"""
+
+import random
+import pytest
+from src.data_processor import DataProcessor
+from src.join import hash_join
+from src.table import Table
+
+
+def nested_loop_join(left, right, key, how):
+    """Reference join used to check hash_join."""
+    result = []
+    matched_right = set()
+    for lrow in left:
+        found = False
+        for index, rrow in enumerate(right):
+            if lrow.get(key) is not None and lrow.get(key) == rrow.get(key):
+                result.append({**lrow, **rrow})
+                matched_right.add(index)
+                found = True
+        if not found and how in ("left", "outer"):
+            result.append(lrow)
+    if how in ("right", "outer"):
+        result.extend(r for i, r in enumerate(right) if i not in matched_right)
+    return result
+
+
+def canonical(rows):
+    """Order-insensitive representation of rows."""
+    return sorted(repr(sorted(row.items())) for row in rows)
+
+
+class TestHashJoin:
+    """Test suite for hash_join function."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        rng = random.Random(3)
+        self.left = [{"id": rng.randrange(30), "l": i} for i in range(200)]
+        self.right = [{"id": rng.randrange(40), "r": i} for i in range(120)]
+        self.left[5].pop("id")
+        self.right[7]["id"] = None
+    
+    @pytest.mark.parametrize("how", ["inner", "left", "right", "outer"])
+    def test_matches_reference(self, how):
+        """Test every join type, many-to-many, in memory."""
+        expected = canonical(nested_loop_join(self.left, self.right, "id", how))
+        assert canonical(hash_join(self.left, self.right, "id", how)) == expected
+        swapped = hash_join(self.left[:50], self.right, "id", how)
+        assert canonical(swapped) == canonical(
+            nested_loop_join(self.left[:50], self.right, "id", how)
+        )
+    
+    @pytest.mark.parametrize("how", ["inner", "left", "right", "outer"])
+    def test_spills_to_disk(self, how, tmp_path):
+        """Test the partitioned join when the build side exceeds its budget."""
+        expected = canonical(nested_loop_join(self.left, self.right, "id", how))
+        result = hash_join(self.left, self.right, "id", how, max_build_rows=10,
+                           spill_dir=str(tmp_path))
+        assert canonical(result) == expected
+    
+    @pytest.mark.parametrize("max_build_rows", [1000, 10])
+    def test_keeps_left_order(self, max_build_rows):
+        """Test that output follows the left input whichever side is built."""
+        for left in (self.left, self.left[:50]):
+            for how in ("inner", "left", "right", "outer"):
+                expected = nested_loop_join(left, self.right, "id", how)
+                result = list(hash_join(left, self.right, "id", how, max_build_rows))
+                with_left = [row for row in expected if "l" in row]
+                assert result[:len(with_left)] == with_left
+                assert canonical(result) == canonical(expected)
+    
+    def test_skewed_key_still_joins(self):
+        """Test that a key too large for the budget stops repartitioning."""
+        left = [{"id": 1, "l": i} for i in range(30)]
+        right = [{"id": 1, "r": i} for i in range(40)]
+        assert len(list(hash_join(left, right, "id", max_build_rows=5))) == 1200
+    
+    def test_right_values_take_precedence(self):
+        """Test that right-hand fields win whichever side is built."""
+        left = [{"id": 1, "v": "left"}]
+        right = [{"id": 1, "v": "right"}, {"id": 2, "v": "other"}]
+        assert list(hash_join(left, right, "id")) == [{"id": 1, "v": "right"}]
+        assert list(hash_join(right, left, "id")) == [{"id": 1, "v": "left"}]
+    
+    def test_streams_iterators(self):
+        """Test joining generators without len."""
+        left = (row for row in self.left)
+        result = hash_join(left, iter(self.right), "id", "left")
+        assert canonical(result) == canonical(
+            nested_loop_join(self.left, self.right, "id", "left")
+        )
+    
+    def test_unknown_join_type(self):
+        """Test that an unknown join type raises ValueError."""
+        with pytest.raises(ValueError):
+            hash_join([], [], "id", "cross")
+
+
+class TestMergeData:
+    """Test suite for DataProcessor.merge_data join types."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.processor = DataProcessor()
+        self.users = [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}, {"name": "Nobody"}]
+        self.orders = [{"id": 1, "item": "a"}, {"id": 1, "item": "b"}, {"id": 3, "item": "c"}]
+    
+    def test_many_to_many_and_missing_keys(self):
+        """Test that duplicates are kept and missing keys do not crash."""
+        result = self.processor.merge_data(self.users, self.orders, "id")
+        assert [row["item"] for row in result] == ["a", "b"]
+    
+    def test_follows_first_dataset_order(self):
+        """Test that the smaller first dataset still sets the row order."""
+        data1 = [{"id": 2, "name": "Bob"}, {"id": 1, "name": "Alice"}]
+        data2 = [{"id": 1, "n": 1}, {"id": 2, "n": 2}, {"id": 3, "n": 3}]
+        result = self.processor.merge_data(data1, data2, "id")
+        assert [row["id"] for row in result] == [2, 1]
+        result = self.processor.merge_data(data2[1::-1], data2, "id")
+        assert [row["id"] for row in result] == [2, 1]
+    
+    def test_spill_dir(self, tmp_path):
+        """Test that the spill directory is passed through to the join."""
+        users = self.users * 10
+        result = self.processor.merge_data(users, self.orders * 10, "id", max_build_rows=2,
+                                           spill_dir=str(tmp_path))
+        assert len(result) == 200
+        with pytest.raises(FileNotFoundError):
+            self.processor.merge_data(users, self.orders * 10, "id", max_build_rows=2,
+                                      spill_dir=str(tmp_path / "missing"))
+    
+    def test_outer(self):
+        """Test a full outer join."""
+        result = self.processor.merge_data(self.users, self.orders, "id", how="outer")
+        assert len(result) == 5
+        assert {"name": "Nobody"} in result
+        assert {"id": 3, "item": "c"} in result
+    
+    def test_tables(self):
+        """Test joins of Tables for every join type."""
+        users = Table.from_records(self.users, use_numpy=False)
+        for how in ("inner", "left", "right", "outer"):
+            result = self.processor.merge_data(users, self.orders, "id", how=how)
+            expected = self.processor.merge_data(self.users, self.orders, "id", how=how)
+            assert canonical(result.to_records()) == canonical(expected)
@@ -0,0 +1,100 @@
+"""
+Tests for incremental JSON decoding.
+"""
+
+import json
+import pytest
+from src.json_stream import iter_json_array, iter_ndjson
+
+
+def split(text: str, size: int):
+    """Split text into byte chunks of the given size."""
+    data = text.encode()
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestIterJsonArray:
+    """Test suite for iter_json_array function."""
+    
+    def test_items_across_chunk_boundaries(self):
+        """Test decoding with every possible chunk size."""
+        records = [{"id": i, "name": f"né{i}", "tags": [1, 2.5, None]} for i in range(20)]
+        text = json.dumps(records)
+        for size in (1, 2, 3, 7, 64, len(text)):
+            assert list(iter_json_array(split(text, size))) == records
+    
+    def test_numbers_split_between_chunks(self):
+        """Test that a number at a chunk boundary is not cut short."""
+        assert list(iter_json_array([b"[12", b"34, 5", b"6]"])) == [1234, 56]
+    
+    def test_empty_array(self):
+        """Test an empty array with whitespace."""
+        assert list(iter_json_array([b" [ ", b" ] \n"])) == []
+    
+    def test_text_chunks(self):
+        """Test that str chunks are accepted."""
+        assert list(iter_json_array(['["a", ', '"b"]'])) == ["a", "b"]
+    
+    def test_not_an_array(self):
+        """Test that a non-array document is rejected."""
+        with pytest.raises(ValueError, match="Expected a JSON array"):
+            list(iter_json_array([b'{"a": 1}']))
+    
+    def test_truncated(self):
+        """Test that a truncated array is rejected."""
+        with pytest.raises(ValueError, match="Truncated"):
+            list(iter_json_array([b'[1, 2, {"a"']))
+    
+    def test_trailing_data(self):
+        """Test that data after the array is rejected."""
+        with pytest.raises(ValueError, match="after JSON array"):
+            list(iter_json_array([b"[1]", b" 2"]))
+    
+    def test_missing_separators(self):
+        """Test that items must be separated by commas."""
+        with pytest.raises(ValueError, match="Expected ','"):
+            list(iter_json_array([b"[1 2 3]"]))
+    
+    def test_stray_commas(self):
+        """Test that leading, doubled and trailing commas are rejected."""
+        for text in (b"[,,1,]", b"[1,,2]", b"[1,]"):
+            with pytest.raises(ValueError, match="comma|','"):
+                list(iter_json_array([text]))
+    
+    def test_split_literals_and_escapes(self):
+        """Test that literals, strings and escapes may straddle chunks."""
+        chunks = [b"[1", b".5e", b"-3, tr", b'ue, "ab', b"c\\u00", b'e9", -', b"Infinity]"]
+        assert list(iter_json_array(chunks)) == [0.0015, True, "abc\u00e9", float("-inf")]
+    
+    def test_invalid_item_fails_fast(self):
+        """Test that a malformed item is reported without reading further."""
+        def chunks():
+            yield b'[{"a": x}, '
+            raise RuntimeError("should not be read")
+        
+        with pytest.raises(ValueError, match="offset 7"):
+            list(iter_json_array(chunks()))
+    
+    def test_lazy(self):
+        """Test that items are produced before the input is exhausted."""
+        def chunks():
+            yield b"[1, 2, "
+            raise RuntimeError("should not be read yet")
+        
+        items = iter_json_array(chunks())
+        assert next(items) == 1
+
+
+class TestIterNdjson:
+    """Test suite for iter_ndjson function."""
+    
+    def test_records_across_chunks(self):
+        """Test decoding records split across chunks."""
+        text = '{"a": 1}\n{"a": 2}\n\n{"a": 3}'
+        for size in (1, 5, len(text)):
+            assert list(iter_ndjson(split(text, size))) == [{"a": 1}, {"a": 2}, {"a": 3}]
+    
+    def test_invalid_line(self):
+        """Test that an invalid line raises ValueError."""
+        with pytest.raises(ValueError):
+            list(iter_ndjson([b"{bad}\n"]))
@@ -0,0 +1,92 @@
+"""
+Tests for the multi-process DataProcessor backend.
+"""
+
+import pytest
+from src.data_processor import DataProcessor
+from src.parallel import ParallelDataProcessor
+from src.table import Table
+
+
+class TestParallelDataProcessor:
+    """Test suite for ParallelDataProcessor class."""
+    
+    @classmethod
+    def setup_class(cls):
+        """Start one worker pool for the whole suite."""
+        cls.parallel = ParallelDataProcessor(workers=2, min_rows=10)
+    
+    @classmethod
+    def teardown_class(cls):
+        """Stop the worker pool."""
+        cls.parallel.close()
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.serial = DataProcessor()
+        cities = ["New York", "London", None, "Paris"]
+        self.records = [
+            {"id": i, "age": 20 + i % 37, "score": i * 0.25, "city": cities[i % 4]}
+            for i in range(1000)
+        ]
+        self.records[5].pop("city")
+        self.records[7]["age"] = "unknown"
+        self.table = Table.from_records(self.records, use_numpy=False)
+    
+    def test_statistics_match_serial(self):
+        """Test that merged partial statistics equal the serial result."""
+        for data in (self.records, self.table):
+            for key in ("age", "score", "id"):
+                assert self.parallel.calculate_statistics(data, key) == \
+                    pytest.approx(self.serial.calculate_statistics(data, key))
+    
+    def test_statistics_extras(self):
+        """Test stddev and quantiles across workers."""
+        result = self.parallel.calculate_statistics(self.table, "score", stddev=True,
+                                                    quantiles=(0.5,))
+        expected = self.serial.calculate_statistics(self.table, "score", stddev=True)
+        assert result["stddev"] == pytest.approx(expected["stddev"])
+        assert result["p50"] == pytest.approx(124.875, rel=0.01)
+    
+    def test_aggregate_matches_serial(self):
+        """Test counts, including their first-occurrence order."""
+        for data in (self.records, self.table):
+            for key in ("city", "age"):
+                result = self.parallel.aggregate_data(data, key)
+                expected = self.serial.aggregate_data(data, key)
+                assert result == expected
+                assert list(result) == list(expected)
+    
+    def test_aggregate_only_parallelizes_int64(self):
+        """Test that non-int64 columns are counted in process."""
+        with ParallelDataProcessor(workers=2, min_rows=10) as processor:
+            assert processor.aggregate_data(self.table, "city") == \
+                self.serial.aggregate_data(self.table, "city")
+            assert processor.aggregate_data(self.records, "id") == \
+                self.serial.aggregate_data(self.records, "id")
+            assert processor._executor is None
+            assert processor.aggregate_data(self.table, "id") == \
+                self.serial.aggregate_data(self.table, "id")
+            assert processor._executor is not None
+    
+    def test_filter_matches_serial(self):
+        """Test parallel filtering of a numeric table column."""
+        result = self.parallel.filter_data(self.table, "id", 500)
+        assert result.to_records() == [self.records[500]]
+        assert self.parallel.filter_data(self.table, "city", "Paris") == \
+            self.serial.filter_data(self.table, "city", "Paris")
+        assert self.parallel.filter_data(self.records, "city", "Paris") == \
+            self.serial.filter_data(self.records, "city", "Paris")
+    
+    def test_small_inputs_stay_in_process(self):
+        """Test that inputs below min_rows skip the workers."""
+        processor = ParallelDataProcessor(workers=2, min_rows=10_000)
+        with processor:
+            assert processor.aggregate_data(self.records, "city") == \
+                self.serial.aggregate_data(self.records, "city")
+            assert processor._executor is None
+    
+    def test_empty_numeric_column(self):
+        """Test statistics when no values are numeric."""
+        data = [{"v": "x"}] * 20
+        assert self.parallel.calculate_statistics(data, "v")["count"] == 0
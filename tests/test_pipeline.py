@@ -0,0 +1,131 @@
+"""
+Tests for lazy processing pipelines.
+"""
+
+import io
+import json
+import pytest
+from src.data_processor import DataProcessor
+from src.pipeline import Pipeline
+
+
+class TestPipeline:
+    """Test suite for Pipeline class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.processor = DataProcessor()
+        self.sample_data = [
+            {"id": 1, "name": "Alice", "age": 30, "city": "New York"},
+            {"id": 2, "name": "Bob", "age": 25, "city": "London"},
+            {"id": 3, "name": "Charlie", "age": 35, "city": "New York"},
+            {"id": 4, "name": "David", "age": 28, "city": "Paris"},
+        ]
+    
+    def test_matches_list_methods(self):
+        """Test that a chained pipeline equals the list-based methods."""
+        emails = [{"id": 1, "email": "a@example.com"}, {"id": 3, "email": "c@example.com"}]
+        mapping = {"id": "id", "name": "full_name", "email": "email"}
+        expected = self.processor.transform_data(
+            self.processor.merge_data(
+                self.processor.filter_data(self.sample_data, "city", "New York"), emails, "id"
+            ),
+            mapping,
+        )
+        result = (
+            self.processor.stream(self.sample_data)
+            .filter("city", "New York")
+            .merge(emails, "id")
+            .transform(mapping)
+            .collect()
+        )
+        assert result == expected
+    
+    def test_merge_missing_and_duplicate_keys(self):
+        """Test that merge joins like merge_data for ragged right-hand rows."""
+        other = [{"id": 1, "tag": "a"}, {"tag": "orphan"}, {"id": 1, "tag": "b"},
+                 {"id": None, "tag": "none"}]
+        expected = self.processor.merge_data(self.sample_data, other, "id")
+        result = self.processor.stream(self.sample_data).merge(other, "id").collect()
+        assert result == expected
+        assert [row["tag"] for row in result] == ["a", "b"]
+    
+    def test_callables(self):
+        """Test predicate filters and function transforms."""
+        result = (
+            self.processor.stream(self.sample_data)
+            .filter(lambda record: record["age"] > 28)
+            .transform(lambda record: record["name"].upper())
+            .collect()
+        )
+        assert result == ["ALICE", "CHARLIE"]
+    
+    def test_is_lazy(self):
+        """Test that records are pulled one at a time."""
+        pulled = []
+        
+        def source():
+            for record in self.sample_data:
+                pulled.append(record["id"])
+                yield record
+        
+        pipeline = self.processor.stream(source()).filter("city", "New York")
+        assert pulled == []
+        assert next(iter(pipeline))["id"] == 1
+        assert pulled == [1]
+    
+    def test_unbounded_source(self):
+        """Test that an infinite source can be processed incrementally."""
+        def numbers():
+            n = 0
+            while True:
+                yield {"n": n}
+                n += 1
+        
+        pipeline = Pipeline(numbers()).filter(lambda record: record["n"] % 2 == 0)
+        first = [record["n"] for _, record in zip(range(3), pipeline)]
+        assert first == [0, 2, 4]
+    
+    def test_aggregate(self):
+        """Test counting values in one pass."""
+        assert self.processor.stream(self.sample_data).aggregate("city") == \
+            self.processor.aggregate_data(self.sample_data, "city")
+    
+    def test_stats(self):
+        """Test one-pass statistics match calculate_statistics."""
+        data = self.sample_data + [{"age": "unknown"}, {}]
+        assert self.processor.stream(data).stats("age") == \
+            self.processor.calculate_statistics(data, "age")
+        assert self.processor.stream([]).stats("age")["count"] == 0
+    
+    def test_ndjson_file_object(self):
+        """Test reading records from an open NDJSON file."""
+        handle = io.StringIO("".join(json.dumps(r) + "\n" for r in self.sample_data))
+        assert self.processor.stream(handle).filter("city", "Paris").collect() == \
+            [self.sample_data[3]]
+    
+    def test_ndjson_path(self, tmp_path):
+        """Test reading records from an NDJSON file path."""
+        path = tmp_path / "people.ndjson"
+        path.write_text("\n".join(json.dumps(r) for r in self.sample_data))
+        assert self.processor.stream(path).stats("age")["sum"] == 118
+        assert len(self.processor.stream(str(path)).collect()) == 4
+    
+    def test_single_use(self):
+        """Test that a consumed pipeline yields nothing more."""
+        pipeline = self.processor.stream(self.sample_data)
+        assert len(pipeline.collect()) == 4
+        assert pipeline.collect() == []
+    
+    def test_invalid_ndjson(self):
+        """Test that malformed NDJSON lines raise ValueError."""
+        with pytest.raises(ValueError):
+            self.processor.stream(io.StringIO("{oops}\n")).collect()
+    
+    def test_stats_in_chunks(self, monkeypatch):
+        """Test that chunked stats equal the list-based result."""
+        monkeypatch.setattr("src.stats.UPDATE_CHUNK_SIZE", 3)
+        data = [{"v": i * 1.5} for i in range(10)]
+        assert self.processor.stream(data).stats("v", stddev=True) == pytest.approx(
+            self.processor.calculate_statistics(data, "v", stddev=True)
+        )
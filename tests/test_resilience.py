@@ -0,0 +1,268 @@
+"""
+Tests for rate limiting and circuit breaking.
+"""
+
+import threading
+import time
+import pytest
+from src.api_client import APIClient, APIError, CircuitOpenError, RateLimitError
+from src.resilience import CircuitBreaker, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self):
+        self.now = 100.0
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(rate=2, capacity=3, clock=self.clock)
+    
+    def test_invalid_arguments(self):
+        """Test that non-positive rate or capacity is rejected."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1, capacity=0)
+        with pytest.raises(ValueError):
+            RateLimiter(rate=1, burst=0.5)
+        with pytest.raises(ValueError):
+            self.bucket.acquire(4)
+    
+    def test_burst_then_refill(self):
+        """Test burst capacity and refill rate."""
+        assert [self.bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+        self.clock.advance(0.5)
+        assert self.bucket.try_acquire() is True
+        assert self.bucket.try_acquire() is False
+    
+    def test_refill_is_capped(self):
+        """Test that idle time does not exceed the burst capacity."""
+        self.clock.advance(100)
+        assert sum(self.bucket.try_acquire() for _ in range(10)) == 3
+    
+    def test_acquire_timeout(self):
+        """Test that acquire gives up when the wait exceeds the timeout."""
+        for _ in range(3):
+            self.bucket.try_acquire()
+        assert self.bucket.acquire(timeout=0.1) is False
+    
+    def test_acquire_waits(self):
+        """Test that acquire blocks until a token is available."""
+        bucket = TokenBucket(rate=50, capacity=1)
+        bucket.acquire()
+        start = time.monotonic()
+        assert bucket.acquire() is True
+        assert time.monotonic() - start >= 0.01
+    
+    def test_thread_safety(self):
+        """Test that concurrent takers never exceed the budget."""
+        bucket = TokenBucket(rate=0.001, capacity=100)
+        taken = []
+        
+        def take():
+            taken.append(sum(bucket.try_acquire() for _ in range(50)))
+        
+        threads = [threading.Thread(target=take) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sum(taken) == 100
+
+
+class TestRateLimiter:
+    """Test suite for RateLimiter class."""
+    
+    def test_invalid_scope(self):
+        """Test that an unknown scope is rejected."""
+        with pytest.raises(ValueError, match="scope"):
+            RateLimiter(rate=1, scope="user")
+    
+    def test_host_scope(self):
+        """Test that all paths of a host share a bucket."""
+        limiter = RateLimiter(rate=1, burst=1, clock=FakeClock())
+        assert limiter.bucket("http://a.test/x") is limiter.bucket("http://a.test/y")
+        assert limiter.bucket("http://a.test/x") is not limiter.bucket("http://b.test/x")
+    
+    def test_endpoint_scope(self):
+        """Test that endpoints get separate buckets."""
+        limiter = RateLimiter(rate=1, burst=1, scope="endpoint", clock=FakeClock())
+        assert limiter.bucket("http://a.test/x") is not limiter.bucket("http://a.test/y")
+        assert limiter.acquire("http://a.test/x", timeout=0) is True
+        assert limiter.acquire("http://a.test/x", timeout=0) is False
+        assert limiter.acquire("http://a.test/y", timeout=0) is True
+
+
+class TestCircuitBreaker:
+    """Test suite for CircuitBreaker class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            error_threshold=0.5, min_calls=4, window=10, reset_timeout=5, clock=self.clock
+        )
+    
+    def test_invalid_threshold(self):
+        """Test that the error threshold must be a rate."""
+        with pytest.raises(ValueError):
+            CircuitBreaker(error_threshold=1.5)
+    
+    def test_opens_on_error_rate(self):
+        """Test that the circuit opens once the error rate is reached."""
+        self.breaker.record_success()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        assert self.breaker.state == "closed"
+        self.breaker.record_failure()
+        assert self.breaker.state == "open"
+        assert self.breaker.allow() is False
+    
+    def test_min_calls(self):
+        """Test that too few calls never open the circuit."""
+        for _ in range(3):
+            self.breaker.record_failure()
+        assert self.breaker.state == "closed"
+    
+    def test_rolling_window(self):
+        """Test that old failures leave the window."""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.advance(11)
+        for _ in range(3):
+            self.breaker.record_success()
+        self.breaker.record_failure()
+        assert self.breaker.state == "closed"
+    
+    def test_half_open_success_closes(self):
+        """Test recovery through a successful trial call."""
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.clock.advance(5)
+        assert self.breaker.state == "half_open"
+        assert self.breaker.allow() is True
+        assert self.breaker.allow() is False
+        self.breaker.record_success()
+        assert self.breaker.state == "closed"
+    
+    def test_half_open_failure_reopens(self):
+        """Test that a failed trial call reopens the circuit."""
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.clock.advance(5)
+        assert self.breaker.allow() is True
+        self.breaker.record_failure()
+        assert self.breaker.state == "open"
+        self.clock.advance(4)
+        assert self.breaker.allow() is False
+    
+    def test_release_returns_trial(self):
+        """Test that releasing an unsent trial call lets another through."""
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.clock.advance(5)
+        assert self.breaker.allow() is True
+        self.breaker.release()
+        assert self.breaker.state == "half_open"
+        assert self.breaker.allow() is True
+        assert self.breaker.allow() is False
+    
+    def test_reset(self):
+        """Test manually closing the circuit."""
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.breaker.reset()
+        assert self.breaker.allow() is True
+
+
+class TestAPIClientResilience:
+    """Test suite for APIClient with a rate limiter and circuit breaker."""
+    
+    @pytest.fixture(autouse=True)
+    def setup_server(self, http_server):
+        """Set up the local test server."""
+        self.server = http_server
+    
+    def test_circuit_opens_and_fails_fast(self):
+        """Test that an open circuit rejects calls without a request."""
+        self.server.route("GET", "/down", status=503)
+        breaker = CircuitBreaker(min_calls=2, reset_timeout=60)
+        client = APIClient(self.server.base_url, max_retries=0, circuit_breaker=breaker)
+        for _ in range(2):
+            with pytest.raises(APIError):
+                client.get("down")
+        sent = len(self.server.requests)
+        start = time.perf_counter()
+        with pytest.raises(CircuitOpenError):
+            client.get("down")
+        assert time.perf_counter() - start < 0.01
+        assert len(self.server.requests) == sent
+    
+    def test_client_errors_do_not_trip(self):
+        """Test that 4xx responses count as healthy."""
+        self.server.route("GET", "/missing", status=404)
+        breaker = CircuitBreaker(min_calls=2)
+        client = APIClient(self.server.base_url, circuit_breaker=breaker)
+        for _ in range(3):
+            with pytest.raises(APIError):
+                client.get("missing")
+        assert breaker.state == "closed"
+    
+    def test_connection_errors_trip(self):
+        """Test that connection failures count as failures."""
+        breaker = CircuitBreaker(min_calls=1)
+        client = APIClient("http://127.0.0.1:9", max_retries=0, timeout=0.5,
+                           circuit_breaker=breaker)
+        with pytest.raises(APIError):
+            client.get("users")
+        assert breaker.state == "open"
+    
+    def test_rate_limiter_paces_requests(self):
+        """Test that requests wait for rate limiter tokens."""
+        client = APIClient(self.server.base_url, rate_limiter=RateLimiter(rate=50, burst=1))
+        start = time.monotonic()
+        for _ in range(3):
+            client.get("users")
+        assert time.monotonic() - start >= 0.03
+    
+    def test_rate_limit_timeout(self):
+        """Test that an exhausted limiter raises RateLimitError."""
+        limiter = RateLimiter(rate=0.01, burst=1)
+        client = APIClient(self.server.base_url, rate_limiter=limiter, rate_limit_timeout=0,
+                           circuit_breaker=CircuitBreaker(min_calls=1))
+        client.get("users")
+        with pytest.raises(RateLimitError):
+            client.get("users")
+        assert client.circuit_breaker.state == "closed"
+        assert len(self.server.requests) == 1
+    
+    def test_rate_limited_trial_keeps_circuit_usable(self):
+        """Test that a half-open trial stopped by the rate limiter is not lost."""
+        self.server.route("GET", "/down", status=503)
+        clock = FakeClock()
+        breaker = CircuitBreaker(min_calls=1, reset_timeout=60, clock=clock)
+        client = APIClient(self.server.base_url, max_retries=0, rate_limit_timeout=0,
+                           rate_limiter=RateLimiter(rate=0.01, burst=1, clock=clock),
+                           circuit_breaker=breaker)
+        with pytest.raises(APIError):
+            client.get("down")
+        clock.advance(60)
+        with pytest.raises(RateLimitError):
+            client.get("users")
+        assert breaker.state == "half_open"
+        clock.advance(100)
+        client.get("users")
+        assert breaker.state == "closed"
@@ -0,0 +1,138 @@
+"""
+Tests for the ResponseCache class and cached APIClient GETs.
+"""
+
+import pytest
+from src.api_client import APIClient
+from src.cache import Cache
+from src.response_cache import ResponseCache, parse_cache_control
+
+
+class TestParseCacheControl:
+    """Test suite for parse_cache_control function."""
+    
+    def test_directives(self):
+        """Test parsing directives with and without values."""
+        assert parse_cache_control('public, Max-Age="60", no-cache') == {
+            "public": None, "max-age": "60", "no-cache": None,
+        }
+    
+    def test_empty(self):
+        """Test parsing a missing header."""
+        assert parse_cache_control(None) == {}
+
+
+class TestResponseCacheKey:
+    """Test suite for response cache keys."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.cache = ResponseCache()
+    
+    def test_param_order_does_not_matter(self):
+        """Test that parameters are sorted."""
+        first = self.cache.key("http://api.test/users", {"b": 2, "a": 1})
+        second = self.cache.key("http://api.test/users", {"a": "1", "b": "2"})
+        assert first == second
+    
+    def test_url_is_normalized(self):
+        """Test that scheme/host case and default ports are normalized."""
+        assert self.cache.key("HTTP://API.test:80/users?x=1") == self.cache.key(
+            "http://api.test/users", {"x": 1}
+        )
+    
+    def test_vary_headers(self):
+        """Test that only the configured headers change the key."""
+        url = "http://api.test/users"
+        base = self.cache.key(url, headers={"Accept": "application/json"})
+        assert base != self.cache.key(url, headers={"Accept": "text/csv"})
+        assert base == self.cache.key(url, headers={"accept": "application/json", "X-Trace": "1"})
+
+
+class TestCachedAPIClient:
+    """Test suite for APIClient with a response cache."""
+    
+    @pytest.fixture(autouse=True)
+    def setup_server(self, http_server):
+        """Set up a caching client against the local test server."""
+        self.server = http_server
+        self.responses = ResponseCache()
+        self.client = APIClient(http_server.base_url, response_cache=self.responses)
+        yield
+        self.client.close()
+    
+    def test_max_age_serves_from_cache(self):
+        """Test that fresh responses skip the network."""
+        self.server.route("GET", "/items", body={"items": [1, 2]},
+                          headers={"Cache-Control": "max-age=60"})
+        assert self.client.get("items", params={"page": 1}) == {"items": [1, 2]}
+        assert self.client.get("items", params={"page": 1}) == {"items": [1, 2]}
+        assert len(self.server.requests) == 1
+        stats = self.responses.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["bytes_saved"] > 0
+    
+    def test_different_params_are_separate(self):
+        """Test that different parameters miss."""
+        self.server.route("GET", "/items", body={"ok": True},
+                          headers={"Cache-Control": "max-age=60"})
+        self.client.get("items", params={"page": 1})
+        self.client.get("items", params={"page": 2})
+        assert len(self.server.requests) == 2
+    
+    def test_etag_revalidation(self):
+        """Test that stale responses are revalidated with If-None-Match."""
+        def handler(request):
+            if request.headers.get("If-None-Match") == '"v1"':
+                return 304, {"ETag": '"v1"'}, None
+            return 200, {"ETag": '"v1"', "Cache-Control": "no-cache"}, {"version": 1}
+        
+        self.server.route("GET", "/doc", handler)
+        assert self.client.get("doc") == {"version": 1}
+        assert self.client.get("doc") == {"version": 1}
+        assert self.server.requests[1].headers["If-None-Match"] == '"v1"'
+        stats = self.responses.stats()
+        assert stats["revalidations"] == 1
+        assert stats["bytes_saved"] == len(b'{"version": 1}')
+    
+    def test_changed_resource_replaces_entry(self):
+        """Test that a 200 on revalidation stores the new body."""
+        versions = iter([1, 2, 2])
+        
+        def handler(request):
+            version = next(versions)
+            return 200, {"ETag": f'"v{version}"', "Cache-Control": "max-age=0"}, {"v": version}
+        
+        self.server.route("GET", "/doc", handler)
+        assert self.client.get("doc") == {"v": 1}
+        assert self.client.get("doc") == {"v": 2}
+        assert self.responses.lookup(self.responses.key(self.client.build_url("doc"),
+                                     headers=self.client.headers)).etag == '"v2"'
+    
+    def test_no_store(self):
+        """Test that no-store responses are not cached."""
+        self.server.route("GET", "/secret", body={"s": 1},
+                          headers={"Cache-Control": "no-store, max-age=60"})
+        self.client.get("secret")
+        self.client.get("secret")
+        assert len(self.server.requests) == 2
+    
+    def test_uncacheable_without_headers(self):
+        """Test that responses without max-age or ETag are not stored."""
+        self.client.get("plain")
+        self.client.get("plain")
+        assert len(self.server.requests) == 2
+    
+    def test_uses_given_cache(self):
+        """Test that a caller-supplied Cache is used as storage."""
+        storage = Cache(max_entries=1)
+        client = APIClient(self.server.base_url, response_cache=ResponseCache(storage))
+        self.server.route("GET", "/a", body={"a": 1}, headers={"Cache-Control": "max-age=60"})
+        client.get("a")
+        assert storage.size() == 1
+    
+    def test_post_bypasses_cache(self):
+        """Test that only GETs are cached."""
+        self.client.post("items", data={"x": 1})
+        assert self.responses.stats()["misses"] == 0
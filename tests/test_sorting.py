@@ -0,0 +1,129 @@
+"""
+Tests for multi-key, external and top-k sorting.
+"""
+
+import math
+import random
+import pytest
+from src.data_processor import DataProcessor
+from src.sorting import external_sort, normalize_keys, sort_records, top_k
+
+
+class TestSortRecords:
+    """Test suite for in-memory sorting."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.data = [
+            {"id": 1, "city": "Paris", "age": 30},
+            {"id": 2, "city": "London", "age": 25},
+            {"id": 3, "city": "Paris", "age": 25},
+            {"id": 4, "age": 40},
+            {"id": 5, "city": "London", "age": None},
+        ]
+    
+    def ids(self, rows):
+        """Return the ids of rows."""
+        return [row["id"] for row in rows]
+    
+    def test_multi_key_directions(self):
+        """Test per-key directions with missing values last."""
+        result = sort_records(self.data, ["city", ("age", "desc")])
+        assert self.ids(result) == [2, 5, 1, 3, 4]
+    
+    def test_reverse_flips_all_keys(self):
+        """Test that reverse flips every direction but keeps missing last."""
+        result = sort_records(self.data, ["city", ("age", "desc")], reverse=True)
+        assert self.ids(result) == [3, 1, 2, 5, 4]
+    
+    def test_missing_positions(self):
+        """Test placing missing values first, last or raising."""
+        assert self.ids(sort_records(self.data, "age"))[-1] == 5
+        assert self.ids(sort_records(self.data, "age", missing="first"))[0] == 5
+        assert self.ids(sort_records(self.data, "age", reverse=True)) == [4, 1, 2, 3, 5]
+        with pytest.raises(ValueError):
+            sort_records(self.data, "age", missing="error")
+        with pytest.raises(ValueError):
+            sort_records(self.data, "age", missing="middle")
+    
+    def test_mixed_types_and_nan(self):
+        """Test that mixed types are ordered and NaN counts as missing."""
+        data = [{"v": "b"}, {"v": 2}, {"v": math.nan}, {"v": (1,)}, {"v": 1.5}, {"v": "a"}]
+        result = [row["v"] for row in sort_records(data, "v")]
+        assert result[:5] == [1.5, 2, "a", "b", (1,)]
+        assert math.isnan(result[5])
+    
+    def test_stable(self):
+        """Test that equal keys keep their input order in both directions."""
+        assert self.ids(sort_records(self.data, "age")) == [2, 3, 1, 4, 5]
+        assert self.ids(sort_records(self.data, ("age", "desc"))) == [4, 1, 2, 3, 5]
+    
+    def test_invalid_spec(self):
+        """Test that bad sort specifications are rejected."""
+        with pytest.raises(ValueError):
+            normalize_keys([("age", "up")])
+        with pytest.raises(ValueError):
+            normalize_keys([])
+
+
+class TestExternalSort:
+    """Test suite for external_sort function."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        rng = random.Random(5)
+        self.data = [{"id": i, "group": rng.randrange(10), "v": rng.random()}
+                     for i in range(1000)]
+        self.data[10].pop("v")
+    
+    @pytest.mark.parametrize("run_size", [1, 7, 100, 999, 5000])
+    def test_matches_in_memory_sort(self, run_size, tmp_path):
+        """Test spilled runs merge into the same stable order."""
+        keys = [("group", "desc"), "v"]
+        expected = sort_records(self.data, keys)
+        result = list(external_sort(iter(self.data), keys, run_size=run_size,
+                                    spill_dir=str(tmp_path)))
+        assert result == expected
+    
+    def test_invalid_run_size(self):
+        """Test that run_size must be positive."""
+        with pytest.raises(ValueError):
+            external_sort(self.data, "v", run_size=0)
+    
+    def test_sort_data_external(self):
+        """Test the max_memory_rows option of sort_data."""
+        processor = DataProcessor()
+        assert processor.sort_data(self.data, "v", max_memory_rows=64) == \
+            processor.sort_data(self.data, "v")
+    
+    def test_pipeline_sort(self):
+        """Test sorting inside a lazy pipeline."""
+        processor = DataProcessor()
+        result = processor.stream(iter(self.data)).sort(("v", "desc"), run_size=50).collect()
+        assert result == sort_records(self.data, "v", reverse=True)
+
+
+class TestTopK:
+    """Test suite for top_k."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        rng = random.Random(9)
+        self.data = [{"id": i, "score": rng.randrange(100)} for i in range(500)]
+        self.data.append({"id": 500})
+    
+    def test_matches_sort_prefix(self):
+        """Test that top_k equals the start of the full sort."""
+        for k in (1, 10, 600):
+            assert top_k(self.data, ("score", "desc"), k) == \
+                sort_records(self.data, ("score", "desc"))[:k]
+        assert top_k(self.data, "score", 0) == []
+    
+    def test_data_processor_top_k(self):
+        """Test that DataProcessor.top_k ranks like sorting.top_k and sort_data."""
+        processor = DataProcessor()
+        result = processor.top_k(self.data, "score", 3, reverse=True)
+        assert [row["score"] for row in result] == \
+            sorted((row["score"] for row in self.data if "score" in row), reverse=True)[:3]
+        smallest = processor.top_k(self.data, "score", 3)
+        assert smallest == sort_records(self.data, "score")[:3] == top_k(self.data, "score", 3)
@@ -0,0 +1,149 @@
+"""
+Tests for mergeable online statistics.
+"""
+
+import pickle
+import random
+import statistics
+import pytest
+from src.stats import RunningStats, TDigest
+
+
+class TestRunningStats:
+    """Test suite for RunningStats class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        rng = random.Random(1)
+        self.values = [rng.gauss(1000, 5) for _ in range(5000)]
+    
+    def test_push_matches_statistics_module(self):
+        """Test one-value-at-a-time accumulation."""
+        stats = RunningStats()
+        for value in self.values:
+            stats.push(value)
+        assert stats.count == len(self.values)
+        assert stats.mean == pytest.approx(statistics.fmean(self.values))
+        assert stats.variance == pytest.approx(statistics.pvariance(self.values))
+        assert stats.sample_variance == pytest.approx(statistics.variance(self.values))
+        assert stats.min == min(self.values)
+        assert stats.max == max(self.values)
+    
+    def test_chunked_update_equals_push(self):
+        """Test that chunked updates give the same moments as pushes."""
+        pushed = RunningStats()
+        for value in self.values:
+            pushed.push(value)
+        chunked = RunningStats()
+        for start in range(0, len(self.values), 700):
+            chunked.update(self.values[start:start + 700])
+        assert chunked.mean == pytest.approx(pushed.mean)
+        assert chunked.variance == pytest.approx(pushed.variance)
+        assert chunked.sum == pytest.approx(pushed.sum)
+    
+    def test_update_accepts_generators(self, monkeypatch):
+        """Test that update consumes any iterable in bounded chunks."""
+        monkeypatch.setattr("src.stats.UPDATE_CHUNK_SIZE", 64)
+        listed = RunningStats(quantiles=True).update(self.values)
+        streamed = RunningStats(quantiles=True).update(value for value in self.values)
+        assert streamed.count == listed.count == len(self.values)
+        assert streamed.mean == pytest.approx(listed.mean)
+        assert streamed.variance == pytest.approx(statistics.pvariance(self.values))
+        assert (streamed.min, streamed.max) == (min(self.values), max(self.values))
+        assert streamed.quantile(0.5) == pytest.approx(statistics.median(self.values), rel=1e-3)
+        assert RunningStats().update(iter([])).count == 0
+    
+    def test_merge_shards(self):
+        """Test that merged per-shard results equal a single pass."""
+        shards = [RunningStats().update(self.values[i::3]) for i in range(3)]
+        merged = RunningStats()
+        for shard in shards:
+            merged.merge(pickle.loads(pickle.dumps(shard)))
+        assert merged.count == len(self.values)
+        assert merged.stddev == pytest.approx(statistics.pstdev(self.values))
+        assert merged.min == min(self.values)
+    
+    def test_merge_empty(self):
+        """Test merging with empty accumulators."""
+        stats = RunningStats().update([1, 2, 3])
+        stats.merge(RunningStats())
+        assert RunningStats().merge(stats).as_dict()["sum"] == 6
+    
+    def test_integer_sum_is_exact(self):
+        """Test that integer sums stay integers."""
+        stats = RunningStats().update([2 ** 60, 1])
+        stats.push(2)
+        assert stats.sum == 2 ** 60 + 3
+    
+    def test_as_dict(self):
+        """Test the calculate_statistics-compatible summary."""
+        stats = RunningStats(quantiles=True).update([1, 2, 3, 4])
+        result = stats.as_dict(stddev=True, quantiles=(0.5,))
+        assert result["count"] == 4
+        assert result["avg"] == 2.5
+        assert result["variance"] == 1.25
+        assert result["p50"] == pytest.approx(2.5)
+        assert RunningStats().as_dict() == {"count": 0, "sum": 0, "avg": 0, "min": 0, "max": 0}
+    
+    def test_variance_not_tracked(self):
+        """Test that variance is unavailable when not tracked."""
+        stats = RunningStats(track_variance=False).update([1, 2])
+        with pytest.raises(ValueError):
+            stats.variance
+        tracked = RunningStats().update([1, 2]).merge(stats)
+        assert not tracked.track_variance
+    
+    def test_quantiles_not_tracked(self):
+        """Test that quantiles need a digest."""
+        with pytest.raises(ValueError):
+            RunningStats().update([1]).quantile(0.5)
+
+
+class TestTDigest:
+    """Test suite for TDigest class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        rng = random.Random(7)
+        self.values = [rng.random() for _ in range(50_000)]
+        self.sorted_values = sorted(self.values)
+    
+    def exact(self, q):
+        """Return the exact quantile of the fixture values."""
+        return self.sorted_values[int(q * (len(self.values) - 1))]
+    
+    def test_quantile_accuracy(self):
+        """Test that quantiles are close to the exact ones."""
+        digest = TDigest()
+        for value in self.values:
+            digest.add(value)
+        for q in (0.001, 0.01, 0.25, 0.5, 0.75, 0.99, 0.999):
+            assert digest.quantile(q) == pytest.approx(self.exact(q), abs=0.005)
+        assert digest.quantile(0) == min(self.values)
+        assert digest.quantile(1) == max(self.values)
+        assert len(digest._centroids) < 200
+    
+    def test_merge(self):
+        """Test that merged digests estimate the combined distribution."""
+        left, right = TDigest(), TDigest()
+        left.update(self.values[:20_000])
+        right.update(self.values[20_000:])
+        left.merge(right)
+        assert len(left) == len(self.values)
+        assert left.quantile(0.5) == pytest.approx(self.exact(0.5), abs=0.01)
+        assert left.quantile(0.99) == pytest.approx(self.exact(0.99), abs=0.005)
+    
+    def test_small_inputs(self):
+        """Test single-value and empty digests."""
+        digest = TDigest()
+        with pytest.raises(ValueError):
+            digest.quantile(0.5)
+        digest.add(3.0)
+        assert digest.quantile(0.9) == 3.0
+        with pytest.raises(ValueError):
+            digest.quantile(1.5)
+    
+    def test_invalid_compression(self):
+        """Test that compression must be positive."""
+        with pytest.raises(ValueError):
+            TDigest(0)
@@ -0,0 +1,140 @@
+"""
+Tests for the columnar Table.
+"""
+
+from array import array
+import pytest
+from src.table import MISSING, Table
+
+
+class TestTable:
+    """Test suite for Table class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.records = [
+            {"id": 1, "name": "Alice", "age": 30, "score": 1.5, "city": "New York"},
+            {"id": 2, "name": "Bob", "age": 25, "score": 2.5},
+            {"id": 3, "name": "Charlie", "age": 35, "score": 0.5, "city": "New York"},
+            {"id": 4, "name": "David", "age": 25, "score": 4.0, "city": "Paris"},
+        ]
+        self.table = Table.from_records(self.records, use_numpy=False)
+    
+    def test_round_trip(self):
+        """Test that records survive conversion, including missing fields."""
+        assert len(self.table) == 4
+        assert self.table.to_records() == self.records
+    
+    def test_column_types(self):
+        """Test that numeric fields use typed arrays and others stay lists."""
+        columns = self.table.columns
+        assert columns["id"].typecode == "q"
+        assert columns["score"].typecode == "d"
+        assert isinstance(columns["name"], list)
+        assert columns["city"][1] is MISSING
+    
+    def test_mixed_and_huge_numbers_stay_exact(self):
+        """Test that mixed int/float and out-of-range ints are not coerced."""
+        table = Table.from_records([{"a": 1, "b": 2 ** 70}, {"a": 2.5, "b": 1}], use_numpy=False)
+        assert not isinstance(table.columns["a"], array)
+        assert not isinstance(table.columns["b"], array)
+        assert table.to_records()[0] == {"a": 1, "b": 2 ** 70}
+    
+    def test_column_reports_missing_as_none(self):
+        """Test reading a column with missing values."""
+        assert self.table.column("city") == ["New York", None, "New York", "Paris"]
+        assert self.table.column("unknown") == [None] * 4
+    
+    def test_filter_eq(self):
+        """Test filtering on typed and list columns."""
+        assert self.table.filter_eq("age", 25).column("name") == ["Bob", "David"]
+        assert self.table.filter_eq("city", "New York").column("id") == [1, 3]
+        assert self.table.filter_eq("city", None).column("id") == [2]
+        assert len(self.table.filter_eq("unknown", "x")) == 0
+    
+    def test_sort_is_stable(self):
+        """Test ascending and descending stable sorts."""
+        assert self.table.sort("age").column("id") == [2, 4, 1, 3]
+        assert self.table.sort("age", reverse=True).column("id") == [3, 1, 2, 4]
+    
+    def test_sort_missing_values(self):
+        """Test that missing values are placed explicitly in both directions."""
+        table = Table.from_records([{"v": 5}, {}, {"v": -1}], use_numpy=False)
+        assert table.sort("v").column("v") == [-1, 5, None]
+        assert table.sort("v", reverse=True).column("v") == [5, -1, None]
+        assert table.sort("v", missing="first").column("v") == [None, -1, 5]
+    
+    def test_multi_key_sort_and_top_k(self):
+        """Test multi-key sorts and top-k on a table."""
+        order = self.table.sort(["age", ("score", "desc")]).column("id")
+        assert order == [4, 2, 1, 3]
+        assert self.table.top_k(("age", "desc"), 2).column("id") == [3, 1]
+        assert len(self.table.top_k("age", 0)) == 0
+    
+    def test_value_counts(self):
+        """Test counting values, with missing fields counted as None."""
+        assert self.table.value_counts("age") == {30: 1, 25: 2, 35: 1}
+        assert self.table.value_counts("city") == {"New York": 2, None: 1, "Paris": 1}
+    
+    def test_rename(self):
+        """Test keeping and renaming columns."""
+        renamed = self.table.rename({"name": "full_name", "missing": "x"})
+        assert renamed.to_records()[0] == {"full_name": "Alice"}
+    
+    def test_merge(self):
+        """Test inner join with right-hand precedence."""
+        other = Table.from_records([
+            {"id": 2, "email": "bob@example.com", "city": "London"},
+            {"id": 4, "email": "david@example.com"},
+            {"id": 9, "email": "nobody@example.com"},
+        ], use_numpy=False)
+        merged = self.table.merge(other, "id").to_records()
+        assert [row["id"] for row in merged] == [2, 4]
+        assert merged[0]["city"] == "London"
+        assert merged[1]["city"] == "Paris"
+        assert merged[1]["email"] == "david@example.com"
+    
+    def test_statistics(self):
+        """Test statistics on typed and mixed columns."""
+        assert self.table.statistics("age") == {
+            "count": 4, "sum": 115, "avg": 28.75, "min": 25, "max": 35
+        }
+        mixed = Table.from_records([{"v": 1}, {"v": "x"}, {"v": 2.5}, {}], use_numpy=False)
+        assert mixed.statistics("v")["sum"] == 3.5
+        assert self.table.statistics("name")["count"] == 0
+        assert self.table.statistics("unknown")["count"] == 0
+    
+    def test_statistics_large_ints_do_not_overflow(self):
+        """Test that NumPy int64 sums stay exact instead of wrapping."""
+        pytest.importorskip("numpy")
+        big = 2 ** 62
+        records = [{"v": big}, {"v": big}, {"v": big}]
+        table = Table.from_records(records, use_numpy=True)
+        assert table.statistics("v")["sum"] == 3 * big
+        assert table.statistics("v") == Table.from_records(records, use_numpy=False).statistics("v")
+    
+    def test_mismatched_columns(self):
+        """Test that columns of different lengths are rejected."""
+        with pytest.raises(ValueError):
+            Table({"a": [1, 2], "b": [1]})
+    
+    def test_empty(self):
+        """Test an empty table."""
+        table = Table.from_records([], use_numpy=False)
+        assert len(table) == 0
+        assert table.to_records() == []
+        assert table.statistics("a")["count"] == 0
+    
+    def test_numpy_matches_arrays(self):
+        """Test that NumPy-backed columns give the same results."""
+        pytest.importorskip("numpy")
+        table = Table.from_records(self.records, use_numpy=True)
+        assert table.to_records() == self.records
+        assert table.sort("age", reverse=True) == self.table.sort("age", reverse=True)
+        assert table.filter_eq("age", 25) == self.table.filter_eq("age", 25)
+        assert table.statistics("score") == self.table.statistics("score")
+        assert table.filter_eq("city", None) == self.table.filter_eq("city", None)
+        assert table.sort("name", reverse=True) == self.table.sort("name", reverse=True)
+        other = Table.from_records([{"id": 2, "city": "London"}, {"id": 3}], use_numpy=True)
+        assert table.merge(other, "id") == self.table.merge(other, "id")
+        assert table.value_counts("city") == self.table.value_counts("city")
@@ -0,0 +1,81 @@
+"""
+Tests for compiled transform plans.
+"""
+
+import pytest
+from src.data_processor import DataProcessor
+from src.table import Table
+from src.transform import compile_transform
+
+
+class TestCompileTransform:
+    """Test suite for compile_transform function."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.record = {"name": "Alice", "age": "30", "city": "NYC", "extra": 1}
+    
+    def test_rename_and_drop(self):
+        """Test mapped keys are renamed and others dropped."""
+        transform = compile_transform({"name": "full_name", "city": "location"})
+        assert transform(self.record) == {"full_name": "Alice", "location": "NYC"}
+    
+    def test_missing_fields_dropped(self):
+        """Test records missing a mapped field take the checked path."""
+        transform = compile_transform({"name": "n", "zip": "z", "age": "a"}, casts={"a": int})
+        assert transform(self.record) == {"n": "Alice", "a": 30}
+        assert transform({}) == {}
+    
+    def test_projection(self):
+        """Test a sequence of keys keeps them unchanged."""
+        assert compile_transform(["city", "name"])(self.record) == {"city": "NYC", "name": "Alice"}
+        assert compile_transform("city")(self.record) == {"city": "NYC"}
+        assert compile_transform({})(self.record) == {}
+    
+    def test_casts_and_computed(self):
+        """Test casts apply to present values and computed keys see the source."""
+        transform = compile_transform(
+            {"age": "age", "extra": "extra"},
+            computed={"label": lambda r: f"{r['name']}@{r['city']}", "age": lambda r: 0},
+            casts={"age": int, "extra": float},
+        )
+        assert transform(self.record) == {"age": 0, "extra": 1.0, "label": "Alice@NYC"}
+        assert compile_transform(["age"], casts={"age": int})({"age": None}) == {"age": None}
+    
+    def test_odd_key_names(self):
+        """Test keys that are not identifiers are quoted safely."""
+        transform = compile_transform({"a'b": 'c"d', "x\ny": "z"})
+        assert transform({"a'b": 1, "x\ny": 2}) == {'c"d': 1, "z": 2}
+    
+    def test_cast_for_unmapped_key(self):
+        """Test casts must name mapped keys."""
+        with pytest.raises(ValueError):
+            compile_transform({"a": "b"}, casts={"a": int})
+
+
+class TestTransformData:
+    """Test suite for DataProcessor.transform_data with plans."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.processor = DataProcessor()
+        self.records = [{"name": "Alice", "age": "30"}, {"name": "Bob"}]
+    
+    def test_plan_reused(self):
+        """Test a compiled plan can be passed to transform_data."""
+        plan = compile_transform({"name": "n", "age": "a"}, casts={"a": int})
+        expected = [{"n": "Alice", "a": 30}, {"n": "Bob"}]
+        assert self.processor.transform_data(self.records, plan) == expected
+        result = self.processor.transform_data(self.records, {"name": "n", "age": "a"},
+                                               casts={"a": int})
+        assert result == expected
+    
+    def test_table_with_computed(self):
+        """Test computed columns on a Table."""
+        table = Table.from_records(self.records)
+        result = self.processor.transform_data(table, ["name"],
+                                               computed={"initial": lambda r: r["name"][0]})
+        assert isinstance(result, Table)
+        assert result.to_records() == [{"name": "Alice", "initial": "A"},
+                                       {"name": "Bob", "initial": "B"}]
+        assert self.processor.transform_data(table, ["age"]).to_records() == [{"age": "30"}, {}]
@@ -0,0 +1,106 @@
+"""
+Tests for materialized views.
+"""
+
+import random
+import pytest
+from src.data_processor import DataProcessor
+from src.table import Table
+from src.views import CountView, StatsView, ViewRegistry
+
+
+class TestViews:
+    """Test suite for incrementally maintained views."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.processor = DataProcessor()
+        self.rng = random.Random(11)
+        self.data = [self.make_record() for _ in range(300)]
+    
+    def make_record(self):
+        """Build a random record, sometimes without a numeric value."""
+        record = {"city": self.rng.choice(["NYC", "LA", "SF", None]),
+                  "amount": self.rng.choice([self.rng.randint(-50, 50), self.rng.random() * 10])}
+        if self.rng.random() < 0.1:
+            record["amount"] = "n/a"
+        return record
+    
+    def assert_matches(self, counts, stats):
+        """Compare views with full recomputation over the current data."""
+        assert counts.result == self.processor.aggregate_data(self.data, "city")
+        expected = self.processor.calculate_statistics(self.data, "amount", stddev=True)
+        assert stats.result == {key: pytest.approx(value, abs=1e-9)
+                                for key, value in expected.items()}
+    
+    def test_matches_full_recomputation(self):
+        """Test random inserts and deletes keep views equal to recomputation."""
+        counts = self.processor.aggregate_view(self.data, "city")
+        stats = self.processor.statistics_view(self.data, "amount", stddev=True)
+        self.assert_matches(counts, stats)
+        for _ in range(200):
+            if self.rng.random() < 0.5 and self.data:
+                removed = [self.data.pop(self.rng.randrange(len(self.data)))
+                           for _ in range(min(len(self.data), self.rng.randint(1, 5)))]
+                counts.delete(removed)
+                stats.delete(removed)
+            else:
+                added = [self.make_record() for _ in range(self.rng.randint(1, 5))]
+                self.data.extend(added)
+                counts.insert(added)
+                stats.insert(added)
+            self.assert_matches(counts, stats)
+    
+    def test_delete_extremes_and_empty(self):
+        """Test deleting the current min/max and emptying the view."""
+        rows = [{"v": 5}, {"v": 1}, {"v": 9}, {"v": 1}]
+        stats = StatsView("v", rows)
+        stats.delete([{"v": 1}])
+        assert (stats.result["min"], stats.result["max"]) == (1, 9)
+        stats.delete([{"v": 1}, {"v": 9}])
+        assert (stats.result["min"], stats.result["max"]) == (5, 5)
+        stats.delete([{"v": 5}])
+        assert stats.result == {"count": 0, "sum": 0, "avg": 0, "min": 0, "max": 0}
+    
+    def test_churn_keeps_heaps_bounded(self):
+        """Test that repeated insert/delete of a middle value does not grow the heaps."""
+        stats = StatsView("v", [{"v": 0}, {"v": 100}])
+        for _ in range(10_000):
+            stats.insert([{"v": 50}])
+            stats.delete([{"v": 50}])
+        assert len(stats._low) <= 2 * 2 + 16 and len(stats._high) <= 2 * 2 + 16
+        assert (stats.result["min"], stats.result["max"]) == (0, 100)
+    
+    def test_float_sum_does_not_drift(self):
+        """Test that the sum is compensated over long float churn."""
+        stats = StatsView("v", [{"v": 1e16}, {"v": 1.0}])
+        for _ in range(1000):
+            stats.insert([{"v": 0.1}])
+        for _ in range(1000):
+            stats.delete([{"v": 0.1}])
+        stats.delete([{"v": 1e16}])
+        assert stats.result["sum"] == pytest.approx(1.0, abs=1e-12)
+        assert StatsView("v", [{"v": 2}, {"v": 3}]).result["sum"] == 5
+    
+    def test_unknown_deletes_rejected(self):
+        """Test deleting records that were never inserted."""
+        with pytest.raises(ValueError):
+            CountView("city", [{"city": "NYC"}]).delete([{"city": "LA"}])
+        with pytest.raises(ValueError):
+            StatsView("v", [{"v": 1}]).delete([{"v": 2}])
+    
+    def test_registry_and_tables(self):
+        """Test a registry updates every view, starting from a Table."""
+        table = Table.from_records(self.data)
+        views = ViewRegistry()
+        views.register("cities", self.processor.aggregate_view(table, "city"))
+        views.register("amounts", self.processor.statistics_view(table, "amount"))
+        added = [{"city": "Oslo", "amount": 1000}]
+        views.insert(added)
+        assert views.result("cities")["Oslo"] == 1
+        assert views.result("amounts")["max"] == 1000
+        views.delete(added)
+        assert "Oslo" not in views.result("cities")
+        expected = self.processor.calculate_statistics(self.data, "amount")
+        assert views.result("amounts") == {key: pytest.approx(value)
+                                           for key, value in expected.items()}